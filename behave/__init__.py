@@ -19,7 +19,7 @@ To get started, we recommend the `tutorial`_ and then the `test language`_ and
 from __future__ import absolute_import
 from behave.step_registry import *  # pylint: disable=wildcard-import
 from behave.matchers import use_step_matcher, step_matcher, register_type
-from behave.fixture import fixture, use_fixture
+from behave.fixture import fixture, use_fixture, use_worker_fixture
 
 # pylint: disable=undefined-all-variable
 __all__ = [
@@ -35,6 +35,7 @@ __all__ = [
     "Step",
     "fixture",
     "use_fixture",
+    "use_worker_fixture",
     # -- DEPRECATING:
     "step_matcher",
 ]
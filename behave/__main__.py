@@ -193,6 +193,11 @@ def main(args=None):
     """
     config = Configuration(args)
 
+    if getattr(config, "worker_address"):
+        from behave.runner_mp import run_remote_worker
+
+        return run_remote_worker(config)
+
     rclass = Runner
     if getattr(config, "proc_count"):
         try:
@@ -48,10 +48,13 @@ from __future__ import print_function
 # -- REQUIRES: Python >= 3.4
 # MAYBE BACKPORT: trollius
 import functools
+import threading
+import warnings
 from six import string_types
 
 try:
     import asyncio
+    import concurrent.futures
 
     has_asyncio = True
 except ImportError:
@@ -94,8 +97,8 @@ def async_run_until_complete(
 
     .. note::
 
-        * If :param:`loop` is None, the default event loop will be used
-          or a new event loop is created.
+        * If :param:`loop` is None, the event loop of the current thread
+          is used (see :func:`thread_event_loop()`).
         * If :param:`timeout` is provided, the event loop waits only the
           specified time.
         * :param:`async_context` is only used, if :param:`loop` is None.
@@ -121,25 +124,12 @@ def async_run_until_complete(
             else:
                 assert isinstance(async_context, AsyncContext)
                 loop = async_context.loop
-        if loop is None:
-            loop = asyncio.get_event_loop() or asyncio.new_event_loop()
+        if loop is None and SharedEventLoop.current is None:
+            loop = thread_event_loop()
 
         # -- WORKHORSE:
         try:
-            if timeout is None:
-                loop.run_until_complete(astep_func(context, *args, **kwargs))
-            else:
-                # MAYBE: loop = asyncio.new_event_loop()
-                # MAYBE: should_close = True
-                task = loop.create_task(astep_func(context, *args, **kwargs))
-                done, pending = loop.run_until_complete(
-                    asyncio.wait([task], timeout=timeout)
-                )
-                assert not pending, "TIMEOUT-OCCURED: timeout=%s" % timeout
-                finished_task = done.pop()
-                exception = finished_task.exception()
-                if exception:
-                    raise exception
+            run_coroutine(astep_func(context, *args, **kwargs), loop, timeout)
         finally:
             if loop and should_close:
                 # -- MAYBE-AVOID:
@@ -182,6 +172,115 @@ def async_run_until_complete(
 run_until_complete = async_run_until_complete
 
 
+def is_coroutine(value):
+    """Checks if a (step function) result is a coroutine, that must be run."""
+    return has_asyncio and asyncio.iscoroutine(value)
+
+
+def thread_event_loop():
+    """Provides the event loop of the current thread:
+    The event loop that is already set for this thread (like: a loop that
+    the user has set in the main thread, in "environment.py") is used.
+    Only a thread without one (like: a worker thread) gets a new event loop,
+    that is set as the current event loop of this thread.
+    """
+    try:
+        with warnings.catch_warnings():
+            # -- PYTHON >= 3.12: Implicit creation of a main-thread loop.
+            warnings.simplefilter("ignore", DeprecationWarning)
+            loop = asyncio.get_event_loop_policy().get_event_loop()
+    except RuntimeError:
+        loop = None  # -- NO EVENT LOOP: In this thread.
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+    return loop
+
+
+def run_coroutine(coroutine, loop=None, timeout=None):
+    """Runs a coroutine (of an async-step) until it is complete
+    (or the timeout is exceeded).
+
+    If no event loop is provided, the :class:`SharedEventLoop` is used
+    (if one is active). Otherwise, the event loop of this thread is used.
+    """
+    if loop is None and SharedEventLoop.current is not None:
+        return SharedEventLoop.current.run_until_complete(coroutine, timeout)
+    if loop is None:
+        loop = thread_event_loop()
+
+    if timeout is None:
+        return loop.run_until_complete(coroutine)
+    task = loop.create_task(coroutine)
+    done, pending = loop.run_until_complete(asyncio.wait([task], timeout=timeout))
+    assert not pending, "TIMEOUT-OCCURED: timeout=%s" % timeout
+    finished_task = done.pop()
+    exception = finished_task.exception()
+    if exception:
+        raise exception
+    return finished_task.result()
+
+
+class SharedEventLoop(object):
+    """Provides one event loop (in a background thread) for the async-steps
+    of all worker threads (see: behave --parallel-backend asyncio).
+
+    The async-steps of concurrently running scenarios are interleaved in this
+    event loop. Each worker thread waits until its async-step is complete.
+
+    .. attribute:: current
+
+        Active shared event loop (or None). It is used by async-steps
+        without an explicit event loop (or async_context).
+
+    EXAMPLE:
+
+    .. code-block:: python
+
+        shared_loop = SharedEventLoop().start()
+        try:
+            ...  # Run scenarios in threads (with async-steps).
+        finally:
+            shared_loop.stop()
+    """
+
+    current = None
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(
+            target=self.loop.run_forever, name="behave-event-loop"
+        )
+        self.thread.daemon = True
+
+    def start(self):
+        self.thread.start()
+        SharedEventLoop.current = self
+        return self
+
+    def stop(self):
+        if SharedEventLoop.current is self:
+            SharedEventLoop.current = None
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+    def run_until_complete(self, coroutine, timeout=None):
+        """Runs a coroutine in the shared event loop (called by a worker thread).
+
+        :return: Result of the coroutine.
+        :raises: Exception of the coroutine.
+        """
+        future = asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            if future.done():
+                raise  # -- RAISED BY: Coroutine.
+            future.cancel()
+            raise AssertionError("TIMEOUT-OCCURED: timeout=%s" % timeout)
+
+
 # -----------------------------------------------------------------------------
 # ASYNC STEP UTILITY CLASSES:
 # -----------------------------------------------------------------------------
@@ -194,7 +293,7 @@ class AsyncContext(object):
 
     .. attribute:: loop
         Event loop object to use.
-        If none is provided, the current event-loop is used
+        If none is provided, the event-loop of the current thread is used
         (or a new one is created).
 
     .. attribute:: tasks
@@ -243,7 +342,7 @@ class AsyncContext(object):
     default_name = "async_context"
 
     def __init__(self, loop=None, name=None, should_close=False, tasks=None):
-        self.loop = loop or asyncio.get_event_loop() or asyncio.new_event_loop()
+        self.loop = loop or thread_event_loop()
         self.tasks = tasks or []
         self.name = name or self.default_name
         self.should_close = should_close
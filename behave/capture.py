@@ -6,8 +6,9 @@ Capture output (stdout, stderr), logs, etc.
 from __future__ import absolute_import
 from contextlib import contextmanager
 import sys
+import threading
 from six import StringIO, PY2
-from behave.log_capture import LoggingCapture
+from behave.log_capture import LoggingCapture, ThreadLocalLogHandler
 from behave.textutil import text as _text
 
 
@@ -111,11 +112,11 @@ class Captured(object):
         return self.add(other)
 
     def send_status(self):
-        ret = {
-            "stdout": self.stdout,
-            "stderr": self.stderr,
-            "log_output": self.log_output,
-        }
+        ret = {}
+        for k in "stdout", "stderr", "log_output":
+            value = getattr(self, k)
+            if value:
+                ret[k] = value
         return ret
 
     def recv_status(self, value):
@@ -125,6 +126,65 @@ class Captured(object):
                 setattr(self, k, value[k])
 
 
+class ThreadLocalStream(object):
+    """Proxy for sys.stdout/sys.stderr that redirects the output of each
+    thread on its own (used by the threads backend: --parallel-backend).
+
+    Threads that capture output concurrently cannot replace the global
+    stream. Output of threads without a redirect goes to the original stream.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    @property
+    def target(self):
+        """Stream that receives the output of the current thread."""
+        return getattr(self.local, "target", None) or self.stream
+
+    def redirect(self, target):
+        """Redirect the output of the current thread.
+
+        :param target: Stream to use (None: original stream).
+        :return: Previous stream of the current thread.
+        """
+        old_target = self.target
+        self.local.target = target
+        return old_target
+
+    def write(self, text):
+        return self.target.write(text)
+
+    def flush(self):
+        self.target.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.target, name)
+
+
+def swap_stream(name, stream):
+    """Replace sys.stdout/sys.stderr (only for the current thread,
+    if thread-local capture is used).
+
+    :param name: Name of the stream ("stdout", "stderr").
+    :return: Previous stream.
+    """
+    current = getattr(sys, name)
+    if isinstance(current, ThreadLocalStream):
+        return current.redirect(stream)
+    setattr(sys, name, stream)
+    return current
+
+
+def current_stream(name):
+    """Provides the stream sys.stdout/sys.stderr of the current thread."""
+    current = getattr(sys, name)
+    if isinstance(current, ThreadLocalStream):
+        return current.target
+    return current
+
+
 class CaptureController(object):
     """Simplifies the lifecycle to capture output from various sources."""
 
@@ -172,31 +232,29 @@ class CaptureController(object):
         if self.config.stdout_capture:
             # -- REPLACE ONLY: In non-capturing mode.
             if not self.old_stdout:
-                self.old_stdout = sys.stdout
-                sys.stdout = self.stdout_capture
-            assert sys.stdout is self.stdout_capture
+                self.old_stdout = swap_stream("stdout", self.stdout_capture)
+            assert current_stream("stdout") is self.stdout_capture
 
         if self.config.stderr_capture:
             # -- REPLACE ONLY: In non-capturing mode.
             if not self.old_stderr:
-                self.old_stderr = sys.stderr
-                sys.stderr = self.stderr_capture
-            assert sys.stderr is self.stderr_capture
+                self.old_stderr = swap_stream("stderr", self.stderr_capture)
+            assert current_stream("stderr") is self.stderr_capture
 
     def stop_capture(self):
         if self.config.stdout_capture:
             # -- RESTORE ONLY: In capturing mode.
             if self.old_stdout:
-                sys.stdout = self.old_stdout
+                swap_stream("stdout", self.old_stdout)
                 self.old_stdout = None
-            assert sys.stdout is not self.stdout_capture
+            assert current_stream("stdout") is not self.stdout_capture
 
         if self.config.stderr_capture:
             # -- RESTORE ONLY: In capturing mode.
             if self.old_stderr:
-                sys.stderr = self.old_stderr
+                swap_stream("stderr", self.old_stderr)
                 self.old_stderr = None
-            assert sys.stderr is not self.stderr_capture
+            assert current_stream("stderr") is not self.stderr_capture
 
     def teardown_capture(self):
         if self.config.log_capture:
@@ -246,3 +304,35 @@ def capture_output(controller, enabled=True):
         # -- CAPTURING OUTPUT is disabled.
         # Needed to prevent recursive captures with context.execute_steps()
         yield
+
+
+@contextmanager
+def thread_local_capture(config, enabled=True):
+    """Provides a context manager that lets each thread capture its own
+    output (stdout, stderr) and logging (used by the threads backend).
+
+    .. code-block::
+
+        with thread_local_capture(config):
+            ... # Start threads that run scenarios (with output capture).
+    """
+    if not enabled:
+        yield
+        return
+
+    old_stdout = sys.stdout
+    old_stderr = sys.stderr
+    sys.stdout = ThreadLocalStream(old_stdout)
+    sys.stderr = ThreadLocalStream(old_stderr)
+    log_handler = None
+    if config.log_capture:
+        # -- LEVEL: Only lowered for the ThreadLocalLogHandler.
+        log_handler = ThreadLocalLogHandler.from_config(config)
+        log_handler.install(config)
+    try:
+        yield
+    finally:
+        sys.stdout = old_stdout
+        sys.stderr = old_stderr
+        if log_handler is not None:
+            log_handler.uninstall()
@@ -131,6 +131,218 @@ options = [
 		""",
         ),
     ),
+    (
+        ("--parallel-backend",),
+        dict(
+            metavar="BACKEND",
+            dest="parallel_backend",
+            choices=["processes", "threads", "asyncio"],
+            help="""How the parallel workers run: 'processes' (default),
+                  'threads' or 'asyncio'. Thread workers run in the master
+                  process and share its memory, hooks and step definitions.
+                  Their output and logging is captured per thread. Useful for
+                  I/O-bound suites (waiting on HTTP, databases, ...). With
+                  'asyncio', the async-steps of all worker threads are run
+                  (interleaved) in one shared event loop.""",
+        ),
+    ),
+    (
+        ("--parallel-schedule",),
+        dict(
+            metavar="ORDER",
+            dest="parallel_schedule",
+            choices=["file", "longest-first"],
+            help="""Order in which parallel jobs are handed out to the workers.
+                  Use 'file' (default) to keep the feature file order or
+                  'longest-first' to start the slowest jobs first, based on
+                  the durations recorded in the timings file (see
+                  --timings-file). Jobs without recorded durations are
+                  estimated by their number of steps.""",
+        ),
+    ),
+    (
+        ("--parallel-batch-duration",),
+        dict(
+            metavar="SECONDS",
+            dest="parallel_batch_duration",
+            type=float,
+            help="""Send parallel jobs in batches that take about this many
+                  seconds to the workers (based on the mean duration of the
+                  finished jobs). Batches shrink near the end of the run, so
+                  that the load stays balanced. Useful for many short
+                  scenarios. Default: 0 (one job at a time).""",
+        ),
+    ),
+    (
+        ("--parallel-report",),
+        dict(
+            metavar="ELEMENT",
+            dest="parallel_report",
+            choices=["feature", "scenario"],
+            help="""When the formatters receive the results of parallel jobs.
+                  Use 'feature' (default) to output a feature after all its
+                  scenarios have finished or 'scenario' to output each
+                  scenario as soon as its result arrives (only one feature is
+                  output at a time, results of other features are kept until
+                  it is finished).""",
+        ),
+    ),
+    (
+        ("--parallel-reload-steps",),
+        dict(
+            action="store_true",
+            dest="parallel_reload_steps",
+            help="""Re-import the environment file and the step modules in
+                  each parallel worker. Per default, the workers reuse the
+                  hooks and step definitions that were already loaded by the
+                  master process. Use this option, if your step modules need
+                  per-process module state.""",
+        ),
+    ),
+    (
+        ("--parallel-parse",),
+        dict(
+            metavar="NUMBER",
+            dest="parallel_parse",
+            type=int,
+            help="""Parse the feature files in a pool of NUMBER processes
+                  (before the test run starts). Useful for many (or large)
+                  feature files. Default: 0 (parse them one after another).""",
+        ),
+    ),
+    (
+        ("--parallel-start-method",),
+        dict(
+            metavar="METHOD",
+            dest="parallel_start_method",
+            choices=["fork", "spawn", "forkserver"],
+            help="""How the parallel worker processes are started (see the
+                  multiprocessing module). Per default, the platform default
+                  is used. With 'spawn' or 'forkserver', each worker parses
+                  its features and loads the step modules by itself.""",
+        ),
+    ),
+    (
+        ("--parallel-max-output",),
+        dict(
+            metavar="SIZE",
+            dest="parallel_max_output",
+            type=int,
+            help="""Maximum size (in characters) of the captured output, the
+                  error message and the traceback of each model element that
+                  a parallel worker sends to the master. Longer texts are
+                  truncated (keeping their end). Default: unlimited.""",
+        ),
+    ),
+    (
+        ("--parallel-compress-results",),
+        dict(
+            action="store_true",
+            dest="parallel_compress_results",
+            help="""Compress (zlib) the results that the parallel workers
+                  send to the master. Useful for suites with much output.""",
+        ),
+    ),
+    (
+        ("--job-timeout",),
+        dict(
+            metavar="SECONDS",
+            dest="job_timeout",
+            type=float,
+            help="""Parallel mode: Fail a scenario that runs longer than this
+                  (default: no timeout). Use the tag @timeout:SECONDS to
+                  override it for a scenario or feature. A worker that hangs
+                  anyway is killed and replaced by the master.""",
+        ),
+    ),
+    (
+        ("--parallel-crash-retries",),
+        dict(
+            metavar="NUMBER",
+            dest="parallel_crash_retries",
+            type=int,
+            help="""How often the jobs of a crashed parallel worker (segfault,
+                  killed, os._exit(), ...) are retried (default: 1). A job
+                  that crashes again is marked as failed. A crashed worker
+                  process is replaced by a new one.""",
+        ),
+    ),
+    (
+        ("--max-jobs-per-worker",),
+        dict(
+            metavar="NUMBER",
+            dest="max_jobs_per_worker",
+            type=int,
+            help="""Recycle parallel workers: A worker exits after this many
+                  jobs and is replaced by a new worker process. Bounds the
+                  memory growth caused by leaky step libraries or caches.""",
+        ),
+    ),
+    (
+        ("--max-worker-rss",),
+        dict(
+            metavar="SIZE",
+            dest="max_worker_rss",
+            help="""Recycle parallel workers: A worker exits (after its current
+                  jobs), when its memory usage (resident set size) exceeds
+                  this size, and is replaced by a new worker process.
+                  Use a number of bytes or a suffix K, M, G (like: 500M).""",
+        ),
+    ),
+    (
+        ("--parallel-listen",),
+        dict(
+            metavar="HOST:PORT",
+            dest="parallel_listen",
+            help="""Distributed mode: Serve the parallel jobs over TCP at this
+                  address, so that remote workers (see --worker) on other
+                  machines can run them (in addition to the local worker
+                  processes of --processes, which may be 0). Requires an
+                  authentication key (see --parallel-authkey).""",
+        ),
+    ),
+    (
+        ("--parallel-authkey",),
+        dict(
+            metavar="KEY",
+            dest="parallel_authkey",
+            help="""Shared secret of the master and its remote workers
+                  (default: environment variable BEHAVE_PARALLEL_AUTHKEY).""",
+        ),
+    ),
+    (
+        ("--worker",),
+        dict(
+            metavar="HOST:PORT",
+            dest="worker_address",
+            help="""Run as remote worker of the master at this address (see
+                  --parallel-listen): Pull jobs from the master, run them and
+                  send the results back. The master provides the
+                  configuration. Start the worker in a checkout of the same
+                  features and steps (in the same directory).""",
+        ),
+    ),
+    (
+        ("--timings-file",),
+        dict(
+            metavar="FILE",
+            dest="timings_file",
+            help="""Timing history store, where the durations of features,
+                  scenarios, steps and hooks are recorded and read from
+                  (default: .behave_timings.jsonl, when
+                  --parallel-schedule=longest-first is used).""",
+        ),
+    ),
+    (
+        ("--feature-cache",),
+        dict(
+            metavar="DIR",
+            dest="feature_cache",
+            help="""Cache the parsed feature files in this directory (like:
+                  .behave_cache/features). A feature file is only parsed
+                  again, if its content has changed.""",
+        ),
+    ),
     (
         ("-e", "--exclude"),
         dict(
@@ -200,6 +412,17 @@ options = [
                   SAME AS: --format=steps.catalog --dry-run --no-summary -q""",
         ),
     ),
+    (
+        ("--defer-step-validation",),
+        dict(
+            action="store_true",
+            dest="defer_step_validation",
+            help="""Check the step definitions for ambiguous steps after all
+                  step modules are loaded (instead of on each registration).
+                  Faster for large step libraries, but an AmbiguousStep error
+                  does not point to the step module that caused it.""",
+        ),
+    ),
     (
         (),  # -- CONFIGFILE only
         dict(
@@ -455,6 +678,18 @@ options = [
         ("--stop",),
         dict(action="store_true", help="Stop running tests at the first failure."),
     ),
+    (
+        ("--max-failures",),
+        dict(
+            metavar="NUMBER",
+            dest="max_failures",
+            type=int,
+            help="""Parallel mode: Stop the test run after this many failed
+                  scenarios (counted over all workers). Pending jobs are not
+                  run (untested) and each worker stops before its next job.
+                  With --processes, --stop is the same as --max-failures=1.""",
+        ),
+    ),
     # -- DISABLE-UNUSED-OPTION: Not used anywhere.
     # (("-S", "--strict"),
     # dict(action="store_true",
@@ -690,6 +925,10 @@ class Configuration(object):
         summary=True,
         junit=False,
         stage=None,
+        parallel_backend="processes",
+        parallel_schedule="file",
+        parallel_report="feature",
+        parallel_crash_retries=1,
         userdata={},
         # -- SPECIAL:
         default_format="pretty",  # -- Used when no formatters are configured.
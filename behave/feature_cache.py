@@ -0,0 +1,115 @@
+# -*- coding: UTF-8 -*-
+"""
+Provides a persistent cache of parsed feature files.
+
+Parsing all feature files of a large repository takes a considerable time,
+even if only a few scenarios are run. The feature cache stores the parsed
+model of each feature file (pickled) in a cache directory::
+
+    .behave_cache/features/{key}.pickle
+
+The key is derived from the path of the feature file, the current working
+directory (the locations of the model are relative to it), the language and
+the behave version. Each entry also contains the hash of the file content:
+an entry is only used if the feature file has not changed since.
+Broken or outdated entries are ignored (and replaced).
+
+EXAMPLE:
+
+.. code-block:: python
+
+    cache = FeatureCache(".behave_cache/features")
+    feature = cache.load("features/alice.feature", language="en")
+    if feature is NOT_CACHED:
+        feature = parser.parse_file("features/alice.feature", language="en")
+        cache.store("features/alice.feature", feature, language="en")
+"""
+
+from __future__ import absolute_import, print_function
+import hashlib
+import os
+import pickle
+import tempfile
+import six
+from behave import __version__ as BEHAVE_VERSION
+
+
+DEFAULT_FEATURE_CACHE_DIR = ".behave_cache/features"
+NOT_CACHED = object()
+
+
+class FeatureCache(object):
+    """Persistent cache of parsed feature files (one file per feature).
+
+    .. attribute:: format_version
+
+        Version of the cache entries (part of the key).
+        Increment it if the pickled model changes (without a new release).
+    """
+
+    format_version = 1
+
+    def __init__(self, directory=DEFAULT_FEATURE_CACHE_DIR):
+        self.directory = directory
+
+    @classmethod
+    def from_config(cls, config):
+        """Provides the feature cache of a configuration (or None)."""
+        directory = getattr(config, "feature_cache", None)
+        if not directory:
+            return None
+        return cls(directory)
+
+    def make_key(self, filename, language=None):
+        text = u"%s|%s|%s|%s|%s" % (
+            os.path.abspath(filename),
+            os.getcwd(),
+            language or u"",
+            BEHAVE_VERSION,
+            self.format_version,
+        )
+        return hashlib.sha1(text.encode("UTF-8")).hexdigest()
+
+    def make_path(self, filename, language=None):
+        key = self.make_key(filename, language)
+        return os.path.join(self.directory, key + ".pickle")
+
+    @staticmethod
+    def content_hash(filename):
+        with open(filename, "rb") as f:
+            return hashlib.sha1(f.read()).hexdigest()
+
+    def load(self, filename, language=None):
+        """Provides the cached feature of a feature file.
+
+        :return: Feature (or None, for a file without feature),
+            NOT_CACHED if no valid entry exists.
+        """
+        try:
+            with open(self.make_path(filename, language), "rb") as f:
+                content_hash, feature = pickle.load(f)
+            if content_hash != self.content_hash(filename):
+                return NOT_CACHED  # -- OUTDATED: Feature file has changed.
+        except Exception:  # pylint: disable=broad-except
+            return NOT_CACHED  # -- MISSING or BROKEN ENTRY.
+        return feature
+
+    def store(self, filename, feature, language=None):
+        """Store the parsed feature of a feature file (before it is modified).
+
+        The entry is written to a temporary file first and renamed,
+        so that concurrent runs (or workers) never see a partial entry.
+        """
+        try:
+            data = pickle.dumps(
+                (self.content_hash(filename), feature), pickle.HIGHEST_PROTOCOL
+            )
+            if not os.path.isdir(self.directory):
+                os.makedirs(self.directory)
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, self.make_path(filename, language))
+        except (OSError, IOError, TypeError, pickle.PicklingError) as e:
+            # -- NOT CACHED: The feature is parsed again next time.
+            print("WARNING: cannot cache %s: %s" % (filename, six.text_type(e)))
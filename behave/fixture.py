@@ -155,6 +155,18 @@ def _setup_fixture(fixture_func, context, *fixture_args, **fixture_kwargs):
     """Provides core functionality to setup a fixture and registers its
     cleanup part (if needed).
     """
+    return _setup_fixture_in_layer(
+        None, fixture_func, context, *fixture_args, **fixture_kwargs
+    )
+
+
+def _setup_fixture_in_layer(
+    layer_name, fixture_func, context, *fixture_args, **fixture_kwargs
+):
+    """Setup a fixture and register its cleanup part in a context layer.
+
+    :param layer_name:  Name of the context layer (None: current layer).
+    """
     if is_context_manager(fixture_func):
         # -- CASE: Fixture function is a two-step generator (setup, cleanup).
         def cleanup_fixture():
@@ -175,7 +187,7 @@ def _setup_fixture(fixture_func, context, *fixture_args, **fixture_kwargs):
         #  is called even if setup-error occurs.
         #  NOTE: cleanup_fixture() is called when context layer is removed.
         func_it = fixture_func(context, *fixture_args, **fixture_kwargs)
-        context.add_cleanup(cleanup_fixture)
+        context.add_cleanup(cleanup_fixture, layer=layer_name)
         setup_result = next(func_it)  # SETUP-FIXTURE PART (may raise error)
     else:
         # -- CASE: Fixture is a simple function (setup-only)
@@ -231,6 +243,54 @@ def use_fixture(fixture_func, context, *fixture_args, **fixture_kwargs):
     return _setup_fixture(fixture_func, context, *fixture_args, **fixture_kwargs)
 
 
+def use_worker_fixture(fixture_func, context, *fixture_args, **fixture_kwargs):
+    """Use fixture once per worker process (in parallel mode).
+
+    The fixture-setup is performed when the fixture is used for the first
+    time in a worker process. Any later call returns the same setup result
+    (without performing the fixture-setup again). The fixture-cleanup is
+    performed after the ``after_worker()`` hook. In a normal test run,
+    where the test run is the only "worker", the fixture-cleanup is
+    performed at the end of the test run.
+
+    Therefore, an expensive resource can be used by all scenarios that a
+    worker runs:
+
+    .. code-block:: python
+
+        # -- FILE: features/environment.py
+        from behave.fixture import use_worker_fixture
+        from behave4my_project.fixtures import browser_firefox
+
+        def before_scenario(context, scenario):
+            context.browser = use_worker_fixture(browser_firefox, context)
+
+    .. note::
+
+        Context attributes that the fixture-setup assigns are removed with
+        the current context layer (scenario, ...). Use the setup result
+        (as in the example) to access the resource in each scenario.
+
+    :param fixture_func: Fixture function to use.
+    :param context: Context object to use
+    :param fixture_args: Positional args, passed to the fixture function.
+    :param fixture_kwargs: Additional kwargs, passed to the fixture function.
+    :return: Setup result object (may be None).
+    """
+    # pylint: disable=protected-access
+    layer_name = "worker"
+    frame = context._select_stack_frame_by_layer(layer_name)
+    if frame is None:
+        layer_name = "testrun"
+        frame = context._stack[-1]
+    worker_fixtures = frame.setdefault("@fixtures", {})
+    if fixture_func not in worker_fixtures:
+        worker_fixtures[fixture_func] = _setup_fixture_in_layer(
+            layer_name, fixture_func, context, *fixture_args, **fixture_kwargs
+        )
+    return worker_fixtures[fixture_func]
+
+
 def use_fixture_by_tag(tag, context, fixture_registry):
     """Process any fixture-tag to perform :func:`use_fixture()` for its fixture.
     If the fixture-tag is known, the fixture data is retrieved from the
@@ -5,6 +5,7 @@ from logging.handlers import BufferingHandler
 import logging
 import functools
 import re
+import threading
 
 
 class RecordFilter(object):
@@ -27,6 +28,129 @@ class RecordFilter(object):
         return record.name in self.include
 
 
+class ThreadLocalLogHandler(logging.Handler):
+    """Root logging handler that passes each logging event to the
+    :class:`LoggingCapture` of the thread that emitted it.
+
+    Used by the threads backend (--parallel-backend), where several threads
+    capture logging concurrently. A :class:`LoggingCapture` registers itself
+    for its thread (instead of replacing the handlers of the root logger).
+    """
+
+    def __init__(self, level=logging.NOTSET):
+        logging.Handler.__init__(self, level)
+        self.local = threading.local()
+        self.old_handlers = []
+        self.old_level = None
+        self.level_filter = None
+
+    @classmethod
+    def from_config(cls, config):
+        """Creates the handler with the level of the logging capture."""
+        return cls(config.logging_level or logging.NOTSET)
+
+    @staticmethod
+    def find():
+        """Provides the ThreadLocalLogHandler of the root logger (or None)."""
+        for handler in logging.getLogger().handlers:
+            if isinstance(handler, ThreadLocalLogHandler):
+                return handler
+        return None
+
+    @property
+    def target(self):
+        return getattr(self.local, "target", None)
+
+    def redirect(self, target):
+        """Set the handler for the events of the current thread.
+
+        :return: Previous handler of the current thread (or None).
+        """
+        old_target = self.target
+        self.local.target = target
+        return old_target
+
+    def handle(self, record):
+        target = self.target
+        if target is not None and record.levelno >= target.level:
+            target.handle(record)
+        return target is not None
+
+    def emit(self, record):
+        pass  # -- SEE: handle()
+
+    def install(self, config):
+        """Add this handler to the root logger (for all threads).
+        Uses the same configuration options as :meth:`LoggingCapture.inveigle()`.
+
+        The level of the root logger is lowered to the level of this handler,
+        if needed. The other handlers keep the old level of the root logger
+        (see :class:`InheritedLevelFilter`).
+        """
+        root_logger = logging.getLogger()
+        if config.logging_clear_handlers:
+            for logger in [root_logger] + list(
+                logging.Logger.manager.loggerDict.values()
+            ):
+                for handler in getattr(logger, "handlers", [])[:]:
+                    self.old_handlers.append((logger, handler))
+                    logger.removeHandler(handler)
+
+        self.old_level = root_logger.level
+        if self.level < self.old_level:
+            self.level_filter = InheritedLevelFilter(self.old_level)
+            for handler in self.iter_handlers():
+                handler.addFilter(self.level_filter)
+        root_logger.addHandler(self)
+        root_logger.setLevel(self.level)
+
+    def uninstall(self):
+        """Remove this handler and restore the state before :meth:`install()`."""
+        root_logger = logging.getLogger()
+        root_logger.removeHandler(self)
+        if self.level_filter is not None:
+            for handler in self.iter_handlers():
+                handler.removeFilter(self.level_filter)
+            self.level_filter = None
+        for logger, handler in self.old_handlers:
+            logger.addHandler(handler)
+        self.old_handlers = []
+        if self.old_level is not None:
+            root_logger.setLevel(self.old_level)
+            self.old_level = None
+
+    @staticmethod
+    def iter_handlers():
+        """Iterates over the handlers of all loggers (and the root logger)."""
+        loggers = [logging.getLogger()]
+        loggers.extend(logging.Logger.manager.loggerDict.values())
+        for logger in loggers:
+            for handler in getattr(logger, "handlers", []):
+                yield handler
+
+
+class InheritedLevelFilter(object):
+    """Logging filter for a handler that should keep the old level of the
+    root logger (while the root logger level is lowered for the
+    :class:`ThreadLocalLogHandler`).
+
+    Logging events of loggers without their own level (that inherit the
+    level of the root logger) must be enabled for the old level to pass.
+    """
+
+    def __init__(self, level):
+        self.level = level
+
+    def filter(self, record):
+        logger = logging.getLogger(record.name)
+        while logger.level == logging.NOTSET and logger.parent is not None:
+            logger = logger.parent
+        if logger.parent is None:
+            # -- ROOT LOGGER: Level is inherited.
+            return record.levelno >= self.level
+        return record.levelno >= logger.level
+
+
 # originally from nostetsts logcapture plugin
 class LoggingCapture(BufferingHandler):
     """Capture logging events in a memory buffer for later display or query.
@@ -63,6 +187,8 @@ class LoggingCapture(BufferingHandler):
         self.config = config
         self.old_handlers = []
         self.old_level = None
+        self.thread_handler = None
+        self.old_target = None
 
         # set my formatter
         log_format = datefmt = None
@@ -131,8 +257,16 @@ class LoggingCapture(BufferingHandler):
 
         We also set the level of the root logger.
 
+        With thread-local capture (see :class:`ThreadLocalLogHandler`),
+        only the logging events of the current thread are captured.
+
         The opposite of this is :meth:`~LoggingCapture.abandon`.
         """
+        self.thread_handler = ThreadLocalLogHandler.find()
+        if self.thread_handler is not None:
+            self.old_target = self.thread_handler.redirect(self)
+            return
+
         root_logger = logging.getLogger()
         if self.config.logging_clear_handlers:
             # kill off all the other log handlers
@@ -163,6 +297,12 @@ class LoggingCapture(BufferingHandler):
         If other handlers were removed by :meth:`~LoggingCapture.inveigle` then
         they are reinstated.
         """
+        if self.thread_handler is not None:
+            self.thread_handler.redirect(self.old_target)
+            self.thread_handler = None
+            self.old_target = None
+            return
+
         root_logger = logging.getLogger()
         for handler in root_logger.handlers[:]:
             if handler is self:
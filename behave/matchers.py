@@ -12,6 +12,7 @@ import parse
 import six
 from parse_type import cfparse
 from behave._types import ChainedExceptionUtil, ExceptionUtil
+from behave.api.async_step import SharedEventLoop, is_coroutine
 from behave.model_core import Argument, FileLocation, Replayable
 
 
@@ -41,6 +42,28 @@ class StepParseError(ValueError):
             ChainedExceptionUtil.set_cause(self, exc_cause)
 
 
+class StepDefinitionError(ValueError):
+    """Exception class, used when the pattern of a step definition is
+    malformed (cannot be compiled into a parser or regular expression).
+    """
+
+    def __init__(self, step_definition, exc_cause):
+        location = None
+        if step_definition.func:
+            location = step_definition.location
+        text = u"%s at %s: %s: %s" % (
+            step_definition.describe(),
+            location,
+            exc_cause.__class__.__name__,
+            exc_cause,
+        )
+        ValueError.__init__(self, text)
+        self.step_definition = step_definition
+        self.location = location
+        # -- CHAINED EXCEPTION (see: PEP 3134)
+        ChainedExceptionUtil.set_cause(self, exc_cause)
+
+
 # -----------------------------------------------------------------------------
 # SECTION: Model Elements
 # -----------------------------------------------------------------------------
@@ -60,13 +83,14 @@ class Match(Replayable):
 
     type = "match"
 
-    def __init__(self, func, arguments=None):
+    def __init__(self, func, arguments=None, location=None):
         super(Match, self).__init__()
         self.func = func
         self.arguments = arguments
-        self.location = None
-        if func:
+        self.location = location
+        if func and location is None:
             self.location = self.make_location(func)
+        self._call_arguments = None
 
     def __repr__(self):
         if self.func:
@@ -83,19 +107,34 @@ class Match(Replayable):
     def with_arguments(self, arguments):
         match = copy.copy(self)
         match.arguments = arguments
+        match._call_arguments = None  # pylint: disable=protected-access
         return match
 
-    def run(self, context):
-        args = []
-        kwargs = {}
-        for arg in self.arguments:
-            if arg.name is not None:
-                kwargs[arg.name] = arg.value
-            else:
-                args.append(arg.value)
+    def split_arguments(self):
+        """Provides the positional and keyword arguments for the step function
+        (computed once, a match may be reused for many steps).
+
+        :return: Tuple (args, kwargs)
+        """
+        if self._call_arguments is None:
+            args = []
+            kwargs = {}
+            for arg in self.arguments:
+                if arg.name is not None:
+                    kwargs[arg.name] = arg.value
+                else:
+                    args.append(arg.value)
+            self._call_arguments = (tuple(args), kwargs)
+        return self._call_arguments
 
+    def run(self, context):
+        args, kwargs = self.split_arguments()
         with context.use_with_user_mode():
-            self.func(context, *args, **kwargs)
+            result = self.func(context, *args, **kwargs)
+            if is_coroutine(result) and SharedEventLoop.current is not None:
+                # -- ASYNC STEP: "async def" step function (without decorator),
+                #    only awaited with: --parallel-backend asyncio
+                SharedEventLoop.current.run_until_complete(result)
 
     @staticmethod
     def make_location(step_function):
@@ -181,6 +220,13 @@ class Matcher(object):
         # NOTE: Method must be overridden if assumption is not met.
         return self.pattern
 
+    @property
+    def literal_prefix(self):
+        """Literal text that each matched step text starts with
+        (used by the step registry index). None, if it is unknown.
+        """
+        return None
+
     def describe(self, schema=None):
         """Provide a textual description of the step function/matcher object.
 
@@ -203,7 +249,24 @@ class Matcher(object):
         """
         raise NotImplementedError
 
+    def compile(self):
+        """Compiles the pattern (if needed) before the first match.
+        Errors in the pattern are raised (they are no match).
+
+        :raises StepDefinitionError: If the pattern is malformed.
+        """
+        try:
+            self.compile_pattern()
+        except Exception as e:  # pylint: disable=broad-except
+            raise StepDefinitionError(self, e)
+
+    def compile_pattern(self):
+        """Compiles the pattern into its parser/regex (overridden)."""
+        pass
+
     def match(self, step):
+        # -- PATTERN ERRORS: Are raised, a malformed pattern matches nothing.
+        self.compile()
         # -- PROTECT AGAINST: Type conversion errors (with ParseMatcher).
         try:
             result = self.check_match(step)
@@ -212,7 +275,10 @@ class Matcher(object):
 
         if result is None:
             return None  # -- NO-MATCH
-        return Match(self.func, result)
+        location = None
+        if self.func:
+            location = self.location  # -- COMPUTED ONCE: Per step definition.
+        return Match(self.func, result, location=location)
 
     def __repr__(self):
         return "<%s: %r>" % (self.__class__.__name__, self.pattern)
@@ -228,13 +294,34 @@ class ParseMatcher(Matcher):
 
     def __init__(self, func, pattern, step_type=None):
         super(ParseMatcher, self).__init__(func, pattern, step_type)
-        self.parser = self.parser_class(pattern, self.custom_types)
+        self._parser = None
+
+    @property
+    def parser(self):
+        """Parser for the pattern (created on first use).
+        Most step definitions of a large step library are never used.
+        """
+        if self._parser is None:
+            self._parser = self.parser_class(self.pattern, self.custom_types)
+        return self._parser
+
+    @parser.setter
+    def parser(self, parser):
+        self._parser = parser
+
+    def compile_pattern(self):
+        return self.parser
 
     @property
     def regex_pattern(self):
         # -- OVERWRITTEN: Pattern as regex text.
         return self.parser._expression  # pylint: disable=protected-access
 
+    @property
+    def literal_prefix(self):
+        # -- NOTE: Literal text before the first field (matched ignoring case).
+        return self.pattern.split("{", 1)[0]
+
     def check_match(self, step):
         # -- FAILURE-POINT: Type conversion of parameters may fail here.
         #    NOTE: Type converter should raise ValueError in case of PARSE ERRORS.
@@ -300,7 +387,26 @@ def register_type(**kw):
 class RegexMatcher(Matcher):
     def __init__(self, func, pattern, step_type=None):
         super(RegexMatcher, self).__init__(func, pattern, step_type)
-        self.regex = re.compile(self.pattern)
+        self.expression = pattern
+        self._regex = None
+
+    @property
+    def regex(self):
+        """Compiled regular expression (compiled on first use)."""
+        if self._regex is None:
+            self._regex = re.compile(self.expression)
+        return self._regex
+
+    @regex.setter
+    def regex(self, regex):
+        self._regex = regex
+
+    def compile_pattern(self):
+        return self.regex
+
+    @property
+    def literal_prefix(self):
+        return regex_literal_prefix(self.pattern)
 
     def check_match(self, step):
         m = self.regex.match(step)
@@ -317,6 +423,56 @@ class RegexMatcher(Matcher):
         return args
 
 
+def has_toplevel_alternative(pattern):
+    """Checks if a regular expression has an alternative ("a|b")
+    outside of any group.
+    """
+    depth = 0
+    in_class = False
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if char == "\\":
+            index += 2
+            continue
+        if in_class:
+            if char == "]":
+                in_class = False
+        elif char == "[":
+            in_class = True
+            # -- LITERAL "]" as first char of a character set: "[]...]", "[^]...]"
+            if pattern[index + 1 : index + 2] == "^":
+                index += 1
+            if pattern[index + 1 : index + 2] == "]":
+                index += 1
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            return True
+        index += 1
+    return False
+
+
+def regex_literal_prefix(pattern):
+    """Provides the literal text at the start of a regular expression,
+    like "I buy " for "I buy (?P<amount>\\d+) apples" (or None).
+    """
+    if has_toplevel_alternative(pattern):
+        return None
+    if pattern.startswith("^"):
+        pattern = pattern[1:]
+    prefix = []
+    for char in pattern:
+        if char in ".^$*+?{}[]\\|()":
+            if char in "*+?{" and prefix:
+                prefix.pop()  # -- QUANTIFIED: Last char is optional/repeated.
+            break
+        prefix.append(char)
+    return u"".join(prefix)
+
+
 class SimplifiedRegexMatcher(RegexMatcher):
     """Simplified regular expression step-matcher that automatically adds
     start-of-line/end-of-line matcher symbols to string:
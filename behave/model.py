@@ -153,10 +153,10 @@ class Feature(TagAndStatusStatement, Replayable):
 
     def send_status(self):
         ret = super(Feature, self).send_status()
-        ret["hook_failed"] = self.hook_failed
-        ret["scenarios"] = {}
-        for scenario in self.scenarios:
-            ret["scenarios"][hash(scenario)] = scenario.send_status()
+        if self.hook_failed:
+            ret["hook_failed"] = self.hook_failed
+        # -- POSITIONAL: Same order in each process that parsed the feature.
+        ret["scenarios"] = [scenario.send_status() for scenario in self.scenarios]
         return ret
 
     def recv_status(self, value):
@@ -164,8 +164,7 @@ class Feature(TagAndStatusStatement, Replayable):
         if "hook_failed" in value:
             self.hook_failed = value["hook_failed"]
         if "scenarios" in value:
-            for scenario in self.scenarios:
-                sval = value["scenarios"].get(hash(scenario))
+            for scenario, sval in zip(self.scenarios, value["scenarios"]):
                 if sval is not None:
                     scenario.recv_status(sval)
 
@@ -562,12 +561,17 @@ class Scenario(TagAndStatusStatement, Replayable):
 
     def send_status(self):
         ret = super(Scenario, self).send_status()
-        ret["hook_failed"] = self.hook_failed
-        ret["was_dry_run"] = self.was_dry_run
-
-        ret["steps"] = {}
-        for step in self.all_steps:
-            ret["steps"][hash(step)] = step.send_status()
+        if self.hook_failed:
+            ret["hook_failed"] = self.hook_failed
+        if self.was_dry_run:
+            ret["was_dry_run"] = self.was_dry_run
+
+        # -- SPARSE: Only (index, status) of the executed steps.
+        ret["steps"] = [
+            (index, step.send_status())
+            for index, step in enumerate(self.all_steps)
+            if step.status != Status.untested
+        ]
         return ret
 
     def recv_status(self, value):
@@ -577,11 +581,9 @@ class Scenario(TagAndStatusStatement, Replayable):
         if "was_dry_run" in value:
             self.was_dry_run = value["was_dry_run"]
         if "steps" in value:
-            steps_v = value["steps"]
-            for step in self.all_steps:
-                sval = steps_v.get(hash(step), None)
-                if sval is not None:
-                    step.recv_status(sval)
+            steps = list(self.all_steps)
+            for index, sval in value["steps"]:
+                steps[index].recv_status(sval)
 
     @property
     def background_steps(self):
@@ -1118,16 +1120,13 @@ class ScenarioOutline(Scenario):
 
     def send_status(self):
         ret = super(ScenarioOutline, self).send_status()
-        ret["sub_scenarios"] = {}
-        for scenario in self._scenarios:
-            ret["sub_scenarios"][hash(scenario)] = scenario.send_status()
+        ret["sub_scenarios"] = [scenario.send_status() for scenario in self._scenarios]
         return ret
 
     def recv_status(self, value):
         if "sub_scenarios" in value:
             sub_scens = value["sub_scenarios"]
-            for scenario in self.scenarios:
-                sval = sub_scens.get(hash(scenario))
+            for scenario, sval in zip(self.scenarios, sub_scens):
                 if sval is not None:
                     scenario.recv_status(sval)
 
@@ -1400,15 +1399,16 @@ class Step(BasicStatement, Replayable):
 
     def send_status(self):
         ret = super(Step, self).send_status()
-        ret["status"] = self.status
-        ret["hook_failed"] = self.hook_failed
+        ret["status"] = self.status.value
+        if self.hook_failed:
+            ret["hook_failed"] = self.hook_failed
         ret["duration"] = self.duration
         return ret
 
     def recv_status(self, value):
         super(Step, self).recv_status(value)
         if "status" in value:
-            self.status = value["status"]
+            self.status = Status.from_value(value["status"])
         if "hook_failed" in value:
             self.hook_failed = value["hook_failed"]
         if "duration" in value:
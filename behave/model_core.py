@@ -4,6 +4,7 @@ This module provides the abstract base classes and core concepts
 for the model elements in behave.
 """
 
+import functools
 import os.path
 import sys
 import six
@@ -96,6 +97,44 @@ class Status(Enum):
             raise LookupError("%s (expected: %s)" % (name, known_names))
         return enum_value
 
+    @classmethod
+    def from_value(cls, value):
+        """Select enumeration value by using its (integer) value.
+        Enum values and status names are accepted, too.
+
+        :param value:   Status code (as int), enum value or name.
+        :return: Enum value (instance)
+        """
+        if isinstance(value, cls):
+            return value
+        elif isinstance(value, six.string_types):
+            return cls.from_name(value)
+        return cls(value)
+
+
+class RemoteException(Exception):
+    """Placeholder for an exception that could not be transferred
+    from a worker process (because it cannot be pickled).
+
+    .. attribute:: type_name
+
+        Class name of the original exception.
+    """
+
+    def __init__(self, type_name, text):
+        super(RemoteException, self).__init__(text)
+        self.type_name = type_name
+
+    @classmethod
+    def from_exception(cls, exception):
+        return cls(exception.__class__.__name__, _text(exception))
+
+    def __str__(self):
+        return u"%s: %s" % (self.type_name, self.args[0])
+
+    def __reduce__(self):
+        return (self.__class__, (self.type_name, self.args[0]))
+
 
 class Argument(object):
     """An argument found in a *feature file* step name and extracted using
@@ -278,10 +317,16 @@ class FileLocation(object):
 # -----------------------------------------------------------------------------
 # ABSTRACT MODEL CLASSES (and concepts):
 # -----------------------------------------------------------------------------
+@functools.lru_cache(maxsize=1024)
+def relpath_from(filename, curdir):
+    """Cached :func:`os.path.relpath()` (used for each parsed statement)."""
+    return os.path.relpath(filename, curdir)
+
+
 class BasicStatement(object):
     def __init__(self, filename, line, keyword, name):
         filename = filename or "<string>"
-        filename = os.path.relpath(filename, os.getcwd())  # -- NEEDS: abspath?
+        filename = relpath_from(filename, os.getcwd())  # -- NEEDS: abspath?
         self.location = FileLocation(filename, line)
         assert isinstance(keyword, six.text_type)
         assert isinstance(name, six.text_type)
@@ -312,13 +357,18 @@ class BasicStatement(object):
         self.error_message = None
 
     def send_status(self):
-        """Emit the volatile attributes of this model in a primitive dict"""
-        ret = {
-            "exception": self.exception,
-            "error_message": self.error_message,
-            "exc_traceback": self.exc_traceback,
-            "captured": self.captured.send_status(),
-        }
+        """Emit the volatile attributes of this model in a primitive dict.
+
+        Attributes with empty values (None, no captured output) are omitted
+        to keep the record small.
+        """
+        ret = {}
+        for key in "exception", "error_message", "exc_traceback":
+            value = getattr(self, key)
+            if value is not None:
+                ret[key] = value
+        if self.captured:
+            ret["captured"] = self.captured.send_status()
         return ret
 
     def recv_status(self, value):
@@ -435,9 +485,11 @@ class TagAndStatusStatement(BasicStatement):
 
     def send_status(self):
         ret = super(TagAndStatusStatement, self).send_status()
-        ret["status"] = self._cached_status
-        ret["should_skip"] = self.should_skip
-        ret["skip_reason"] = self.skip_reason
+        ret["status"] = self._cached_status.value
+        if self.should_skip:
+            ret["should_skip"] = self.should_skip
+        if self.skip_reason is not None:
+            ret["skip_reason"] = self.skip_reason
         return ret
 
     def recv_status(self, value):
@@ -451,7 +503,7 @@ class TagAndStatusStatement(BasicStatement):
         if "skip_reason" in value:
             self.skip_reason = value["skip_reason"]
         if "status" in value:
-            self._cached_status = value["status"]
+            self._cached_status = Status.from_value(value["status"])
 
 
 class Replayable(object):
@@ -1,6 +1,7 @@
 # -*- coding: UTF-8 -*-
 
 from __future__ import absolute_import, with_statement
+import io
 import re
 import sys
 import six
@@ -12,10 +13,59 @@ DEFAULT_LANGUAGE = "en"
 
 
 def parse_file(filename, language=None):
-    with open(filename, "rb") as f:
-        # file encoding is assumed to be utf8. Oh, yes.
-        data = f.read().decode("utf8")
-    return parse_feature(data, language, filename)
+    feature = None
+    for element in iter_parse_file(filename, language):
+        if feature is None:
+            feature = element  # -- FIRST ELEMENT: Is the feature.
+    return feature
+
+
+def iter_parse_file(filename, language=None):
+    """Parse a feature file lazily (line by line, without reading the whole
+    file first). Yields the model elements as soon as they are complete:
+
+      * the feature first, when its header is complete
+        (tags, name, description: at the first Background/Scenario),
+      * the background,
+      * each scenario and scenario outline (with its examples).
+
+    Each element is also added to the feature, as with :func:`parse_file()`.
+    Therefore, the caller can start to process a scenario while the
+    remaining file is still being parsed.
+
+    .. code-block:: python
+
+        for element in iter_parse_file("features/alice.feature"):
+            if element.type in ("scenario", "scenario_outline"):
+                schedule(element)
+
+    :param filename:  Feature file to parse (UTF-8 encoded).
+    :param language:  i18n language identifier (optional).
+    :return: Iterator of model elements (Feature, Background, Scenario, ...).
+    :raises ParserError: When the parser encounters a syntax error.
+    """
+    # file encoding is assumed to be utf8. Oh, yes.
+    with io.open(filename, encoding="utf8", newline="\n") as f:
+        try:
+            for element in Parser(language).iter_parse(iter_lines(f), filename):
+                yield element
+        except ParserError as e:
+            e.filename = filename
+            raise
+
+
+def iter_lines(stream):
+    """Yields the lines of a text stream like ``text.split("\\n")``
+    (without newline, but with a last empty line after a final newline).
+    """
+    line = u"\n"  # -- EMPTY STREAM: Provides one empty line.
+    for line in stream:
+        if line.endswith("\n"):
+            yield line[:-1]
+        else:
+            yield line
+    if line.endswith("\n"):
+        yield u""
 
 
 def parse_feature(data, language=None, filename=None):
@@ -100,11 +150,104 @@ class ParserError(Exception):
         __str__ = lambda self: self.__unicode__().encode("utf-8")
 
 
+class KeywordMatcher(object):
+    """Precompiled recognizer for the Gherkin keywords of one language.
+
+    The aliases of a keyword (and the keywords of all step types) are
+    matched by one anchored regular expression (with one group per alias).
+    Like trying each alias in order, the first alias that matches is used.
+    """
+
+    statement_types = (
+        "feature",
+        "background",
+        "scenario",
+        "scenario_outline",
+        "examples",
+    )
+    step_types = ("given", "when", "then", "and", "but")
+    _cache = {}
+
+    def __init__(self, keywords):
+        self.keywords = keywords
+        self.statements = {}
+        for statement_type in self.statement_types:
+            aliases = keywords[statement_type]
+            regex = self.make_regex([alias + ":" for alias in aliases])
+            self.statements[statement_type] = (aliases, regex)
+
+        # -- STEP KEYWORDS: Keyword "<" suffix means no whitespace after it.
+        self.steps = []
+        for step_type in self.step_types:
+            for keyword in keywords[step_type]:
+                whitespace = " "
+                if keyword.endswith("<"):
+                    whitespace = ""
+                    keyword = keyword[:-1]
+                self.steps.append((step_type, keyword, whitespace))
+        self.step_regex = self.make_regex(
+            [keyword + whitespace for _, keyword, whitespace in self.steps]
+        )
+        self.lowercase_step_regex = self.make_regex(
+            [keyword.lower() + whitespace for _, keyword, whitespace in self.steps]
+        )
+
+    @classmethod
+    def for_language(cls, language, keywords):
+        """Provides the (cached) keyword matcher for the keywords of a language."""
+        keyword_matcher = cls._cache.get(language)
+        if keyword_matcher is None or keyword_matcher.keywords is not keywords:
+            keyword_matcher = cls(keywords)
+            cls._cache[language] = keyword_matcher
+        return keyword_matcher
+
+    @staticmethod
+    def make_regex(prefixes):
+        return re.compile(u"|".join(u"(%s)" % re.escape(prefix) for prefix in prefixes))
+
+    def match_statement(self, statement_type, line):
+        """Provides the alias of a statement keyword that the line starts with
+        (with a colon), or False.
+        """
+        aliases, regex = self.statements[statement_type]
+        matched = regex.match(line)
+        if matched:
+            return aliases[matched.lastindex - 1]
+        return False
+
+    def match_step(self, line):
+        """Provides the step type and the keyword that the line starts with,
+        either as-is or in lowercase, or None.
+        """
+        matched = self.step_regex.match(line)
+        index = matched and matched.lastindex - 1
+        if index != 0:
+            matched = self.lowercase_step_regex.match(line.lower())
+            if matched and (index is None or matched.lastindex - 1 < index):
+                index = matched.lastindex - 1
+        if index is None:
+            return None
+        step_type, keyword, _ = self.steps[index]
+        return step_type, keyword
+
+
 class Parser(object):
     """Feature file parser for behave."""
 
     # pylint: disable=too-many-instance-attributes
 
+    #: Parser states (and their action methods: "action_{state}").
+    states = (
+        "init",
+        "feature",
+        "taggable_statement",
+        "scenario",
+        "steps",
+        "multiline",
+        "table",
+    )
+    _dispatch_tables = {}
+
     def __init__(self, language=None, variant=None):
         if not variant:
             variant = "feature"
@@ -152,16 +295,42 @@ class Parser(object):
         self.examples = None
 
     def parse(self, data, filename=None):
-        self.reset()
+        feature = None
+        for element in self.iter_parse(data.split("\n"), filename):
+            if feature is None:
+                feature = element  # -- FIRST ELEMENT: Is the feature.
+        return feature
+
+    def iter_parse(self, lines, filename=None):
+        """Parse the lines of a feature file (without newlines) and yield
+        the feature (when its header is complete), the background and
+        each scenario or scenario outline as soon as it is complete.
+        A statement is complete when the next statement starts
+        (or at the end of the file).
 
+        :param lines:  Iterable of lines (as unicode).
+        :param filename:  Filename (optional).
+        :return: Iterator of model elements (Feature first).
+        """
+        self.reset()
         self.filename = filename
+        feature_header_done = False
+        statement = None
 
-        for line in data.split("\n"):
+        for line in lines:
             self.line += 1
             if not line.strip() and self.state != "multiline":
                 # -- SKIP EMPTY LINES, except in multiline string args.
                 continue
             self.action(line)
+            if self.statement is not statement:
+                # -- NEXT STATEMENT STARTED: Previous statement is complete.
+                if not feature_header_done:
+                    feature_header_done = True
+                    yield self.feature
+                if statement is not None:
+                    yield statement
+                statement = self.statement
 
         if self.table:
             self.action_table("")
@@ -169,8 +338,11 @@ class Parser(object):
         feature = self.feature
         if feature:
             feature.parser = self
+            if not feature_header_done:
+                yield feature
+            if statement is not None:
+                yield statement
         self.reset()
-        return feature
 
     def _build_feature(self, keyword, line):
         name = line[len(keyword) + 1 :].strip()
@@ -282,7 +454,7 @@ class Parser(object):
         return None
 
     def action(self, line):
-        if line.strip().startswith("#") and self.state != "multiline":
+        if self.state != "multiline" and line.lstrip().startswith("#"):
             if self.state != "init" or self.tags or self.variant != "feature":
                 return
 
@@ -294,7 +466,11 @@ class Parser(object):
                 self.keywords = i18n.languages[language]
             return
 
-        func = getattr(self, "action_" + self.state, None)
+        dispatch_table = self._dispatch_tables.get(type(self))
+        if dispatch_table is None:
+            dispatch_table = type(self).get_dispatch_table()
+        action_name = dispatch_table.get(self.state) or "action_" + self.state
+        func = getattr(self, action_name, None)
         if func is None:
             line = line.strip()
             msg = "Parser in unknown state %s;" % self.state
@@ -311,6 +487,18 @@ class Parser(object):
                 msg += "REASON: %s" % reason
             raise ParserError(msg, None, self.filename)
 
+    @classmethod
+    def get_dispatch_table(cls):
+        """Provides the name of the action method of each parser state
+        (per concrete parser class). The action method is looked up on the
+        parser object, so that overridden methods are used.
+        """
+        dispatch_table = cls._dispatch_tables.get(cls)
+        if dispatch_table is None:
+            dispatch_table = dict((state, "action_" + state) for state in cls.states)
+            cls._dispatch_tables[cls] = dispatch_table
+        return dispatch_table
+
     def action_init(self, line):
         line = line.strip()
         if line.startswith("@"):
@@ -555,10 +743,8 @@ class Parser(object):
         if not self.keywords:
             self.language = DEFAULT_LANGUAGE
             self.keywords = i18n.languages[DEFAULT_LANGUAGE]
-        for alias in self.keywords[keyword]:
-            if line.startswith(alias + ":"):
-                return alias
-        return False
+        keyword_matcher = KeywordMatcher.for_language(self.language, self.keywords)
+        return keyword_matcher.match_statement(keyword, line)
 
     def parse_tags(self, line):
         """
@@ -587,32 +773,21 @@ class Parser(object):
         return tags
 
     def parse_step(self, line):
-        for step_type in ("given", "when", "then", "and", "but"):
-            for kw in self.keywords[step_type]:
-                if kw.endswith("<"):
-                    whitespace = ""
-                    kw = kw[:-1]
-                else:
-                    whitespace = " "
-
-                # try to match the keyword; also attempt a purely lowercase
-                # match if that'll work
-                if not (
-                    line.startswith(kw + whitespace)
-                    or line.lower().startswith(kw.lower() + whitespace)
-                ):
-                    continue
-
-                name = line[len(kw) :].strip()
-                if step_type in ("and", "but"):
-                    if not self.last_step:
-                        raise ParserError("No previous step", self.line)
-                    step_type = self.last_step
-                else:
-                    self.last_step = step_type
-                step = model.Step(self.filename, self.line, kw, step_type, name)
-                return step
-        return None
+        keyword_matcher = KeywordMatcher.for_language(self.language, self.keywords)
+        matched = keyword_matcher.match_step(line)
+        if matched is None:
+            return None
+
+        step_type, kw = matched
+        name = line[len(kw) :].strip()
+        if step_type in ("and", "but"):
+            if not self.last_step:
+                raise ParserError("No previous step", self.line)
+            step_type = self.last_step
+        else:
+            self.last_step = step_type
+        step = model.Step(self.filename, self.line, kw, step_type, name)
+        return step
 
     def parse_steps(self, text, filename=None):
         """
@@ -8,6 +8,7 @@ from __future__ import absolute_import, print_function, with_statement
 import contextlib
 import os.path
 import sys
+import time
 import warnings
 import weakref
 
@@ -17,6 +18,7 @@ import six
 from behave._types import ExceptionUtil
 from behave.capture import CaptureController
 from behave.configuration import ConfigError
+from behave.feature_cache import FeatureCache
 from behave.formatter._registry import make_formatters
 from behave.runner_util import (
     collect_feature_locations,
@@ -26,6 +28,7 @@ from behave.runner_util import (
     PathManager,
 )
 from behave.step_registry import registry as the_step_registry
+from behave.timings import TimingStore
 
 
 if six.PY2:
@@ -240,9 +243,16 @@ class Context(object):
             del cleanup_errors  # -- ENSURE: Release other exception frames.
             six.reraise(*first_cleanup_erro_info)
 
+    def _select_stack_frame_by_layer(self, layer_name):
+        """Provide the (top-most) context layer with this name (or None)."""
+        for frame in self._stack:
+            if frame.get("@layer") == layer_name:
+                return frame
+        return None
+
     def _push(self, layer_name=None):
         """Push a new layer on the context stack.
-        HINT: Use layer_name values: "scenario", "feature", "testrun".
+        HINT: Use layer_name values: "scenario", "feature", "testrun", "worker".
 
         :param layer_name:   Layer name to use (or None).
         """
@@ -435,10 +445,14 @@ class Context(object):
         :param cleanup_func:    Callable function
         :param args:            Args for cleanup_func() call (optional).
         :param kwargs:          Kwargs for cleanup_func() call (optional).
+        :param layer:           Name of the context layer to use (optional).
+            Per default, the current context layer is used.
+        :raises LookupError: If the context layer is unknown.
         """
         # MAYBE:
         assert callable(cleanup_func), "REQUIRES: callable(cleanup_func)"
         assert self._stack
+        layer_name = kwargs.pop("layer", None)
         if args or kwargs:
 
             def internal_cleanup_func():
@@ -447,6 +461,10 @@ class Context(object):
             internal_cleanup_func = cleanup_func
 
         current_frame = self._stack[0]
+        if layer_name:
+            current_frame = self._select_stack_frame_by_layer(layer_name)
+            if current_frame is None:
+                raise LookupError("Context layer not found: %s" % layer_name)
         if cleanup_func not in current_frame["@cleanups"]:
             # -- AVOID DUPLICATES:
             current_frame["@cleanups"].append(internal_cleanup_func)
@@ -543,6 +561,7 @@ class ModelRunner(object):
         self.context = None
         self.feature = None
         self.hook_failures = 0
+        self.hook_durations = {}
 
     # @property
     def _get_aborted(self):
@@ -578,6 +597,7 @@ class ModelRunner(object):
 
     def run_hook(self, name, context, *args):
         if not self.config.dry_run and (name in self.hooks):
+            start = time.time()
             try:
                 with context.use_with_user_mode():
                     self.hooks[name](context, *args)
@@ -602,8 +622,9 @@ class ModelRunner(object):
                 if "tag" in name:
                     # -- SCENARIO or FEATURE
                     statement = getattr(context, "scenario", context.feature)
-                elif "all" in name:
+                elif "all" in name or "worker" in name:
                     # -- ABORT EXECUTION: For before_all/after_all
+                    #    and before_worker/after_worker (parallel mode).
                     self.aborted = True
                     statement = None
                 else:
@@ -621,6 +642,10 @@ class ModelRunner(object):
                         # -- FIRST EXCEPTION/FAILURE:
                         statement.store_exception_context(e)
                         statement.error_message = error_message
+            finally:
+                # -- TIMING STATISTICS: Number of calls and total duration.
+                count, total = self.hook_durations.get(name, (0, 0.0))
+                self.hook_durations[name] = (count + 1, total + time.time() - start)
 
     def setup_capture(self):
         if not self.context:
@@ -844,7 +869,16 @@ class Runner(ModelRunner):
         # NOTE: Default matcher can be overridden in "environment.py" hook.
         steps_dir = os.path.join(self.base_dir, self.config.steps_dir)
         step_paths = [steps_dir] + list(extra_step_paths)
-        load_step_modules(step_paths)
+        if self.config.defer_step_validation:
+            # -- LARGE STEP LIBRARY: Check for ambiguous steps only once.
+            step_registry = self.step_registry or the_step_registry
+            with step_registry.deferred_validation():
+                load_step_modules(step_paths)
+        else:
+            load_step_modules(step_paths)
+        if self.config.dry_run or not self.config.defer_step_validation:
+            # -- FAIL EARLY: Malformed step patterns (before the run).
+            (self.step_registry or the_step_registry).compile_step_definitions()
 
     def feature_locations(self):
         return collect_feature_locations(self.config.paths)
@@ -869,10 +903,25 @@ class Runner(ModelRunner):
             for filename in self.feature_locations()
             if not self.config.exclude(filename)
         ]
-        features = parse_features(feature_locations, language=self.config.lang)
+        features = parse_features(
+            feature_locations,
+            language=self.config.lang,
+            jobs=self.config.parallel_parse or 0,
+            cache=FeatureCache.from_config(self.config),
+        )
         self.features.extend(features)
 
         # -- STEP: Run all features.
         stream_openers = self.config.outputs
         self.formatters = make_formatters(self.config, stream_openers)
-        return self.run_model()
+        failed = self.run_model()
+        if self.config.timings_file:
+            self.store_timings(TimingStore(self.config.timings_file).load())
+        return failed
+
+    def store_timings(self, timings):
+        """Record the durations of this test run in the timing store."""
+        for feature in self.features:
+            timings.add_feature(feature, self.step_registry)
+        timings.add_hook_durations(self.hook_durations)
+        timings.save()
@@ -3,20 +3,650 @@
 This module provides multiprocessing Runner class.
 """
 
+from __future__ import print_function
 import six
 import os
+import sys
+import copy
+import collections
+from contextlib import contextmanager
 import multiprocessing
+import multiprocessing.connection
+import pickle
+import signal
+import threading
+import time
+import traceback
+import zlib
 
+from behave.api.async_step import SharedEventLoop
+from behave.capture import thread_local_capture
+from behave.feature_cache import FeatureCache
 from behave.formatter._registry import make_formatters
 from behave.runner import Runner, Context
 from behave.model import Feature, Scenario, ScenarioOutline, NoMatch
-from behave.runner_util import parse_features, load_step_modules
+from behave.model_core import RemoteException, Status
+from behave.runner_util import (
+    parse_features,
+    load_step_modules,
+    FileLocationParser,
+)
 from behave.step_registry import registry as the_step_registry
+from behave.timings import TimingStore, DEFAULT_TIMINGS_FILE
 
-if six.PY2:
-    import Queue as queue
-else:
-    import queue
+
+# -----------------------------------------------------------------------------
+# JOB DURATIONS (from earlier runs):
+# -----------------------------------------------------------------------------
+def job_location(item):
+    """Key under which the duration of a feature/scenario job is recorded.
+
+    :param item:  Feature or Scenario (model element).
+    :return: "{filename}" for features, "{filename}:{line}" for scenarios.
+    """
+    if isinstance(item, Feature):
+        return six.text_type(item.filename)
+    return six.text_type(item.location)
+
+
+def unique_feature_locations(locations):
+    """Remove repeated feature locations (same file and line, like a feature
+    file that is passed twice), because the location of a job is its id.
+
+    :param locations:  Feature locations (as FileLocation or filename).
+    :return: Feature locations (in their order, first occurrence only).
+    """
+    seen = set()
+    unique_locations = []
+    for location in locations:
+        filename = getattr(location, "filename", location)
+        key = (os.path.abspath(filename), getattr(location, "line", None))
+        if key not in seen:
+            seen.add(key)
+            unique_locations.append(location)
+    return unique_locations
+
+
+class DurationEstimator(object):
+    """Estimates how long a feature/scenario job takes to run.
+
+    Uses the mean recorded duration of a job (from the timing store),
+    if it is known. Otherwise, the duration is estimated by the number of
+    steps multiplied with the mean step duration of the known scenarios.
+    """
+
+    default_step_duration = 1.0
+
+    def __init__(self, timings=None):
+        self.timings = timings
+        self.step_duration = self.default_step_duration
+
+    def recorded_duration(self, item):
+        if self.timings is None:
+            return None
+        kind = "feature" if isinstance(item, Feature) else "scenario"
+        return self.timings.mean(kind, job_location(item))
+
+    def calibrate(self, features):
+        """Compute the mean step duration from scenarios with known durations."""
+        total_duration = 0.0
+        total_steps = 0
+        for feature in features:
+            for scenario in feature.walk_scenarios():
+                duration = self.recorded_duration(scenario)
+                if duration is None:
+                    continue
+                total_duration += duration
+                total_steps += len(list(scenario.all_steps))
+        if total_steps and total_duration > 0:
+            self.step_duration = total_duration / total_steps
+
+    def estimate(self, item):
+        duration = self.recorded_duration(item)
+        if duration is not None:
+            return duration
+        if isinstance(item, Feature):
+            return sum(self.estimate(s) for s in item.walk_scenarios())
+        return len(list(item.all_steps)) * self.step_duration
+
+
+# -----------------------------------------------------------------------------
+# JOB RESULTS (sent from workers to master):
+# -----------------------------------------------------------------------------
+class ResultPacker(object):
+    """Packs the status record of a job (see :meth:`Feature.send_status()`)
+    before it is sent to the master.
+
+    * Exceptions that cannot be (un)pickled are replaced by a
+      :class:`~behave.model_core.RemoteException` (as text).
+    * Texts (captured output, error message, traceback) are truncated
+      to `max_output` characters (if a limit is given).
+    * The record is compressed with zlib (if enabled).
+    """
+
+    text_keys = ("error_message", "stdout", "stderr", "log_output")
+    compression_level = 6
+
+    def __init__(self, max_output=None, compress=False):
+        self.max_output = max_output
+        self.compress = compress
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(config.parallel_max_output, config.parallel_compress_results)
+
+    def truncate(self, text):
+        if self.max_output is None or len(text) <= self.max_output:
+            return text
+        dropped = len(text) - self.max_output
+        return u"... (%d characters truncated)\n%s" % (
+            dropped,
+            text[-self.max_output :],
+        )
+
+    def truncate_lines(self, lines):
+        if self.max_output is None:
+            return lines
+        size = 0
+        for index in range(len(lines) - 1, -1, -1):
+            size += len(lines[index])
+            if size > self.max_output:
+                marker = u"... (%d lines truncated)\n" % (index + 1)
+                return [marker] + lines[index + 1 :]
+        return lines
+
+    def prepare(self, value):
+        """Prepare a (nested) status record in-place, before it is pickled."""
+        if isinstance(value, (list, tuple)):
+            for item in value:
+                self.prepare(item)
+            return value
+        elif not isinstance(value, dict):
+            return value
+
+        for key, item in value.items():
+            if key == "exception":
+                try:
+                    # -- ROUND-TRIP: Some exceptions cannot be unpickled.
+                    pickle.loads(pickle.dumps(item))
+                except Exception:  # pylint: disable=broad-except
+                    value[key] = RemoteException.from_exception(item)
+            elif key == "exc_traceback":
+                value[key] = self.truncate_lines(item)
+            elif key in self.text_keys and isinstance(item, six.string_types):
+                value[key] = self.truncate(item)
+            else:
+                self.prepare(item)
+        return value
+
+    def pack(self, value):
+        value = self.prepare(value)
+        if self.compress:
+            data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            return zlib.compress(data, self.compression_level)
+        return value
+
+    @staticmethod
+    def unpack(value):
+        if isinstance(value, bytes):
+            return pickle.loads(zlib.decompress(value))
+        return value
+
+
+# -----------------------------------------------------------------------------
+# CONCURRENCY LIMITS (of shared resources):
+# -----------------------------------------------------------------------------
+def parse_resource_tag(tag):
+    """Parse a concurrency-limit tag.
+
+    * "exclusive:NAME": Job uses resource NAME exclusively (limit: 1).
+    * "max_concurrency:NAME=N": At most N jobs use resource NAME at once.
+
+    :param tag:  Tag name (without "@").
+    :return: Tuple (name, limit) or None, if tag is no concurrency-limit tag.
+    :raises ValueError: If the tag is malformed.
+    """
+    if tag.startswith("exclusive:"):
+        name = tag[len("exclusive:") :]
+        limit = 1
+    elif tag.startswith("max_concurrency:"):
+        name, _, limit = tag[len("max_concurrency:") :].rpartition("=")
+        if not limit.isdigit() or int(limit) < 1:
+            raise ValueError("%s (expected: @max_concurrency:NAME=N)" % tag)
+        limit = int(limit)
+    else:
+        return None
+    if not name:
+        raise ValueError("%s (resource name missing)" % tag)
+    return name, limit
+
+
+def job_resources(item):
+    """Provide the resources (with concurrency limits) used by a job.
+
+    :param item:  Feature or Scenario (model element).
+    :return: Dict with {name: limit} (the smallest limit per resource wins).
+    """
+    if isinstance(item, Feature):
+        tags = list(item.tags)
+        for scenario in item.walk_scenarios(with_outlines=True):
+            tags.extend(scenario.tags)
+    else:
+        tags = item.effective_tags
+    resources = {}
+    for tag in tags:
+        resource = parse_resource_tag(tag)
+        if resource:
+            name, limit = resource
+            resources[name] = min(limit, resources.get(name, limit))
+    return resources
+
+
+class ResourceLimits(object):
+    """Tracks which shared resources are used by the running jobs.
+
+    A job may start if, for each of its resources, the number of running
+    holders is less than its own limit and the limits of all holders.
+    Therefore, an "exclusive" job never overlaps with any other job that
+    uses the same resource.
+    """
+
+    def __init__(self):
+        self.holders = {}  # -- MAPS: name => [limit, ...] (one per holder)
+
+    def can_acquire(self, resources):
+        for name, limit in resources.items():
+            holders = self.holders.get(name, [])
+            if len(holders) >= min([limit] + holders):
+                return False
+        return True
+
+    def acquire(self, resources):
+        for name, limit in resources.items():
+            self.holders.setdefault(name, []).append(limit)
+
+    def release(self, resources):
+        for name, limit in resources.items():
+            holders = self.holders[name]
+            holders.remove(limit)
+            if not holders:
+                del self.holders[name]
+
+
+class BatchSizer(object):
+    """Determines how many jobs are sent to a worker at once.
+
+    The batch size is chosen so that a batch takes about `target_duration`
+    seconds (based on the mean duration of the finished jobs). To keep the
+    load balanced, a batch contains at most a fraction of the pending jobs
+    per worker (guided self-scheduling): batches shrink near the end of
+    the run. A `target_duration` of zero disables batching.
+    """
+
+    max_size = 100
+
+    def __init__(self, target_duration=0, workers=1, max_size=None):
+        self.target_duration = target_duration
+        self.workers = workers
+        if max_size is not None:
+            self.max_size = max_size
+        self.total_duration = 0.0
+        self.count = 0
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(config.parallel_batch_duration or 0)
+
+    def add_duration(self, duration):
+        self.total_duration += duration
+        self.count += 1
+
+    def next_size(self, pending):
+        if not self.target_duration or not self.count:
+            return 1  # -- UNKNOWN JOB DURATIONS: Start with single jobs.
+        mean_duration = self.total_duration / self.count
+        size = self.max_size
+        if mean_duration > 0:
+            size = int(self.target_duration / mean_duration)
+        size = min(size, self.max_size, pending // (2 * self.workers))
+        return max(size, 1)
+
+
+# -----------------------------------------------------------------------------
+# JOB TIMEOUTS:
+# -----------------------------------------------------------------------------
+class JobTimeoutError(Exception):
+    """Raised in a worker, when a scenario exceeds its timeout."""
+
+
+def parse_timeout_tag(tag):
+    """Parse a timeout tag: "timeout:SECONDS".
+
+    :param tag:  Tag name (without "@").
+    :return: Timeout in seconds or None, if tag is no timeout tag.
+    :raises ValueError: If the tag is malformed.
+    """
+    if not tag.startswith("timeout:"):
+        return None
+    try:
+        timeout = float(tag[len("timeout:") :])
+    except ValueError:
+        timeout = 0
+    if timeout <= 0:
+        raise ValueError("%s (expected: @timeout:SECONDS)" % tag)
+    return timeout
+
+
+def scenario_timeout(scenario, default=None):
+    """Provide the timeout of a scenario: Its smallest @timeout:SECONDS tag
+    (also inherited from feature or outline) or the default (--job-timeout).
+
+    :return: Timeout in seconds or None (no timeout).
+    """
+    timeouts = [
+        timeout
+        for timeout in (parse_timeout_tag(tag) for tag in scenario.effective_tags)
+        if timeout
+    ]
+    if timeouts:
+        return min(timeouts)
+    return default or None
+
+
+def job_timeout(item, default=None):
+    """Provide the timeout of a job: Sum of the timeouts of its scenarios.
+
+    :param item:  Feature or Scenario (model element).
+    :return: Timeout in seconds or None, if a scenario has no timeout.
+    """
+    scenarios = [item]
+    if isinstance(item, Feature):
+        scenarios = list(item.walk_scenarios())
+    timeouts = [scenario_timeout(scenario, default) for scenario in scenarios]
+    if not timeouts or None in timeouts:
+        return None
+    return sum(timeouts)
+
+
+class TimeLimitedMatch(object):
+    """Match of a worker, that runs its step function with the job timeout
+    (see :meth:`MultiProcClientRunner.time_limit()`).
+    """
+
+    def __init__(self, match, runner):
+        self.match = match
+        self.runner = runner
+
+    def __getattr__(self, name):
+        return getattr(self.match, name)
+
+    def run(self, context):
+        with self.runner.time_limit():
+            self.match.run(context)
+
+
+class TimeLimitedStepRegistry(object):
+    """Step registry of a worker, that provides :class:`TimeLimitedMatch`
+    objects while a scenario with a timeout runs.
+    """
+
+    def __init__(self, registry, runner):
+        self.registry = registry
+        self.runner = runner
+
+    def __getattr__(self, name):
+        return getattr(self.registry, name)
+
+    def find_match(self, step):
+        match = self.registry.find_match(step)
+        if match is None or self.runner.scenario_deadline is None:
+            return match
+        return TimeLimitedMatch(match, self.runner)
+
+
+# -----------------------------------------------------------------------------
+# WORKER RECYCLING:
+# -----------------------------------------------------------------------------
+def parse_size(text):
+    """Parse a memory size: "{number}[K|M|G]" (bytes, kilo-, mega-, gigabytes).
+
+    :return: Size in bytes.
+    :raises ValueError: If the size is malformed.
+    """
+    text = six.text_type(text).strip().upper()
+    factor = 1
+    if text and text[-1] in "KMG":
+        factor = 1024 ** ("KMG".index(text[-1]) + 1)
+        text = text[:-1]
+    if not text.isdigit():
+        raise ValueError("invalid size: %s (expected: NUMBER[K|M|G])" % text)
+    return int(text) * factor
+
+
+def current_rss():
+    """Resident set size (memory usage) of this process in bytes.
+
+    Uses the current RSS on Linux, otherwise the peak RSS.
+    :return: RSS in bytes or None, if it is unknown (on Windows).
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (IOError, OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return max_rss  # -- IN BYTES (otherwise: kilobytes).
+    return max_rss * 1024
+
+
+class RecyclePolicy(object):
+    """Decides when a worker retires (and is replaced by a fresh process),
+    so that the memory growth of leaky step libraries stays bounded
+    (like `maxtasksperchild` of :class:`multiprocessing.pool.Pool`).
+    """
+
+    def __init__(self, max_jobs=None, max_rss=None):
+        self.max_jobs = max_jobs
+        self.max_rss = max_rss
+        self.jobs = 0
+
+    @classmethod
+    def from_config(cls, config):
+        max_jobs = config.max_jobs_per_worker
+        max_rss = config.max_worker_rss
+        if max_rss is not None:
+            max_rss = parse_size(max_rss)
+        return cls(max_jobs, max_rss)
+
+    def add_jobs(self, count):
+        self.jobs += count
+
+    def retire_reason(self):
+        """Check if the worker should retire (after a batch of jobs).
+
+        :return: Reason (as text) or None (worker goes on).
+        """
+        if self.max_jobs and self.jobs >= self.max_jobs:
+            return "after %d jobs" % self.jobs
+        if self.max_rss:
+            rss = current_rss()
+            if rss is not None and rss >= self.max_rss:
+                return "RSS of %d MB" % (rss // (1024 * 1024))
+        return None
+
+
+# -----------------------------------------------------------------------------
+# DISTRIBUTED MODE (remote workers over TCP):
+# -----------------------------------------------------------------------------
+AUTHKEY_ENVIRONMENT_VARIABLE = "BEHAVE_PARALLEL_AUTHKEY"
+
+
+def parse_address(text):
+    """Parse a TCP address "HOST:PORT" into a tuple (host, port)."""
+    host, _, port = (text or "").rpartition(":")
+    if not host or not port.isdigit():
+        raise ValueError("%s (expected: HOST:PORT)" % text)
+    return host, int(port)
+
+
+def get_authkey(config):
+    """Provide the shared secret of the master and its remote workers.
+
+    :raises ValueError: If no authentication key is configured.
+    """
+    authkey = config.parallel_authkey or os.environ.get(AUTHKEY_ENVIRONMENT_VARIABLE)
+    if not authkey:
+        raise ValueError(
+            "authentication key missing (use --parallel-authkey or %s)"
+            % AUTHKEY_ENVIRONMENT_VARIABLE
+        )
+    return six.text_type(authkey).encode("UTF-8")
+
+
+class WorkerListener(object):
+    """Accepts connections of remote workers (behave --worker HOST:PORT).
+
+    A background thread accepts (and authenticates) the connections and
+    wakes the event loop of the master via the `wakeup` connection.
+    """
+
+    def __init__(self, address, authkey):
+        self.listener = multiprocessing.connection.Listener(address, authkey=authkey)
+        self.accepted = collections.deque()
+        self.wakeup, self._notify = multiprocessing.connection.Pipe(duplex=False)
+        self.closed = False
+        self.thread = threading.Thread(target=self.accept_connections)
+        self.thread.daemon = True
+
+    @property
+    def address(self):
+        return self.listener.address
+
+    def start(self):
+        self.thread.start()
+
+    def accept_connections(self):
+        while not self.closed:
+            try:
+                conn = self.listener.accept()
+            except (multiprocessing.AuthenticationError, EOFError, OSError) as e:
+                if not self.closed:
+                    print("WARNING: rejected worker connection: %s" % e)
+                continue
+            self.accepted.append((conn, self.listener.last_accepted))
+            self._notify.send(None)
+
+    def pop_connections(self):
+        """Provide the newly accepted connections (and their peer address)."""
+        while self.wakeup.poll():
+            self.wakeup.recv()
+        connections = []
+        while self.accepted:
+            connections.append(self.accepted.popleft())
+        return connections
+
+    def close(self):
+        self.closed = True
+        self.listener.close()
+        self._notify.close()
+        self.wakeup.close()
+
+
+def connect_to_master(address, authkey, timeout=60.0):
+    """Connect to the master (retries until the master listens).
+
+    :return: Connection to the master.
+    :raises OSError: If the master cannot be reached within `timeout`.
+    """
+    deadline = time.time() + timeout
+    while True:
+        try:
+            return multiprocessing.connection.Client(address, authkey=authkey)
+        except OSError:
+            if time.time() >= deadline:
+                raise
+            time.sleep(0.5)
+
+
+class WorkerProcess(object):
+    """Master-side state of a worker process.
+    A remote worker has no (local) process, only its connection.
+    """
+
+    def __init__(self, num, process, conn):
+        self.num = num
+        self.process = process
+        self.conn = conn
+        self.jobs = []
+        self.resources = {}
+        self.stopping = False  # -- SENTINEL JOB: Was sent to the worker.
+        self.retiring = False  # -- RECYCLE: Worker is replaced when done.
+        self.deadline = None  # -- WATCHDOG: Time limit of the current jobs.
+        self.timeout_output = None  # -- WATCHDOG: Captured output of a hung job.
+        self.done = False
+        self.closed = False
+
+    def __repr__(self):
+        return "<WorkerProcess %d: jobs=%r>" % (self.num, self.jobs)
+
+
+class WorkerThread(threading.Thread):
+    """Worker of the threads backend (--parallel-backend threads).
+
+    Runs a :class:`ThreadClientRunner` in the master process and provides
+    the interface of a worker process, that the master uses:
+    the `sentinel` becomes ready when the thread has finished.
+    A thread cannot be killed: a hung worker thread is abandoned
+    (as daemon thread) by :meth:`terminate()`.
+    """
+
+    def __init__(self, config, num, conn, feature_locations, hooks):
+        threading.Thread.__init__(self, name="behave-worker-%d" % num)
+        self.daemon = True
+        self.config = config
+        self.num = num
+        self.conn = conn
+        self.feature_locations = feature_locations
+        self.hooks = hooks
+        self.exitcode = None
+        self.abandoned = False
+        self._sentinel, self._sentinel_writer = multiprocessing.Pipe(duplex=False)
+
+    @property
+    def sentinel(self):
+        return self._sentinel
+
+    def run(self):
+        try:
+            client = ThreadClientRunner(
+                self.config, self.num, self.conn, self.feature_locations, self.hooks
+            )
+            client.run()
+            self.exitcode = 0
+        except BaseException:  # pylint: disable=broad-except
+            traceback.print_exc()
+            self.exitcode = 1
+        finally:
+            # -- EOF: Master detects the end of the worker (like a process).
+            self.conn.close()
+            self._sentinel_writer.close()
+
+    def terminate(self):
+        self.abandoned = True
+
+    kill = terminate
+
+    def join(self, timeout=None):
+        if self.abandoned:
+            return  # -- HUNG THREAD: Is left behind.
+        threading.Thread.join(self, timeout)
+        if not self.is_alive():
+            self._sentinel.close()
 
 
 class MultiProcRunner(Runner):
@@ -30,153 +660,730 @@ class MultiProcRunner(Runner):
     def __init__(self, config):
         super(MultiProcRunner, self).__init__(config)
         self.jobs_map = {}
-        self.jobsq = multiprocessing.JoinableQueue()
-        self.resultsq = multiprocessing.Queue()
+        self.jobs = []
+        self.job_resources = {}
+        self.job_timeouts = {}
+        self.pending = collections.deque()
+        self.workers = []
+        self.waiting_workers = []
+        self.resource_limits = ResourceLimits()
+        self.mp_context = multiprocessing.get_context(config.parallel_start_method)
         self._reported_features = set()
+        self._reported_scenarios = set()
+        self.active_feature = None
         self.results_fail = False
+        self.result_packer = ResultPacker.from_config(config)
+        self.batch_sizer = BatchSizer.from_config(config)
+        self.timings = None
+        self.max_failures = int(config.max_failures or 0) or (1 if config.stop else 0)
+        self.failures = 0
+        self.stopped = False
+        self.crash_retries = int(config.parallel_crash_retries)
+        self.timeout_grace = 5.0
+        self.crashes = {}
+        self.listener = None
+        self.shared_loop = None
+        self.worker_config = config
+        self.worker_feature_locations = []
+        self.next_worker_num = 0
 
     def run_with_paths(self):
-        feature_locations = [
+        feature_locations = unique_feature_locations(
             filename
             for filename in self.feature_locations()
             if not self.config.exclude(filename)
-        ]
+        )
         self.load_hooks()  # hooks themselves not used, but 'environment.py' loaded
         # step definitions are needed here for formatters only
         self.load_step_definitions()
-        features = parse_features(feature_locations, language=self.config.lang)
+        features = parse_features(
+            feature_locations,
+            language=self.config.lang,
+            jobs=self.config.parallel_parse or 0,
+            cache=FeatureCache.from_config(self.config),
+        )
         self.features.extend(features)
         feature_count, scenario_count = self.scan_features()
+        timings_file = self.config.timings_file
+        if not timings_file and self.config.parallel_schedule == "longest-first":
+            timings_file = DEFAULT_TIMINGS_FILE
+        if timings_file:
+            self.timings = TimingStore(timings_file).load()
+        self.queue_jobs()
         njobs = len(self.jobs_map)
         proc_count = int(self.config.proc_count)
+        if self.config.parallel_listen:
+            try:
+                self.listener = WorkerListener(
+                    parse_address(self.config.parallel_listen),
+                    get_authkey(self.config),
+                )
+            except (ValueError, OSError) as e:
+                print("ERROR: cannot listen for remote workers: %s" % e)
+                return True
         print(
             "INFO: {0} scenario(s) and {1} feature(s) queued for"
             " consideration by {2} workers. Some may be skipped if the"
             " -t option was given...".format(scenario_count, feature_count, proc_count)
         )
 
-        procs = []
         old_outs = self.config.outputs
         self.config.outputs = []
         old_reporters = self.config.reporters
         self.config.reporters = []
+        # -- WORKERS: Use the configuration without outputs (also later on,
+        #    for remote and replacement workers).
+        self.worker_config = copy.copy(self.config)
+        self.worker_feature_locations = feature_locations
 
-        for i in range(proc_count):
-            client = MultiProcClientRunner(self, i)
-            p = multiprocessing.Process(target=client.run)
-            procs.append(p)
-            p.start()
-            del p
-
-        print("INFO: started {0} workers for {1} jobs.".format(proc_count, njobs))
-
-        self.config.reporters = old_reporters
-        self.formatters = make_formatters(self.config, old_outs)
-        self.config.outputs = old_outs
-        while not self.jobsq.empty():
-            # 1: consume while tests are running
-            self.consume_results()
-            if not any([p.is_alive() for p in procs]):
-                break
-
-        if any([p.is_alive() for p in procs]):
-            self.jobsq.join()  # wait for all jobs to be processed
-            print("INFO: all jobs have been processed")
-
-            while self.consume_results(timeout=0.1):
-                # 2: remaining results
-                pass
+        # -- THREAD WORKERS: Capture their output and logging per thread.
+        threads = self.config.parallel_backend != "processes"
+        with thread_local_capture(self.config, enabled=threads):
+            if self.config.parallel_backend == "asyncio":
+                # -- ASYNC STEPS: Of all worker threads run in one event loop.
+                self.shared_loop = SharedEventLoop().start()
+            self.batch_sizer.workers = max(proc_count, 1)
+            for i in range(proc_count):
+                self.start_worker(i, feature_locations)
+            self.next_worker_num = proc_count
 
-            # then, wait for all workers to exit:
-            [p.join() for p in procs]
+            print("INFO: started {0} workers for {1} jobs.".format(proc_count, njobs))
+            if self.listener is not None:
+                self.listener.start()
+                print(
+                    "INFO: listening for remote workers at {0}:{1}".format(
+                        *self.listener.address
+                    )
+                )
+                sys.stdout.flush()
 
+            self.config.reporters = old_reporters
+            self.formatters = make_formatters(self.config, old_outs)
+            self.config.outputs = old_outs
+            try:
+                self.wait_for_workers()
+            except BaseException:
+                # -- MASTER FAILED (KeyboardInterrupt, broken stdout, ...):
+                #    Workers would wait for their next job forever.
+                self.terminate_workers()
+                raise
+            finally:
+                if self.listener is not None:
+                    self.listener.close()
+                if self.shared_loop is not None:
+                    self.shared_loop.stop()
         print("INFO: all sub-processes have returned")
 
-        while self.consume_results(timeout=0.1):
-            # 3: just in case some arrive late in the pipe
-            pass
-
-        for f in self.features:
-            # make sure all features (including ones that have not returned)
-            # are printed
-            self._output_feature(f)
+        self.output_remaining_features()
 
         for formatter in self.formatters:
             formatter.close()
         for reporter in self.config.reporters:
             reporter.end()
 
+        if self.timings is not None:
+            self.timings.save()
         return self.results_fail
 
     def scan_features(self):
         raise NotImplementedError
 
-    def consume_results(self, timeout=1):
+    def add_job(self, item):
+        job_id = job_location(item)
+        if job_id in self.jobs_map:
+            # -- OVERLAPPING LOCATIONS: Like "alice.feature:3 alice.feature".
+            print("WARNING: %s: duplicated job is run only once" % job_id)
+            return
+        self.jobs_map[job_id] = item
+        self.jobs.append(job_id)
+        try:
+            resources = job_resources(item)
+        except ValueError as e:
+            print("WARNING: %s: invalid concurrency tag: %s" % (job_id, e))
+            resources = {}
+        if resources:
+            self.job_resources[job_id] = resources
+        try:
+            timeout = job_timeout(item, float(self.config.job_timeout or 0))
+        except ValueError as e:
+            print("WARNING: %s: invalid timeout tag: %s" % (job_id, e))
+            timeout = None
+        if timeout:
+            self.job_timeouts[job_id] = timeout
+
+    def make_worker_args(self, num, conn, feature_locations):
+        """Provide the arguments of a worker process (for :func:`run_worker()`).
+
+        Forked workers inherit the parsed features (jobs_map) and the loaded
+        hooks of the master. Otherwise (spawn, forkserver), only the feature
+        locations are sent and the worker parses the features by itself.
+        """
+        if self.mp_context.get_start_method() == "fork":
+            return (
+                self.worker_config,
+                num,
+                conn,
+                feature_locations,
+                self.jobs_map,
+                self.hooks,
+            )
+        return (self.worker_config, num, conn, feature_locations)
+
+    def start_worker(self, num, feature_locations):
+        if self.config.parallel_backend != "processes":
+            return self.start_worker_thread(num, feature_locations)
+        conn, worker_conn = self.mp_context.Pipe()
+        process = self.mp_context.Process(
+            target=run_worker,
+            args=self.make_worker_args(num, worker_conn, feature_locations),
+        )
+        process.start()
+        # -- CLOSE: Worker end of the pipe (EOF is detected, if worker dies).
+        worker_conn.close()
+        worker = WorkerProcess(num, process, conn)
+        self.workers.append(worker)
+        return worker
+
+    def start_worker_thread(self, num, feature_locations):
+        """Start a worker thread (threads or asyncio backend).
+
+        Each thread parses the features of its jobs by itself, because the
+        scenarios of a feature may run concurrently (and would share their
+        background steps otherwise). Hooks and step definitions are shared.
+        """
+        conn, worker_conn = multiprocessing.Pipe()
+        config = copy.copy(self.worker_config)
+        # -- SAME PROCESS: Module state and memory are shared by all threads.
+        config.parallel_reload_steps = False
+        config.max_worker_rss = None
+        thread = WorkerThread(config, num, worker_conn, feature_locations, self.hooks)
+        thread.start()
+        worker = WorkerProcess(num, thread, conn)
+        self.workers.append(worker)
+        return worker
+
+    def accept_workers(self):
+        """Add the remote workers that have connected (in the meantime).
+
+        A remote worker receives its number, the configuration and the
+        feature locations. Then, it requests jobs like a local worker.
+        """
+        for conn, peer in self.listener.pop_connections():
+            num = self.next_worker_num
+            try:
+                conn.send(
+                    ("hello", num, self.worker_config, self.worker_feature_locations)
+                )
+            except (EOFError, OSError):
+                conn.close()
+                continue
+            self.next_worker_num += 1
+            self.batch_sizer.workers = self.next_worker_num
+            self.workers.append(WorkerProcess(num, None, conn))
+            print("INFO: remote worker {0} connected from {1}".format(num, peer))
+
+    def schedule_jobs(self):
+        """Determine the order in which the scanned jobs are handed out.
+
+        With the "longest-first" schedule, the jobs with the longest
+        (estimated) duration are started first (LPT scheduling).
+        This avoids that a long job, that is picked up late,
+        delays the end of the test run.
+
+        :return: List of job ids (in schedule order).
+        """
+        if self.config.parallel_schedule != "longest-first":
+            return list(self.jobs)
+
+        estimator = DurationEstimator(self.timings)
+        estimator.calibrate(self.features)
+        estimates = dict(
+            (job_id, estimator.estimate(self.jobs_map[job_id])) for job_id in self.jobs
+        )
+        # -- NOTE: Stable sort keeps file order for jobs with same estimate.
+        return sorted(self.jobs, key=lambda job_id: estimates[job_id], reverse=True)
+
+    def queue_jobs(self):
+        self.pending.extend(self.schedule_jobs())
+
+    def wait_for_workers(self):
+        """Event loop of the master: dispatches jobs and receives results
+        until all workers have exited.
+
+        Waits on the result pipes and the process sentinels together,
+        so that no polling (timeout) is needed. In distributed mode,
+        the master also waits for remote workers while jobs are pending.
+        """
+        while True:
+            for worker in list(self.workers):
+                if worker.process is None and worker.closed:
+                    # -- REMOTE WORKER: Has disconnected.
+                    self.finish_worker(worker)
+            if not self.workers and not (self.listener is not None and self.pending):
+                break
+
+            waitables = {}
+            if self.listener is not None:
+                waitables[self.listener.wakeup] = None
+            for worker in self.workers:
+                if not worker.closed:
+                    waitables[worker.conn] = worker
+                if worker.process is not None:
+                    waitables[worker.process.sentinel] = worker
+            timeout = self.watchdog_timeout()
+            for ready in multiprocessing.connection.wait(list(waitables), timeout):
+                worker = waitables[ready]
+                if worker is None:
+                    self.accept_workers()
+                elif ready is worker.conn:
+                    self.receive_message(worker)
+                elif worker in self.workers:
+                    self.finish_worker(worker)
+            self.kill_hung_workers()
+
+    def receive_message(self, worker):
         try:
-            job_id, result = self.resultsq.get(timeout=timeout)
-        except queue.Empty:
+            message = worker.conn.recv()
+        except (EOFError, OSError):
+            worker.closed = True
             return False
+        self.handle_message(worker, message)
+        return True
+
+    def handle_message(self, worker, message):
+        """Process a message of a worker.
+
+        Messages (as tuples):
 
-        if job_id is None and result == "set_fail":
+        * ("ready",): Worker requests its first batch of jobs.
+        * ("results", [(job_id, result), ...]): Results of the last batch
+          (requests the next batch).
+        * ("failed",): Worker had failures.
+        * ("hook_durations", data): Durations of the hooks run by the worker.
+        * ("timeout_output", text): Captured output of a scenario that has
+          exceeded its timeout (reported with it, if the worker is killed).
+        * ("retire", reason): Worker wants to be replaced by a fresh process
+          (sent before the results of its last batch).
+        * ("done",): Worker has finished (after receiving the sentinel job).
+        """
+        kind = message[0]
+        if kind == "ready":
+            self.dispatch(worker)
+        elif kind == "results":
+            finished = set()
+            for job_id, result in message[1]:
+                finished.add(job_id)
+                self.consume_result(job_id, result)
+            # -- NOT STARTED: Worker stopped before it ran these jobs.
+            self.return_jobs([j for j in worker.jobs if j not in finished])
+            self.release_jobs(worker)
+            self.dispatch(worker)
+            self.dispatch_waiting_workers()
+        elif kind == "retire":
+            print("INFO: worker %d retires (%s)" % (worker.num, message[1]))
+            worker.retiring = True
+        elif kind == "failed":
             self.results_fail = True
-            return True
+        elif kind == "hook_durations":
+            if self.timings is not None:
+                self.timings.add_hook_durations(message[1])
+        elif kind == "timeout_output":
+            worker.timeout_output = message[1]
+        elif kind == "done":
+            worker.done = True
+            # -- NOT STARTED: Worker stopped before it received these jobs.
+            self.return_jobs(worker.jobs)
+            self.release_jobs(worker)
+            self.dispatch_waiting_workers()
+        else:
+            print("ERROR: unknown message from worker %d: %r" % (worker.num, kind))
+
+    def dispatch(self, worker):
+        """Send the next batch of jobs to a worker (or the sentinel job: None).
+
+        If all pending jobs are blocked by concurrency limits,
+        the worker waits until a running job releases its resources.
+        """
+        if worker.stopping:
+            return  # -- SENTINEL JOB: Already sent (when the run was stopped).
+        if worker.retiring:
+            jobs, resources = [], {}  # -- RECYCLE: Worker stops (is replaced).
+        else:
+            size = self.batch_sizer.next_size(len(self.pending))
+            if self.pending and self.pending[0] in self.crashes:
+                size = 1  # -- RETRY: Crashed job alone (to find the culprit).
+            jobs, resources = self.take_jobs(size)
+            if not jobs and self.pending:
+                self.waiting_workers.append(worker)
+                return
+        try:
+            worker.conn.send(jobs or None)
+        except (EOFError, OSError):
+            # -- WORKER DIED: Keep the jobs for the other workers.
+            worker.closed = True
+            self.return_jobs(jobs)
+            return
+        worker.stopping = not jobs
+        worker.jobs = jobs
+        worker.resources = resources
+        worker.deadline = self.make_deadline(jobs)
+        self.resource_limits.acquire(resources)
+
+    def dispatch_waiting_workers(self):
+        waiting_workers = self.waiting_workers
+        self.waiting_workers = []
+        for worker in waiting_workers:
+            if not worker.closed:
+                self.dispatch(worker)
+
+    def take_jobs(self, size):
+        """Take up to `size` pending jobs (in schedule order) that are not
+        blocked by the concurrency limits of their resources.
+
+        :return: Tuple (jobs, resources) with the resources of all jobs.
+        """
+        if not self.job_resources:
+            count = min(size, len(self.pending))
+            return [self.pending.popleft() for _ in range(count)], {}
+
+        jobs = []
+        resources = {}
+        index = 0
+        while index < len(self.pending) and len(jobs) < size:
+            job_id = self.pending[index]
+            job_resources = self.job_resources.get(job_id, {})
+            # -- BATCH: Runs its jobs one after another (resources held once).
+            more_resources = dict(
+                (name, limit)
+                for name, limit in job_resources.items()
+                if name not in resources
+            )
+            if self.resource_limits.can_acquire(more_resources):
+                del self.pending[index]
+                jobs.append(job_id)
+                for name, limit in job_resources.items():
+                    resources[name] = min(limit, resources.get(name, limit))
+            else:
+                index += 1
+        return jobs, resources
 
+    def release_jobs(self, worker):
+        self.resource_limits.release(worker.resources)
+        worker.jobs = []
+        worker.resources = {}
+        worker.deadline = None
+        worker.timeout_output = None
+
+    def make_deadline(self, jobs):
+        """Time when a worker is killed, if it has not finished these jobs.
+
+        A worker fails a scenario that exceeds its timeout by itself.
+        The master watchdog kills the worker only if that did not work
+        (after a grace time), because the worker hangs in native code
+        or its signals are blocked.
+        """
+        timeouts = [self.job_timeouts.get(job_id) for job_id in jobs]
+        if not timeouts or None in timeouts:
+            return None
+        return time.time() + sum(timeouts) + self.timeout_grace
+
+    def watchdog_timeout(self):
+        """Time until the next deadline of a worker (or None)."""
+        deadlines = [w.deadline for w in self.workers if w.deadline is not None]
+        if not deadlines:
+            return None
+        return max(min(deadlines) - time.time(), 0)
+
+    def kill_hung_workers(self):
+        """Watchdog: Kill workers that have exceeded their deadline.
+
+        A single job of a killed worker is marked as failed (timeout).
+        The jobs of a batch are retried alone (like after a crash),
+        because the hung job is unknown. The worker is replaced.
+        """
+        now = time.time()
+        for worker in list(self.workers):
+            if worker.deadline is None or worker.deadline > now:
+                continue
+            reason = "worker %d was killed after its jobs exceeded their timeout" % (
+                worker.num
+            )
+            print("ERROR: %s" % reason)
+            jobs = list(worker.jobs)
+            if len(jobs) == 1:
+                error_message = "TIMEOUT: %s" % reason
+                if worker.timeout_output:
+                    error_message += "\n" + worker.timeout_output
+                self.mark_failed(jobs[0], error_message)
+            else:
+                self.recover_jobs(jobs, reason)
+            self.release_jobs(worker)
+            worker.done = True  # -- HANDLED: Not reported as crash.
+            if worker.process is not None:
+                worker.process.terminate()
+                worker.process.join(self.timeout_grace)
+                if worker.process.is_alive():
+                    worker.process.kill()
+            self.finish_worker(worker)
+            if worker.process is not None and self.pending:
+                self.replace_worker()
+
+    def return_jobs(self, jobs):
+        """Put jobs back to the front of the pending jobs (in their order)."""
+        if self.stopped:
+            return  # -- FAIL-FAST: Jobs are not run (untested).
+        self.pending.extendleft(reversed(jobs))
+
+    def stop_jobs(self):
+        """Stop the test run (fail-fast: --stop, --max-failures).
+
+        The pending jobs are not run (their status remains untested).
+        The workers receive the sentinel job now, so that a busy worker
+        stops before its next job (a running job is finished).
+        """
+        print(
+            "INFO: stopping after {0} failure(s): {1} pending job(s) not run.".format(
+                self.failures, len(self.pending)
+            )
+        )
+        self.stopped = True
+        self.pending.clear()
+        self.dispatch_waiting_workers()
+        for worker in self.workers:
+            if not worker.jobs or worker.stopping or worker.closed:
+                continue
+            try:
+                worker.conn.send(None)
+                worker.stopping = True
+            except (EOFError, OSError):
+                worker.closed = True
+
+    def finish_worker(self, worker):
+        """Cleanup after the worker process has exited.
+
+        If the worker has crashed (segfault, OOM-kill, os._exit(), ...),
+        its unfinished jobs are retried or marked as crashed (failed) and
+        a local worker is replaced, so that the throughput stays constant.
+        """
+        # -- DRAIN: Messages sent before the worker process exited.
+        while not worker.closed and worker.conn.poll():
+            self.receive_message(worker)
+        if worker.process is not None:
+            worker.process.join()
+        worker.conn.close()
+        worker.closed = True
+        self.workers.remove(worker)
+        crashed_jobs = list(worker.jobs)
+        self.release_jobs(worker)
+        if not worker.done:
+            if worker.process is None:
+                reason = "remote worker %d disconnected unexpectedly" % worker.num
+            else:
+                reason = "worker %d exited unexpectedly (exitcode=%s)" % (
+                    worker.num,
+                    worker.process.exitcode,
+                )
+            print("ERROR: %s" % reason)
+            if not crashed_jobs:
+                self.results_fail = True  # -- CRASHED: Outside of jobs.
+            else:
+                self.recover_jobs(crashed_jobs, reason)
+                if worker.process is not None and self.pending:
+                    # -- REPLACE WORKER: Keep the number of local workers.
+                    self.replace_worker()
+        elif worker.retiring and worker.process is not None and self.pending:
+            self.replace_worker()
+        self.dispatch_waiting_workers()
+
+    def replace_worker(self):
+        """Start a new local worker (for a crashed or retired one)."""
+        self.start_worker(self.next_worker_num, self.worker_feature_locations)
+        self.next_worker_num += 1
+
+    def terminate_workers(self):
+        for worker in self.workers:
+            worker.conn.close()
+            if worker.process is not None:
+                worker.process.terminate()
+                worker.process.join()
+        self.workers = []
+
+    def recover_jobs(self, job_ids, reason):
+        """Retry the jobs of a crashed worker (or mark them as crashed).
+
+        The worker may have crashed in any job of its batch. Therefore,
+        each job is retried (alone) up to `crash_retries` times.
+        """
+        retry_jobs = []
+        for job_id in job_ids:
+            crashes = self.crashes.get(job_id, 0) + 1
+            self.crashes[job_id] = crashes
+            if crashes <= self.crash_retries:
+                retry_jobs.append(job_id)
+            else:
+                self.mark_failed(job_id, "CRASHED: %s" % reason)
+        if retry_jobs and not self.stopped:
+            print("INFO: retrying job(s): %s" % ", ".join(retry_jobs))
+            self.return_jobs(retry_jobs)
+
+    def mark_failed(self, job_id, error_message):
+        """Mark a job as failed, because its worker did not finish it
+        (crashed or killed by the watchdog).
+        """
+        item = self.jobs_map[job_id]
+        scenarios = [item]
+        if isinstance(item, Feature):
+            scenarios = list(item.walk_scenarios())
+        for scenario in scenarios:
+            steps = list(scenario.all_steps)
+            if steps:
+                steps[0].status = Status.failed
+                steps[0].error_message = error_message
+            else:
+                scenario.set_status(Status.failed)
+        self.results_fail = True
+        self.finish_job(job_id, item)
+
+    def consume_result(self, job_id, result):
         item = self.jobs_map.get(job_id)
         if item is None:
-            print("ERROR: job_id=%x not found in master map" % job_id)
-            return True
+            print("ERROR: job_id=%s not found in master map" % job_id)
+            return
+        elif result is None:
+            return  # -- JOB NOT FOUND by worker.
 
         try:
-            item.recv_status(result)
-            if isinstance(item, Feature):
-                self._output_feature(item)
-            elif isinstance(item, Scenario):
-                feature = item.feature
-                if feature.is_finished:
-                    self._output_feature(feature)
-                else:
-                    print("INFO: scenario finished: %x" % (job_id,))
+            item.recv_status(self.result_packer.unpack(result))
+            self.batch_sizer.add_duration(item.duration)
+            self.finish_job(job_id, item)
         except Exception as e:
             print("ERROR: cannot receive status for %r: %s" % (item, e))
             if self.config.wip and not self.config.quiet:
                 import traceback
 
                 traceback.print_exc()
-        return True
+
+    def finish_job(self, job_id, item):
+        """Count the failures of a finished job and output its results."""
+        if item.status == Status.failed:
+            self.count_failures(item)
+        if self.config.parallel_report == "scenario":
+            self.stream_results()
+        elif isinstance(item, Feature):
+            self._output_feature(item)
+        elif isinstance(item, Scenario):
+            feature = item.feature
+            if feature.is_finished:
+                self._output_feature(feature)
+            else:
+                print("INFO: scenario finished: %s" % (job_id,))
+
+    def count_failures(self, item):
+        """Count the failed scenarios of a job (and stop, if too many)."""
+        failures = 1
+        if isinstance(item, Feature):
+            failures = max(
+                1,
+                len([s for s in item.walk_scenarios() if s.status == Status.failed]),
+            )
+        self.failures += failures
+        if self.max_failures and self.failures >= self.max_failures:
+            if not self.stopped:
+                self.stop_jobs()
+
+    def stream_results(self):
+        """Output the finished scenarios as soon as their results arrive.
+
+        Formatters can only process one feature at a time. Therefore, only
+        the scenarios of the active feature are output. Results of other
+        features are kept until their feature becomes the active one
+        (the first feature, in file order, with finished scenarios).
+        """
+        while True:
+            feature = self.active_feature
+            if feature is None:
+                feature = self._next_stream_feature()
+                if feature is None:
+                    return
+                self._output_feature_start(feature)
+
+            for scenario in feature.walk_scenarios():
+                if scenario.is_finished:
+                    self._output_scenario(scenario)
+            if not feature.is_finished:
+                return
+            self._output_feature_end(feature)
+
+    def _next_stream_feature(self):
+        for feature in self.features:
+            if id(feature) in self._reported_features:
+                continue
+            if any(scenario.is_finished for scenario in feature.walk_scenarios()):
+                return feature
+        return None
+
+    def output_remaining_features(self):
+        """Output all features that are not reported yet (at the end of the
+        run), including features with unfinished (stopped, crashed) jobs.
+        """
+        for feature in self.features:
+            self._output_feature(feature)
 
     def _output_feature(self, feature):
         if id(feature) in self._reported_features:
             return
-        self._reported_features.add(id(feature))
+        if feature is not self.active_feature:
+            if self.active_feature is not None:
+                # -- STREAMED FEATURE (--parallel-report=scenario):
+                #    Finish it first, formatters process one feature at a time.
+                self._output_feature(self.active_feature)
+            self._output_feature_start(feature)
+        for scenario in feature.walk_scenarios():
+            self._output_scenario(scenario)
+        self._output_feature_end(feature)
 
+    def _output_feature_start(self, feature):
+        assert self.active_feature is None
+        self.active_feature = feature
         for formatter in self.formatters:
             formatter.uri(feature.filename)
             formatter.feature(feature)
             if feature.background:
                 formatter.background(feature.background)
-            for scenario in feature.scenarios:
-                formatter.scenario(scenario)
-                for step in scenario.steps:
-                    formatter.step(step)
-                for step in scenario.steps:
-                    match = the_step_registry.find_match(step)
-                    if match:
-                        formatter.match(match)
-                    else:
-                        formatter.match(NoMatch())
-                    formatter.result(step)
 
+    def _output_scenario(self, scenario):
+        if id(scenario) in self._reported_scenarios:
+            return
+        self._reported_scenarios.add(id(scenario))
+
+        for formatter in self.formatters:
+            formatter.scenario(scenario)
+            for step in scenario.steps:
+                formatter.step(step)
+            for step in scenario.steps:
+                match = the_step_registry.find_match(step)
+                if match:
+                    formatter.match(match)
+                else:
+                    formatter.match(NoMatch())
+                formatter.result(step)
+
+    def _output_feature_end(self, feature):
+        self.active_feature = None
+        self._reported_features.add(id(feature))
+        for formatter in self.formatters:
             formatter.eof()
 
         for reporter in self.config.reporters:
             reporter.feature(feature)
+        if self.timings is not None:
+            self.timings.add_feature(feature, the_step_registry)
 
 
 class MultiProcRunner_Feature(MultiProcRunner):
     def scan_features(self):
         for feature in self.features:
-            self.jobs_map[id(feature)] = feature
-            self.jobsq.put(id(feature))
+            self.add_job(feature)
             for scen in feature.scenarios:
                 scen.background_steps
                 if isinstance(scen, ScenarioOutline):
@@ -190,12 +1397,7 @@ class MultiProcRunner_Feature(MultiProcRunner):
 class MultiProcRunner_Scenario(MultiProcRunner):
     def scan_features(self):
         nfeat = nscens = 0
-
-        def put(sth):
-            idf = id(sth)
-            self.jobs_map[idf] = sth
-            self.jobsq.put(idf)
-
+        put = self.add_job
         for feature in self.features:
             if "serial" in feature.tags:
                 put(feature)
@@ -221,81 +1423,390 @@ class MultiProcRunner_Scenario(MultiProcRunner):
         return nfeat, nscens
 
 
+def run_worker(config, num, conn, feature_locations, jobs_map=None, hooks=None):
+    """Entry point of a worker process (must be picklable for spawn)."""
+    client = MultiProcClientRunner(
+        config, num, conn, feature_locations, jobs_map, hooks
+    )
+    return client.run()
+
+
+def run_remote_worker(config):
+    """Entry point of a remote worker (behave --worker HOST:PORT).
+
+    Connects to the master, receives the configuration of the test run
+    and runs jobs until the master sends the sentinel job.
+
+    :return: 0, if successful. Non-zero, if the master was not reachable.
+    """
+    try:
+        address = parse_address(config.worker_address)
+        conn = connect_to_master(address, get_authkey(config))
+        kind, num, config, feature_locations = conn.recv()
+    except (ValueError, OSError, EOFError, multiprocessing.AuthenticationError) as e:
+        print("ERROR: cannot connect to master: %s" % e)
+        return 1
+    assert kind == "hello", "UNEXPECTED: %s" % kind
+    print("INFO: worker {0} connected to {1}:{2}".format(num, *address))
+    client = MultiProcClientRunner(config, num, conn, feature_locations)
+    client.run()
+    if client.retired:
+        # -- RECYCLE: Restart this remote worker in a fresh process.
+        sys.stdout.flush()
+        command = remote_worker_command()
+        os.execv(command[0], command)
+    return 0
+
+
+def remote_worker_command():
+    """Command that restarts a remote worker (with the same options).
+    Uses "python -m behave", because sys.argv[0] may be no Python script
+    (like: an entry-point wrapper or the "__main__.py" of "python -m behave").
+    """
+    return [sys.executable, "-m", "behave"] + sys.argv[1:]
+
+
 class MultiProcClientRunner(Runner):
-    """Multiprocessing Client runner: picks "jobs" from parent queue
+    """Multiprocessing Client runner: requests "jobs" from the master
 
     Each client is tagged with a `num` to appear in outputs etc.
+    The client communicates with the master over its pipe `conn`
+    (see :meth:`MultiProcRunner.handle_message()`).
+
+    Jobs are identified by their location ("{filename}" for features,
+    "{filename}:{line}" for scenarios). A forked worker looks them up in the
+    inherited `jobs_map` of the master. Otherwise, the worker parses the
+    feature file of a job (once) and selects the scenario by its line.
     """
 
-    def __init__(self, parent, num):
-        super(MultiProcClientRunner, self).__init__(parent.config)
+    # -- JOB TIMEOUT: A SIGALRM interrupts a blocked step function.
+    timeout_signal = hasattr(signal, "setitimer")
+    # -- WATCHDOG: Delay after a timeout until the captured output of a
+    #    still running scenario is sent to the master (before it is killed).
+    timeout_report_delay = 1.0
+
+    def __init__(
+        self,
+        config,
+        num,
+        conn,
+        feature_locations=None,
+        jobs_map=None,
+        hooks=None,
+    ):
+        super(MultiProcClientRunner, self).__init__(config)
         self.num = num
-        self.jobs_map = parent.jobs_map
-        self.jobsq = parent.jobsq
-        self.resultsq = parent.resultsq
+        self.conn = conn
+        self.selected_locations = list(feature_locations or [])
+        self.jobs_map = jobs_map
+        self.inherited = jobs_map is not None
+        self.hooks = dict(hooks or {})
+        self.parsed_features = {}
+        self.result_packer = ResultPacker.from_config(config)
+        self.recycle_policy = RecyclePolicy.from_config(config)
+        self.stopped = False
+        self.retired = False
+        self.scenario_timeout = None
+        self.scenario_deadline = None
+        self.time_limited = False
+        self.timeout_reporter = None
+        self.timeout_lock = threading.Lock()
+
+    def pack_result(self, job_id, job):
+        try:
+            return self.result_packer.pack(job.send_status())
+        except Exception as e:
+            print("ERROR: cannot send result of {0}: {1}".format(job_id, e))
+            return None
+
+    def parse_feature(self, filename):
+        """Parse a feature file (once) with the locations selected by the master."""
+        if filename not in self.parsed_features:
+            abspath = os.path.abspath(filename)
+            locations = [
+                location
+                for location in self.selected_locations
+                if os.path.abspath(getattr(location, "filename", location)) == abspath
+            ]
+            features = parse_features(
+                locations or [filename],
+                language=self.config.lang,
+                cache=FeatureCache.from_config(self.config),
+            )
+            self.parsed_features[filename] = features[0] if features else None
+        return self.parsed_features[filename]
+
+    def find_job(self, job_id):
+        if self.jobs_map is not None:
+            return self.jobs_map.get(job_id, None)
+
+        match = FileLocationParser.pattern.match(job_id)
+        if not match:
+            return self.parse_feature(job_id)
+        feature = self.parse_feature(match.group("filename"))
+        if feature is None:
+            return None
+        line = int(match.group("line"))
+        for scenario in feature.walk_scenarios():
+            if scenario.line == line:
+                return scenario
+        return None
 
     def iter_queue(self):
-        """Iterator fetching features from the queue
+        """Iterator fetching features from the master
 
         Note that this iterator is lazy and multiprocess-affected:
         it cannot know its set of features in advance, will dynamically
-        yield ones as found in the queue
+        yield ones as sent by the master (until the sentinel job: None)
+
+        The master sends batches of job ids. The results of a batch are sent
+        back together (which also requests the next batch). A worker that
+        should be recycled retires before it sends the results, so that
+        the master answers with the sentinel job.
         """
-        while True:
-            try:
-                job_id = self.jobsq.get(timeout=0.5)
-            except queue.Empty:
+        self.conn.send(("ready",))
+        while not self.stopped:
+            batch = self.conn.recv()
+            if batch is None:
                 break
 
-            job = self.jobs_map.get(job_id, None)
+            results = []
+            try:
+                for feature, jobs in self.iter_batch(batch, results):
+                    try:
+                        yield feature
+                    finally:
+                        for job_id, job in jobs:
+                            results.append((job_id, self.pack_result(job_id, job)))
+            finally:
+                self.recycle_policy.add_jobs(len(batch))
+                reason = self.recycle_policy.retire_reason()
+                if reason and not self.retired:
+                    self.retired = True
+                    self.conn.send(("retire", reason))
+                self.conn.send(("results", results))
+
+    def iter_batch(self, batch, results):
+        """Provides the features to run for a batch of jobs.
+
+        Consecutive scenario jobs of the same feature are run together
+        (in one dummy feature that contains only these scenarios).
+
+        :return: Iterator of (feature, [(job_id, job), ...]) tuples.
+        """
+        group = []
+        for job_id in batch:
+            if self.stop_requested():
+                break  # -- NOT STARTED: Remaining jobs are returned.
+            job = self.find_job(job_id)
             if job is None:
                 print("ERROR: missing job id=%s from map" % job_id)
-                self.jobsq.task_done()
+                results.append((job_id, None))
                 continue
 
             if isinstance(job, Feature):
-                yield job
-                try:
-                    self.resultsq.put((job_id, job.send_status()))
-                except Exception as e:
-                    print("ERROR: cannot send result: {0}".format(e))
+                if group:
+                    yield self.make_feature(group), group
+                    group = []
+                yield job, [(job_id, job)]
             elif isinstance(job, Scenario):
-                # construct a dummy feature, having only this scenario
-                kwargs = {}
-                for k in (
-                    "filename",
-                    "line",
-                    "keyword",
-                    "name",
-                    "tags",
-                    "description",
-                    "background",
-                    "language",
-                ):
-                    kwargs[k] = getattr(job.feature, k)
-                kwargs["scenarios"] = [job]
-                orig_parser = job.feature.parser
-                feature = Feature(**kwargs)
-                feature.parser = orig_parser
-                yield feature
-                try:
-                    self.resultsq.put((job_id, job.send_status()))
-                except Exception as e:
-                    print("ERROR: cannot send result: {0}".format(e))
+                if group and group[0][1].feature is not job.feature:
+                    yield self.make_feature(group), group
+                    group = []
+                group.append((job_id, job))
             else:
                 raise TypeError("Don't know how to process: %s" % type(job))
-            self.jobsq.task_done()
+        if group:
+            yield self.make_feature(group), group
+
+    def run_hook(self, name, context, *args):
+        if name == "after_scenario":
+            self.stop_timeout()
+        super(MultiProcClientRunner, self).run_hook(name, context, *args)
+        if name == "before_scenario":
+            try:
+                timeout = scenario_timeout(args[0], float(self.config.job_timeout or 0))
+            except ValueError:
+                timeout = None  # -- INVALID TAG: Reported by the master.
+            self.start_timeout(timeout)
+
+    def start_timeout(self, timeout):
+        """Start the timeout of a scenario (in seconds, or None).
+        Its step functions are run with the remaining time (see
+        :meth:`time_limit()`). If the scenario is still running a little
+        after its timeout, its captured output is sent to the master
+        (in case that the watchdog must kill this worker).
+        """
+        self.stop_timeout()
+        if not timeout:
+            return
+        self.scenario_timeout = timeout
+        self.scenario_deadline = time.time() + timeout
+        self.timeout_reporter = threading.Timer(
+            timeout + self.timeout_report_delay, self.report_timeout_output
+        )
+        self.timeout_reporter.daemon = True
+        self.timeout_reporter.start()
+
+    def stop_timeout(self):
+        with self.timeout_lock:
+            self.scenario_deadline = None
+            if self.timeout_reporter is not None:
+                self.timeout_reporter.cancel()
+                self.timeout_reporter = None
+
+    def report_timeout_output(self):
+        """Send the captured output of the hung scenario to the master
+        (called in the thread of the timeout reporter).
+        """
+        with self.timeout_lock:
+            if self.scenario_deadline is None:
+                return  # -- SCENARIO FINISHED: Meanwhile.
+            output = self.capture_controller.captured.make_report()
+            try:
+                self.conn.send(("timeout_output", output))
+            except (EOFError, OSError):
+                pass
+
+    @contextmanager
+    def time_limit(self):
+        """Run a step function with the remaining time of its scenario:
+        A SIGALRM interrupts the blocked step with a JobTimeoutError,
+        so that the step fails with the captured output of the scenario.
+        The alarm is only armed while the step function runs (not in hooks,
+        formatters or while results are sent). The previous SIGALRM handler
+        is restored afterwards.
+
+        Without SIGALRM (worker threads), a step that finishes after the
+        timeout of its scenario fails (soft timeout).
+        """
+        deadline = self.scenario_deadline
+        if deadline is None or self.time_limited:
+            # -- NESTED STEP: Already time-limited (context.execute_steps()).
+            yield
+            return
+
+        def raise_timeout(signum, frame):
+            raise JobTimeoutError(
+                "TIMEOUT: scenario exceeded %ss" % self.scenario_timeout
+            )
+
+        self.time_limited = True
+        old_handler = None
+        try:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                raise_timeout(signal.SIGALRM, None)
+            if self.timeout_signal:
+                old_handler = signal.signal(signal.SIGALRM, raise_timeout)
+                if old_handler is None:
+                    old_handler = signal.SIG_DFL  # -- NOT SET FROM PYTHON.
+                signal.setitimer(signal.ITIMER_REAL, remaining)
+            yield
+        finally:
+            self.time_limited = False
+            if old_handler is not None:
+                try:
+                    signal.setitimer(signal.ITIMER_REAL, 0)
+                finally:
+                    # -- ENSURE: Even if the alarm fires now (pending signal).
+                    signal.signal(signal.SIGALRM, old_handler)
+        if time.time() > deadline:
+            # -- SOFT TIMEOUT: Step has finished too late.
+            raise_timeout(signal.SIGALRM, None)
+
+    def stop_requested(self):
+        """Check (without blocking) if the master has stopped the test run.
+
+        The master sends the sentinel job early to a busy worker,
+        when the test run is stopped (fail-fast: --stop, --max-failures).
+        """
+        if not self.stopped and self.conn.poll():
+            message = self.conn.recv()
+            assert message is None, "UNEXPECTED: %r" % (message,)
+            self.stopped = True
+        return self.stopped
+
+    @staticmethod
+    def make_feature(jobs):
+        """Construct a dummy feature, having only the scenarios of these jobs."""
+        orig_feature = jobs[0][1].feature
+        kwargs = {}
+        for k in (
+            "filename",
+            "line",
+            "keyword",
+            "name",
+            "tags",
+            "description",
+            "background",
+            "language",
+        ):
+            kwargs[k] = getattr(orig_feature, k)
+        kwargs["scenarios"] = [job for _, job in jobs]
+        feature = Feature(**kwargs)
+        feature.parser = orig_feature.parser
+        return feature
 
     def run_with_paths(self):
         self.context = Context(self)
-        self.load_hooks()
-        self.load_step_definitions()
+        if not self.inherited:
+            # -- SPAWNED WORKER: Nothing is inherited from the master.
+            self.config.setup_model()
+        if self.config.parallel_reload_steps or not self.inherited:
+            # -- PER-PROCESS MODULE STATE: Re-import environment and steps.
+            self.hooks = {}
+            the_step_registry.clear()
+            self.load_hooks()
+            self.load_step_definitions()
+        # -- OTHERWISE: Reuse hooks and step definitions of the master
+        #    (inherited by the forked worker process).
         assert not self.aborted
 
-        failed = self.run_model(features=self.iter_queue())
-        if failed:
-            self.resultsq.put((None, "set_fail"))
-        self.resultsq.close()
+        # -- WORKER SCOPE: Around all jobs of this worker (and before_all).
+        # pylint: disable=protected-access
+        context = self.context
+        context._push(layer_name="worker")
+        self.run_hook("before_worker", context, self.num)
+        if self.aborted:
+            # -- HOOK-ERROR in before_worker: Leave all jobs to other workers.
+            failed = True
+        else:
+            context._push(layer_name="testrun")
+            self.step_registry = TimeLimitedStepRegistry(the_step_registry, self)
+            jobs = self.iter_queue()
+            failed = self.run_model(features=jobs)
+            jobs.close()  # -- SEND: Result of last job (if run was stopped early).
+            context._stack.pop(0)  # -- CLEANUPS: Already done by run_model().
+        self.run_hook("after_worker", context, self.num)
+        try:
+            context._pop()  # -- CLEANUPS: Worker fixtures, ...
+        except Exception:  # pylint: disable=broad-except
+            failed = True
+        if failed or self.hook_failures:
+            self.conn.send(("failed",))
+        self.conn.send(("hook_durations", self.hook_durations))
+        self.conn.send(("done",))
+        self.conn.close()
+
+
+class ThreadClientRunner(MultiProcClientRunner):
+    """Client runner of a worker thread (see :class:`WorkerThread`).
+
+    Uses the hooks and step definitions of the master (same process),
+    but parses the features of its jobs by itself (own model elements).
+    """
+
+    def __init__(self, config, num, conn, feature_locations=None, hooks=None):
+        super(ThreadClientRunner, self).__init__(
+            config, num, conn, feature_locations, hooks=hooks
+        )
+        self.inherited = True  # -- NO RELOAD: Hooks, steps, model setup.
+
+    # -- SIGNALS: Are only received by the main thread. A worker thread
+    #    fails a step that finishes after the timeout (soft timeout) and
+    #    relies on the master watchdog for hung steps.
+    timeout_signal = False
 
 
 # eof
@@ -6,11 +6,13 @@ Contains utility functions and classes for Runners.
 from __future__ import absolute_import
 from bisect import bisect
 import glob
+import multiprocessing
 import os.path
 import re
 import sys
 from six import string_types
 from behave import parser
+from behave.feature_cache import NOT_CACHED
 from behave.model_core import FileLocation
 from behave.textutil import ensure_stream_with_encoder
 # LAZY: from behave.step_registry import setup_step_decorators
@@ -298,7 +300,7 @@ class PathManager(object):
 # -----------------------------------------------------------------------------
 # FUNCTIONS:
 # -----------------------------------------------------------------------------
-def parse_features(feature_files, language=None):
+def parse_features(feature_files, language=None, jobs=None, cache=None):
     """
     Parse feature files and return list of Feature model objects.
     Handles:
@@ -308,10 +310,23 @@ def parse_features(feature_files, language=None):
 
     :param feature_files: List of feature file names to parse.
     :param language:      Default language to use.
+    :param jobs:          Number of processes that parse the feature files
+                          (default: parse them in this process).
+    :param cache:         Feature cache to use (as FeatureCache) or None.
     :return: List of feature objects.
     """
     scenario_collector = FeatureScenarioLocationCollector()
     features = []
+    preparsed = {}
+    if cache is not None:
+        for filename in unique_filenames(feature_files):
+            feature = cache.load(filename, language)
+            if feature is not NOT_CACHED:
+                preparsed[filename] = feature
+    cached = set(preparsed)
+    if jobs and jobs > 1:
+        missing = [f for f in unique_filenames(feature_files) if f not in cached]
+        preparsed.update(parse_files_in_pool(missing, language, jobs))
     for location in feature_files:
         if not isinstance(location, FileLocation):
             assert isinstance(location, string_types)
@@ -329,7 +344,13 @@ def parse_features(feature_files, language=None):
         # -- NEW FEATURE:
         assert isinstance(location, FileLocation)
         filename = os.path.abspath(location.filename)
-        feature = parser.parse_file(filename, language=language)
+        # -- PREPARSED: Use each feature once (scenarios may be marked skipped).
+        feature = preparsed.pop(filename, NOT_PARSED)
+        if feature is NOT_PARSED:
+            feature = parser.parse_file(filename, language=language)
+        if cache is not None and filename not in cached:
+            cache.store(filename, feature, language)
+            cached.add(filename)
         if feature:
             # -- VALID FEATURE:
             # SKIP CORNER-CASE: Feature file without any feature(s).
@@ -342,6 +363,63 @@ def parse_features(feature_files, language=None):
     return features
 
 
+NOT_PARSED = object()
+
+
+def unique_filenames(feature_files):
+    """Provides the absolute filenames of feature files or locations
+    (each filename once, in their order).
+    """
+    filenames = []
+    seen = set()
+    for location in feature_files:
+        filename = os.path.abspath(getattr(location, "filename", location))
+        if filename not in seen:
+            seen.add(filename)
+            filenames.append(filename)
+    return filenames
+
+
+def _parse_file_or_fail(filename, language=None):
+    """Parse a feature file in a pool process.
+
+    :return: Tuple (parsed, feature). Parser errors are not sent back
+        (parsed=False), the file is parsed again to raise them.
+    """
+    try:
+        return True, parser.parse_file(filename, language=language)
+    except Exception:  # pylint: disable=broad-except
+        return False, None
+
+
+def parse_files_in_pool(feature_files, language=None, jobs=2):
+    """Parse feature files in a pool of processes.
+
+    The parsed features are sent back (pickled) to this process.
+    Files that could not be parsed are left out (and parsed again later on).
+
+    :param feature_files: List of feature file names or locations.
+    :param jobs:          Number of processes to use.
+    :return: Dictionary with the features by their absolute filename.
+    """
+    filenames = unique_filenames(feature_files)
+    if len(filenames) < 2:
+        return {}
+
+    pool = multiprocessing.Pool(min(jobs, len(filenames)))
+    try:
+        results = pool.starmap(
+            _parse_file_or_fail, [(filename, language) for filename in filenames]
+        )
+    finally:
+        pool.terminate()
+    return dict(
+        (filename, feature)
+        for filename, (parsed, feature) in zip(filenames, results)
+        if parsed
+    )
+
+
 def collect_feature_locations(paths, strict=True):
     """
     Collect feature file names by processing list of paths (from command line).
@@ -6,6 +6,14 @@ step implementations (step definitions). This is necessary to execute steps.
 """
 
 from __future__ import absolute_import
+from collections import OrderedDict
+from contextlib import contextmanager
+import datetime
+import enum
+import heapq
+import numbers
+import threading
+import six
 from behave.matchers import Match, get_matcher
 from behave.textutil import text as _text
 
@@ -30,7 +38,149 @@ class AmbiguousStep(ValueError):
     pass
 
 
+def ascii_head(text):
+    """Provides the leading ASCII part of a text (in lower case) or None.
+    Non-ASCII characters are excluded, because case-insensitive matching
+    of them differs from :meth:`str.lower()`.
+    """
+    if not isinstance(text, six.string_types):
+        return None
+    try:
+        text.encode("ascii")
+    except UnicodeError as e:
+        text = text[: e.start]
+    return text.lower()
+
+
+def index_word(text, complete=False):
+    """Provides the first word of a text for the step index.
+
+    :param text:  Text (as ASCII head).
+    :param complete: If true, the word must be followed by whitespace.
+    :return: Word or None, if the text has no such word.
+    """
+    if not text or text[0].isspace():
+        return None
+    for index, char in enumerate(text):
+        if char.isspace():
+            return text[:index]
+    if complete:
+        return None
+    return text
+
+
+class StepDefinitionIndex(object):
+    """Index of step definitions (matchers) by their literal prefix.
+
+    A step text is only matched against the step definitions whose literal
+    prefix is consistent with the step text (bucketed by the first word)
+    and the step definitions without a (known) literal first word,
+    in the order of their registration.
+
+    The index is built for a list of step definitions and is outdated
+    when the list is replaced or changes its size.
+    """
+
+    def __init__(self, step_definitions):
+        self.step_definitions = step_definitions
+        self.size = 0
+        self.prefixes = []
+        self.indices_by_word = {}
+        self.other_indices = []
+        for step_definition in step_definitions:
+            self._add(step_definition)
+
+    def _add(self, step_definition):
+        index = self.size
+        prefix = ascii_head(getattr(step_definition, "literal_prefix", None))
+        word = index_word(prefix, complete=True)
+        if word is None:
+            self.other_indices.append(index)
+        else:
+            self.indices_by_word.setdefault(word, []).append(index)
+        self.prefixes.append(prefix or None)
+        self.size += 1
+
+    def append(self, step_definition):
+        """Appends a step definition to the list of step definitions
+        and updates the index (instead of rebuilding it).
+        """
+        self.step_definitions.append(step_definition)
+        self._add(step_definition)
+
+    def is_outdated(self, step_definitions):
+        return (
+            step_definitions is not self.step_definitions
+            or len(step_definitions) != self.size
+        )
+
+    def select(self, step_text):
+        """Selects the candidate step definitions for a step text."""
+        head = ascii_head(step_text)
+        if head is None:
+            return self.step_definitions
+        word = index_word(head, complete=len(head) < len(step_text))
+        if word is None:
+            indices = range(self.size)
+        else:
+            indices = self.indices_by_word.get(word)
+            if not indices:
+                indices = self.other_indices
+            elif self.other_indices:
+                indices = heapq.merge(indices, self.other_indices)
+
+        candidates = []
+        for index in indices:
+            prefix = self.prefixes[index]
+            # -- FILTER: Literal prefix and step text must agree (on overlap).
+            if prefix is None or head.startswith(prefix) or prefix.startswith(head):
+                candidates.append(self.step_definitions[index])
+        return candidates
+
+
+IMMUTABLE_VALUE_TYPES = (
+    type(None),
+    numbers.Number,
+    six.text_type,
+    six.binary_type,
+    datetime.date,
+    datetime.time,
+    datetime.timedelta,
+    enum.Enum,
+)
+NOT_CACHED = object()
+
+
+def is_immutable_value(value):
+    if isinstance(value, (tuple, frozenset)):
+        return all(is_immutable_value(item) for item in value)
+    return isinstance(value, IMMUTABLE_VALUE_TYPES)
+
+
+def is_cacheable_match(match):
+    """Checks if a match can be reused for other steps with the same text.
+    Matches with type conversion errors and with mutable argument values
+    (like: lists of cardinality fields) are not cached, because a step
+    function may modify its arguments.
+    """
+    if match is None:
+        return True  # -- UNDEFINED STEP
+    if type(match) is not Match:  # pylint: disable=unidiomatic-typecheck
+        return False
+    return all(is_immutable_value(argument.value) for argument in match.arguments)
+
+
 class StepRegistry(object):
+    """Registry of the step definitions (per step type).
+
+    .. attribute:: match_cache_size
+
+        Number of (step type, step text) pairs whose match is memoized
+        (as least-recently-used cache). Use 0 to disable the match cache.
+    """
+
+    match_cache_size = 10000
+
     def __init__(self):
         self.steps = {
             "given": [],
@@ -38,6 +188,15 @@ class StepRegistry(object):
             "then": [],
             "step": [],
         }
+        self._indexes = {}
+        self._match_cache = OrderedDict()
+        self._match_cache_lock = threading.Lock()
+        self._deferred_validation = False
+
+    def clear(self):
+        """Remove all step definitions (in-place)."""
+        for step_definitions in self.steps.values():
+            del step_definitions[:]
 
     @staticmethod
     def same_step_definition(step, other_pattern, other_location):
@@ -51,12 +210,26 @@ class StepRegistry(object):
         step_location = Match.make_location(func)
         step_type = keyword.lower()
         step_text = _text(step_text)
-        step_definitions = self.steps[step_type]
-        for existing in step_definitions:
-            if self.same_step_definition(existing, step_text, step_location):
+        index = self.get_index(step_type)
+        if not self._deferred_validation:
+            if self.check_step_definition(index, step_type, step_text, step_location):
                 # -- EXACT-STEP: Same step function is already registered.
                 # This may occur when a step module imports another one.
                 return
+        index.append(get_matcher(func, step_text))
+        self.clear_match_cache()
+
+    def check_step_definition(self, index, step_type, step_text, step_location):
+        """Checks a new step definition against the step definitions of
+        a step index. Only the step definitions that may match the new
+        step text (as step) are checked.
+
+        :return: True, if the same step definition is already registered.
+        :raises AmbiguousStep: If an existing step definition matches.
+        """
+        for existing in index.select(step_text):
+            if self.same_step_definition(existing, step_text, step_location):
+                return True
             elif existing.match(step_text):  # -- SIMPLISTIC
                 message = "%s has already been defined in\n  existing step %s"
                 new_step = "@%s('%s')" % (step_type, step_text)
@@ -64,30 +237,121 @@ class StepRegistry(object):
                 existing_step = existing.describe()
                 existing_step += " at %s" % existing.location
                 raise AmbiguousStep(message % (new_step, existing_step))
-        step_definitions.append(get_matcher(func, step_text))
+        return False
+
+    @contextmanager
+    def deferred_validation(self):
+        """Defers the checks for ambiguous step definitions until all
+        step definitions (of a large step library) are registered.
+        The checks are performed by :meth:`validate()` at the end.
+
+        .. code-block:: python
+
+            with registry.deferred_validation():
+                load_step_modules(step_paths)
+        """
+        self._deferred_validation = True
+        try:
+            yield self
+        finally:
+            self._deferred_validation = False
+        self.validate()
+
+    def validate(self):
+        """Checks all step definitions for ambiguous steps (like
+        :meth:`add_step_definition()` in registration order) and removes
+        duplicated registrations of the same step definition.
+
+        :raises AmbiguousStep: If a step definition matches a later one.
+        """
+        for step_type, step_definitions in self.steps.items():
+            index = StepDefinitionIndex([])
+            for step_definition in step_definitions:
+                if not self.check_step_definition(
+                    index, step_type, step_definition.pattern, step_definition.location
+                ):
+                    index.append(step_definition)
+            step_definitions[:] = index.step_definitions
+        self._indexes.clear()
+        self.clear_match_cache()
+
+    def compile_step_definitions(self):
+        """Compiles the patterns of all step definitions
+        (that are compiled on first use otherwise).
+
+        :raises StepDefinitionError: If a pattern is malformed.
+        """
+        for step_type, step_definitions in self.steps.items():
+            for step_definition in step_definitions:
+                if step_definition.step_type is None:
+                    step_definition.step_type = step_type  # -- DESCRIBE: Errors.
+                step_definition.compile()
+
+    def clear_match_cache(self):
+        with self._match_cache_lock:
+            self._match_cache.clear()
+
+    def get_index(self, step_type):
+        """Provides the step index of a step type (rebuilt if outdated).
+        Memoized matches are discarded if any step index is rebuilt.
+        """
+        step_definitions = self.steps[step_type]
+        index = self._indexes.get(step_type)
+        if index is None or index.is_outdated(step_definitions):
+            index = StepDefinitionIndex(step_definitions)
+            self._indexes[step_type] = index
+            self.clear_match_cache()
+        return index
+
+    def select_step_definitions(self, step_type, step_text):
+        """Selects the step definitions of a step type that may match
+        a step text (by using the step index), in registration order.
+        """
+        return self.get_index(step_type).select(step_text)
+
+    def iter_candidates(self, step):
+        for step_definition in self.select_step_definitions(step.step_type, step.name):
+            yield step_definition
+        if step.step_type != "step":
+            for step_definition in self.select_step_definitions("step", step.name):
+                yield step_definition
 
     def find_step_definition(self, step):
-        candidates = self.steps[step.step_type]
-        more_steps = self.steps["step"]
-        if step.step_type != "step" and more_steps:
-            # -- ENSURE: self.step_type lists are not modified/extended.
-            candidates = list(candidates)
-            candidates += more_steps
-
-        for step_definition in candidates:
+        for step_definition in self.iter_candidates(step):
             if step_definition.match(step.name):
                 return step_definition
         return None
 
     def find_match(self, step):
-        candidates = self.steps[step.step_type]
-        more_steps = self.steps["step"]
-        if step.step_type != "step" and more_steps:
-            # -- ENSURE: self.step_type lists are not modified/extended.
-            candidates = list(candidates)
-            candidates += more_steps
-
-        for step_definition in candidates:
+        """Finds the match of a step (memoized by step type and step text).
+        A step text is matched only once, even if it is used by many
+        scenario outline rows, backgrounds or formatters.
+
+        :return: Match object or None (for an undefined step).
+        """
+        if not self.match_cache_size:
+            return self.find_new_match(step)
+
+        # -- ENSURE: Matches are discarded if step definitions have changed.
+        self.get_index(step.step_type)
+        self.get_index("step")
+        key = (step.step_type, step.name)
+        with self._match_cache_lock:
+            match = self._match_cache.get(key, NOT_CACHED)
+            if match is not NOT_CACHED:
+                self._match_cache.move_to_end(key)
+                return match
+
+        match = self.find_new_match(step)
+        if is_cacheable_match(match):
+            with self._match_cache_lock:
+                self._match_cache[key] = match
+                while len(self._match_cache) > self.match_cache_size:
+                    self._match_cache.popitem(last=False)
+        return match
+
+    def find_new_match(self, step):
+        for step_definition in self.iter_candidates(step):
             result = step_definition.match(step.name)
             if result:
                 return result
@@ -0,0 +1,234 @@
+# -*- coding: UTF-8 -*-
+"""
+Provides a persistent store for the durations of earlier test runs.
+
+The timing store keeps rolling statistics (mean, p95, last N samples) for:
+
+* features (key: "{filename}")
+* scenarios (key: "{filename}:{line}")
+* steps (key: location of the step definition, ala "steps/foo.py:12")
+* hooks (key: hook name, ala "before_scenario")
+
+The data is stored in an append-only file with one JSON record per line::
+
+    {"kind": "scenario", "key": "features/alice.feature:10", "duration": 1.23}
+
+New samples are appended at the end of a run. The file is compacted
+(rewritten with the last N samples per key) when it grows too large.
+Broken lines (caused by an aborted write, for example) are ignored.
+
+EXAMPLE:
+
+.. code-block:: python
+
+    store = TimingStore(".behave_timings.jsonl").load()
+    stats = store.get("scenario", "features/alice.feature:10")
+    if stats:
+        print("mean=%.3fs p95=%.3fs" % (stats.mean, stats.p95))
+"""
+
+from __future__ import absolute_import, division
+import io
+import math
+import os
+import six
+from behave.model_core import Status
+
+try:
+    import json
+except ImportError:
+    import simplejson as json
+
+
+DEFAULT_TIMINGS_FILE = ".behave_timings.jsonl"
+
+
+class TimingStats(object):
+    """Rolling statistics over the last N duration samples of one key."""
+
+    def __init__(self, samples=None, max_samples=20):
+        self.max_samples = max_samples
+        self.samples = []
+        for duration in samples or []:
+            self.add(duration)
+
+    def add(self, duration):
+        self.samples.append(float(duration))
+        if len(self.samples) > self.max_samples:
+            del self.samples[: -self.max_samples]
+
+    @property
+    def count(self):
+        return len(self.samples)
+
+    @property
+    def last(self):
+        return self.samples[-1]
+
+    @property
+    def mean(self):
+        return sum(self.samples) / len(self.samples)
+
+    @property
+    def p95(self):
+        """95th percentile of the samples (nearest-rank method)."""
+        ordered = sorted(self.samples)
+        rank = int(math.ceil(0.95 * len(ordered)))
+        return ordered[max(rank, 1) - 1]
+
+    def __repr__(self):
+        return "<TimingStats: count=%d, mean=%.3f, p95=%.3f>" % (
+            self.count,
+            self.mean,
+            self.p95,
+        )
+
+
+class TimingStore(object):
+    """Persistent store with duration statistics of earlier test runs.
+
+    .. attribute:: max_samples
+
+        Number of samples that are kept for each key.
+
+    .. attribute:: compact_factor
+
+        The file is compacted when it contains more than
+        ``compact_factor * retained_samples`` records.
+    """
+
+    kinds = ("feature", "scenario", "step", "hook")
+    max_samples = 20
+    compact_factor = 2
+
+    def __init__(self, filename, max_samples=None):
+        self.filename = filename
+        if max_samples is not None:
+            self.max_samples = max_samples
+        self.stats = {}
+        self.pending = []
+        self.stored_records = 0
+
+    def load(self):
+        """Load the samples from the timings file (if it exists).
+
+        :return: Self (for chaining calls).
+        """
+        self.stats = {}
+        self.stored_records = 0
+        if not self.filename or not os.path.exists(self.filename):
+            return self
+
+        with io.open(self.filename, "r", encoding="UTF-8") as f:
+            for line in f:
+                try:
+                    data = json.loads(line)
+                    kind = data["kind"]
+                    key = data["key"]
+                    duration = float(data["duration"])
+                except (ValueError, KeyError, TypeError):
+                    continue  # -- SKIP: Broken or truncated line.
+                self._add_sample(kind, key, duration)
+                self.stored_records += 1
+        return self
+
+    def _add_sample(self, kind, key, duration):
+        stats = self.stats.get((kind, key))
+        if stats is None:
+            stats = TimingStats(max_samples=self.max_samples)
+            self.stats[(kind, key)] = stats
+        stats.add(duration)
+
+    def add(self, kind, key, duration):
+        """Add a new duration sample (stored with the next :meth:`save()`)."""
+        assert kind in self.kinds, "UNKNOWN kind=%s" % kind
+        key = six.text_type(key)
+        self._add_sample(kind, key, duration)
+        self.pending.append((kind, key, duration))
+
+    def get(self, kind, key):
+        """Provide the statistics for a key.
+
+        :return: TimingStats object or None, if no samples are known.
+        """
+        return self.stats.get((kind, six.text_type(key)))
+
+    def mean(self, kind, key, default=None):
+        stats = self.get(kind, key)
+        if stats is None:
+            return default
+        return stats.mean
+
+    def items(self, kind=None):
+        """Iterate over ``(kind, key, stats)`` tuples (sorted by key)."""
+        for (kind2, key), stats in sorted(self.stats.items()):
+            if kind is None or kind == kind2:
+                yield kind2, key, stats
+
+    # -- RECORD MODEL ELEMENTS:
+    def add_step(self, step, step_registry):
+        if step.status not in (Status.passed, Status.failed):
+            return
+        match = step_registry.find_match(step)
+        if match and match.location:
+            self.add("step", match.location, step.duration)
+
+    def add_scenario(self, scenario, step_registry=None):
+        """Record the durations of an executed scenario (and its steps)."""
+        if scenario.status not in (Status.passed, Status.failed):
+            return
+        self.add("scenario", scenario.location, scenario.duration)
+        if step_registry is not None:
+            for step in scenario.all_steps:
+                self.add_step(step, step_registry)
+
+    def add_feature(self, feature, step_registry=None):
+        """Record the durations of an executed feature and its scenarios."""
+        for scenario in feature.walk_scenarios():
+            self.add_scenario(scenario, step_registry)
+        if feature.status in (Status.passed, Status.failed):
+            self.add("feature", feature.filename, feature.duration)
+
+    def add_hook_durations(self, hook_durations):
+        """Record the hook durations of a runner.
+
+        :param hook_durations: Dict with ``{name: (count, total_duration)}``.
+        """
+        for name, (count, total_duration) in hook_durations.items():
+            if count:
+                self.add("hook", name, total_duration / count)
+
+    # -- PERSISTENCE:
+    def save(self):
+        """Store the pending samples in the timings file.
+        Compacts the file if it contains too many outdated records.
+        """
+        retained = sum(stats.count for stats in self.stats.values())
+        records = self.stored_records + len(self.pending)
+        if records > self.compact_factor * retained:
+            self.compact()
+        elif self.pending:
+            with io.open(self.filename, "a", encoding="UTF-8") as f:
+                for kind, key, duration in self.pending:
+                    f.write(self._make_line(kind, key, duration))
+            self.stored_records += len(self.pending)
+        self.pending = []
+
+    def compact(self):
+        """Rewrite the timings file with the retained samples only."""
+        temp_filename = self.filename + ".tmp"
+        records = 0
+        with io.open(temp_filename, "w", encoding="UTF-8") as f:
+            for kind, key, stats in self.items():
+                for duration in stats.samples:
+                    f.write(self._make_line(kind, key, duration))
+                    records += 1
+        # -- ATOMIC: Readers see the old or the new timings file (never none).
+        os.replace(temp_filename, self.filename)
+        self.stored_records = records
+        self.pending = []
+
+    @staticmethod
+    def _make_line(kind, key, duration):
+        data = dict(kind=kind, key=key, duration=duration)
+        return six.text_type(json.dumps(data, sort_keys=True)) + u"\n"
@@ -154,3 +154,458 @@ Feature: Parallel options
           53 steps passed, 1 failed, 1 skipped, 0 undefined
           """
 
+
+    Scenario: Test parallel correctness with longest-first schedule
+        When I run "behave --processes 4 --parallel-element scenario --parallel-schedule longest-first"
+        Then it should fail
+        And the command output should contain:
+          """
+          1 feature passed, 1 failed, 0 skipped
+          17 scenarios passed, 1 failed, 0 skipped
+          53 steps passed, 1 failed, 1 skipped, 0 undefined
+          """
+        And a file named ".behave_timings.jsonl" should exist
+        And the file ".behave_timings.jsonl" should contain "features/parallel_running_scenarios.feature:5"
+
+    Scenario: Test parallel correctness with step modules reloaded by workers
+        When I run "behave --processes 4 --parallel-element scenario --parallel-reload-steps"
+        Then it should fail
+        And the command output should contain:
+          """
+          1 feature passed, 1 failed, 0 skipped
+          17 scenarios passed, 1 failed, 0 skipped
+          53 steps passed, 1 failed, 1 skipped, 0 undefined
+          """
+
+    Scenario: Test parallel correctness with spawned workers
+        When I run "behave --processes 4 --parallel-element scenario --parallel-start-method spawn"
+        Then it should fail
+        And the command output should contain:
+          """
+          1 feature passed, 1 failed, 0 skipped
+          17 scenarios passed, 1 failed, 0 skipped
+          53 steps passed, 1 failed, 1 skipped, 0 undefined
+          """
+
+    Scenario: Test parallel correctness with worker threads
+        When I run "behave --processes 4 --parallel-element scenario --parallel-backend threads"
+        Then it should fail
+        And the command output should contain:
+          """
+          1 feature passed, 1 failed, 0 skipped
+          17 scenarios passed, 1 failed, 0 skipped
+          53 steps passed, 1 failed, 1 skipped, 0 undefined
+          """
+        And the command output should contain:
+          """
+          Captured stdout:
+                And I say, bgstep1
+                I say bgstep2
+                And I yell 0
+                About to devide by 0
+
+                Captured stderr:
+                I_wrote_this_to_stderr_0
+          """
+
+    Scenario: Test parallel correctness split at features with forkserver workers
+        When I run "behave --processes 2 --parallel-element feature --parallel-start-method forkserver"
+        Then it should fail
+        And the command output should contain:
+          """
+          1 feature passed, 1 failed, 0 skipped
+          17 scenarios passed, 1 failed, 0 skipped
+          53 steps passed, 1 failed, 1 skipped, 0 undefined
+          """
+
+    Scenario: Test parallel correctness with compressed and truncated results
+        When I run "behave --processes 4 --parallel-element scenario --parallel-compress-results --parallel-max-output 20"
+        Then it should fail
+        And the command output should contain:
+          """
+          1 feature passed, 1 failed, 0 skipped
+          17 scenarios passed, 1 failed, 0 skipped
+          53 steps passed, 1 failed, 1 skipped, 0 undefined
+          """
+
+    Scenario: Test parallel correctness with scenarios reported as they finish
+        When I run "behave --processes 4 --parallel-element scenario --parallel-report scenario -f plain"
+        Then it should fail
+        And the command output should contain:
+          """
+          Scenario Outline: Devide by VALUE outline -- @1.4 VTABLE
+          """
+        And the command output should contain:
+          """
+          1 feature passed, 1 failed, 0 skipped
+          17 scenarios passed, 1 failed, 0 skipped
+          53 steps passed, 1 failed, 1 skipped, 0 undefined
+          """
+
+    Scenario: Test parallel correctness with batches of jobs
+        When I run "behave --processes 2 --parallel-element scenario --parallel-batch-duration 1"
+        Then it should fail
+        And the command output should contain:
+          """
+          1 feature passed, 1 failed, 0 skipped
+          17 scenarios passed, 1 failed, 0 skipped
+          53 steps passed, 1 failed, 1 skipped, 0 undefined
+          """
+
+    Scenario: Test parallel workers with worker hooks and worker fixtures
+        Given a file named "worker_features/worker_scope.feature" with:
+          """
+          Feature: worker scope
+              Scenario: S1
+                  Then the worker resource was set up once
+              Scenario: S2
+                  Then the worker resource was set up once
+              Scenario: S3
+                  Then the worker resource was set up once
+              Scenario: S4
+                  Then the worker resource was set up once
+          """
+        And a file named "worker_features/steps/worker_steps.py" with:
+          """
+          from behave import then
+
+          @then('the worker resource was set up once')
+          def step_check_resource(context):
+              assert context.resource == "resource_1", context.resource
+          """
+        And a file named "worker_features/environment.py" with:
+          """
+          from __future__ import print_function
+          from behave import fixture, use_worker_fixture
+
+          SETUPS = []
+
+          @fixture
+          def worker_resource(context):
+              SETUPS.append(1)
+              yield "resource_%d" % len(SETUPS)
+              print("CLEANUP: worker_resource")
+
+          def before_worker(context, worker_id):
+              print("BEFORE_WORKER: %d" % worker_id)
+
+          def after_worker(context, worker_id):
+              print("AFTER_WORKER: %d" % worker_id)
+
+          def before_scenario(context, scenario):
+              context.resource = use_worker_fixture(worker_resource, context)
+          """
+        When I run "behave --processes 2 --parallel-element scenario -f plain worker_features"
+        Then it should pass with:
+          """
+          4 scenarios passed, 0 failed, 0 skipped
+          """
+        And the command output should contain "BEFORE_WORKER: 0"
+        And the command output should contain "BEFORE_WORKER: 1"
+        And the command output should contain "AFTER_WORKER: 0"
+        And the command output should contain "AFTER_WORKER: 1"
+        And the command output should contain "CLEANUP: worker_resource"
+        When I run "behave -f plain worker_features"
+        Then it should pass with:
+          """
+          4 scenarios passed, 0 failed, 0 skipped
+          """
+        And the command output should not contain "BEFORE_WORKER"
+
+    Scenario: Test parallel workers with exclusive resources
+        Given a file named "exclusive_features/exclusive.feature" with:
+          """
+          Feature: exclusive resources
+              @exclusive:db
+              Scenario: S1
+                  Then I use the database alone
+              @exclusive:db
+              Scenario: S2
+                  Then I use the database alone
+              @exclusive:db
+              Scenario: S3
+                  Then I use the database alone
+              Scenario: S4
+                  Then I use the database alone
+          """
+        And a file named "exclusive_features/steps/exclusive_steps.py" with:
+          """
+          import os
+          import time
+          from behave import then
+
+          @then('I use the database alone')
+          def step_use_database(context):
+              if "exclusive:db" not in context.scenario.effective_tags:
+                  return
+              fd = os.open("db.lock", os.O_CREAT | os.O_EXCL)
+              time.sleep(0.2)
+              os.close(fd)
+              os.remove("db.lock")
+          """
+        When I run "behave --processes 3 --parallel-element scenario -f plain exclusive_features"
+        Then it should pass with:
+          """
+          4 scenarios passed, 0 failed, 0 skipped
+          """
+
+    Scenario: Test parallel async steps overlapped in one event loop
+        Given a file named "async_features/meeting.feature" with:
+          """
+          Feature: async steps
+              Scenario Outline: Meeting <name>
+                  Given I print "<name>"
+                  Then all 4 scenarios meet in the event loop
+
+                  Examples:
+                  | name  |
+                  | Alice |
+                  | Bob   |
+                  | Carol |
+                  | Dave  |
+          """
+        And a file named "async_features/steps/async_steps.py" with:
+          """
+          from __future__ import print_function
+          import asyncio
+          from behave import given, then
+
+          arrived = []
+
+          @given('I print "{name}"')
+          def step_print(context, name):
+              print(name)
+
+          @then('all {count:d} scenarios meet in the event loop')
+          async def step_meet(context, count):
+              arrived.append(context.scenario.name)
+              for _ in range(100):
+                  if len(arrived) >= count:
+                      return
+                  await asyncio.sleep(0.05)
+              assert False, "only %d scenarios arrived" % len(arrived)
+          """
+        When I run "behave --processes 4 --parallel-element scenario --parallel-backend asyncio -f plain async_features"
+        Then it should pass with:
+          """
+          4 scenarios passed, 0 failed, 0 skipped
+          """
+
+    Scenario: Test parallel correctness with remote workers
+        Given a file named "run_distributed.py" with:
+          """
+          import subprocess
+          import sys
+
+          BEHAVE = [sys.executable, "../bin/behave", "--parallel-authkey", "secret"]
+          master = subprocess.Popen(
+              BEHAVE + ["--processes", "0", "--parallel-element", "scenario",
+                        "--parallel-listen", "localhost:0"] + sys.argv[1:],
+              stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+              universal_newlines=True)
+          output = []
+          for line in iter(master.stdout.readline, ""):
+              output.append(line)
+              if line.startswith("INFO: listening for remote workers at "):
+                  address = line.split()[-1]
+                  break
+          workers = [
+              subprocess.Popen(BEHAVE + ["--worker", address],
+                               stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+              for _ in range(2)
+          ]
+          output.append(master.communicate()[0])
+          for worker in workers:
+              try:
+                  worker.communicate(timeout=10)
+              except subprocess.TimeoutExpired:
+                  worker.kill()  # -- CONNECTED TOO LATE: Master has finished.
+          sys.stdout.write("".join(output))
+          sys.exit(master.returncode)
+          """
+        When I run "python run_distributed.py -f progress features"
+        Then it should fail
+        And the command output should contain "INFO: remote worker 0 connected"
+        And the command output should contain:
+          """
+          1 feature passed, 1 failed, 0 skipped
+          17 scenarios passed, 1 failed, 0 skipped
+          53 steps passed, 1 failed, 1 skipped, 0 undefined
+          """
+
+    Scenario: Test parallel fail-fast stops all workers
+        Given a file named "stop_features/stop.feature" with:
+          """
+          Feature: fail fast
+              Scenario: F1
+                  Then it fails
+              Scenario: S1
+                  Then it takes a while
+              Scenario: S2
+                  Then it takes a while
+              Scenario: S3
+                  Then it takes a while
+              Scenario: S4
+                  Then it takes a while
+          """
+        And a file named "stop_features/steps/stop_steps.py" with:
+          """
+          import time
+          from behave import then
+
+          @then('it fails')
+          def step_fails(context):
+              assert False, "FAILED"
+
+          @then('it takes a while')
+          def step_takes_a_while(context):
+              time.sleep(0.2)
+          """
+        When I run "behave --processes 2 --parallel-element scenario --stop -f plain stop_features"
+        Then it should fail
+        And the command output should contain "INFO: stopping after 1 failure(s)"
+        And the command output should contain "untested"
+        And the command output should not contain "4 scenarios passed"
+        When I run "behave --processes 2 --parallel-element scenario --max-failures 2 -f plain stop_features"
+        Then it should fail with:
+          """
+          4 scenarios passed, 1 failed, 0 skipped
+          """
+        And the command output should not contain "INFO: stopping"
+
+    Scenario: Test parallel workers that crash are replaced
+        Given a file named "crash_features/crash.feature" with:
+          """
+          Feature: crashing workers
+              Scenario: C1
+                  Then the worker crashes once
+              Scenario: C2
+                  Then the worker always crashes
+              Scenario: S1
+                  Then it passes
+              Scenario: S2
+                  Then it passes
+          """
+        And a file named "crash_features/steps/crash_steps.py" with:
+          """
+          import os
+          from behave import then
+
+          @then('the worker crashes once')
+          def step_crashes_once(context):
+              if not os.path.isdir("crashed_once.marker"):
+                  os.mkdir("crashed_once.marker")
+                  os._exit(3)
+
+          @then('the worker always crashes')
+          def step_always_crashes(context):
+              os._exit(4)
+
+          @then('it passes')
+          def step_passes(context):
+              pass
+          """
+        And I ensure that the directory "crashed_once.marker" does not exist
+        When I run "behave --processes 2 --parallel-element scenario -f plain crash_features"
+        Then it should fail with:
+          """
+          3 scenarios passed, 1 failed, 0 skipped
+          """
+        And the command output should contain "INFO: retrying job(s): crash_features/crash.feature:2"
+        And the command output should contain "INFO: retrying job(s): crash_features/crash.feature:4"
+        And the command output should contain:
+          """
+              Then the worker always crashes ... failed
+          CRASHED: worker
+          """
+
+    Scenario: Test parallel scenarios that exceed their timeout fail
+        Given a file named "timeout_features/timeout.feature" with:
+          """
+          Feature: timeouts
+              @timeout:0.5
+              Scenario: T1
+                  Given I print "before blocking"
+                  Then it blocks
+              Scenario: S1
+                  Then it blocks for 0.1 seconds
+          """
+        And a file named "timeout_features/steps/timeout_steps.py" with:
+          """
+          from __future__ import print_function
+          import socket
+          import time
+          from behave import given, then
+
+          @given('I print "{text}"')
+          def step_print(context, text):
+              print(text)
+
+          @then('it blocks')
+          def step_blocks(context):
+              a, b = socket.socketpair()
+              a.recv(1)
+
+          @then('it blocks for {duration:f} seconds')
+          def step_blocks_for(context, duration):
+              time.sleep(duration)
+          """
+        When I run "behave --processes 2 --parallel-element scenario --job-timeout 60 -f plain timeout_features"
+        Then it should fail with:
+          """
+          1 scenario passed, 1 failed, 0 skipped
+          """
+        And the command output should contain "JobTimeoutError: TIMEOUT: scenario exceeded 0.5s"
+        And the command output should contain:
+          """
+          Captured stdout:
+          before blocking
+          """
+
+    Scenario: Test parallel scenarios that ignore their timeout are killed with their output
+        Given a file named "hung_features/hung.feature" with:
+          """
+          Feature: hung
+              @timeout:0.5
+              Scenario: H1
+                  Given I print "before hanging"
+                  Then it hangs with blocked signals
+          """
+        And a file named "hung_features/steps/hung_steps.py" with:
+          """
+          from __future__ import print_function
+          import signal
+          import time
+          from behave import given, then
+
+          @given('I print "{text}"')
+          def step_print(context, text):
+              print(text)
+
+          @then('it hangs with blocked signals')
+          def step_hangs(context):
+              signal.pthread_sigmask(signal.SIG_BLOCK, [signal.SIGALRM])
+              time.sleep(30)
+          """
+        When I run "behave --processes 1 --parallel-element scenario -f plain hung_features"
+        Then it should fail with:
+          """
+          0 scenarios passed, 1 failed, 0 skipped
+          """
+        And the command output should contain "TIMEOUT: worker 0 was killed after its jobs exceeded their timeout"
+        And the command output should contain:
+          """
+          Captured stdout:
+          before hanging
+          """
+
+    Scenario: Test parallel correctness with recycled workers
+        When I run "behave --processes 2 --parallel-element scenario --max-jobs-per-worker 2 -f progress features"
+        Then it should fail
+        And the command output should contain "INFO: worker 0 retires (after 2 jobs)"
+        And the command output should contain:
+          """
+          1 feature passed, 1 failed, 0 skipped
+          17 scenarios passed, 1 failed, 0 skipped
+          53 steps passed, 1 failed, 1 skipped, 0 undefined
+          """
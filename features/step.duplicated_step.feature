@@ -76,6 +76,38 @@ Feature: Duplicated Step Definitions
         @given('I call Bob')
         """
 
+  Scenario: Duplicated Step Definition in another File with deferred validation
+    Given a new working directory
+    And a file named "features/steps/bob1_steps.py" with:
+      """
+      from behave import given
+
+      @given('I call Bob')
+      def step_call_bob1(context):
+          pass
+      """
+    And   a file named "features/steps/bob2_steps.py" with:
+      """
+      from behave import given
+
+      @given('I call Bob')
+      def step_call_bob2(context):
+          pass
+      """
+    And a file named "features/duplicated_step_bob.feature" with:
+      """
+      Feature:
+        Scenario: Duplicated Step
+          Given I call Bob
+      """
+    When I run "behave -f plain --defer-step-validation features/duplicated_step_bob.feature"
+    Then it should fail
+    And the command output should contain:
+        """
+        AmbiguousStep: @given('I call Bob') has already been defined in
+        existing step @given('I call Bob') at features/steps/bob1_steps.py:3
+        """
+
   @xfail
   Scenario: Duplicated Same Step Definition via import from another File
     Given a new working directory
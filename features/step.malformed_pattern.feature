@@ -0,0 +1,52 @@
+Feature: Malformed Step Pattern
+
+  As a test writer
+  I want to know which step definition has a malformed pattern
+  So that I can fix it before the test run starts.
+
+  Background:
+    Given a new working directory
+    And a file named "features/steps/alice_steps.py" with:
+      """
+      from behave import given, use_step_matcher
+
+      @given(u'I call Alice')
+      def step_call_alice(context):
+          pass
+
+      use_step_matcher("re")
+
+      @given(u'I call (?P<name>Bob')
+      def step_call_bob(context, name):
+          pass
+      """
+    And a file named "features/alice.feature" with:
+      """
+      Feature:
+        Scenario: Alice
+          Given I call Alice
+      """
+
+  Scenario: Malformed step pattern fails before the test run
+    When I run "behave -f plain features/alice.feature"
+    Then it should fail
+    And the command output should contain:
+        """
+        StepDefinitionError: @given('I call (?P<name>Bob') at features/steps/alice_steps.py:9: error: missing ), unterminated subpattern
+        """
+    And the command output should not contain "Scenario: Alice"
+
+  Scenario: Malformed step pattern fails in dry-run with deferred validation
+    When I run "behave -f plain --dry-run --defer-step-validation features/alice.feature"
+    Then it should fail
+    And the command output should contain:
+        """
+        StepDefinitionError: @given('I call (?P<name>Bob') at features/steps/alice_steps.py:9
+        """
+
+  Scenario: Unused malformed step pattern is ignored with deferred validation
+    When I run "behave -f plain --defer-step-validation features/alice.feature"
+    Then it should pass with:
+        """
+        1 scenario passed, 0 failed, 0 skipped
+        """
@@ -97,6 +97,26 @@ class TestConfiguration(object):
         eq_("STAGE2_environment.py", config.environment_file)
         del os.environ["BEHAVE_STAGE"]
 
+    def test_parallel_options_are_converted(self):
+        config = Configuration(
+            [
+                "--parallel-parse=4",
+                "--parallel-batch-duration=2.5",
+                "--parallel-max-output=1000",
+                "--max-jobs-per-worker=10",
+            ],
+            load_config=False,
+        )
+        eq_(config.parallel_parse, 4)
+        eq_(config.parallel_batch_duration, 2.5)
+        eq_(config.parallel_max_output, 1000)
+        eq_(config.max_jobs_per_worker, 10)
+
+    def test_parallel_options_with_bad_value_fail_early(self):
+        for option in ("--parallel-parse=many", "--parallel-batch-duration=long"):
+            with assert_raises(SystemExit):
+                Configuration([option], load_config=False)
+
 
 class TestConfigurationUserData(TestCase):
     """Test userdata aspects in behave.configuration.Configuration class."""
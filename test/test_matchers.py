@@ -2,6 +2,7 @@
 from __future__ import absolute_import, with_statement
 from mock import Mock, patch
 from nose.tools import *  # pylint: disable=wildcard-import, unused-wildcard-import
+import re
 import parse
 from behave.matchers import (
     Match,
@@ -9,6 +10,7 @@ from behave.matchers import (
     ParseMatcher,
     RegexMatcher,
     SimplifiedRegexMatcher,
+    StepDefinitionError,
     CucumberRegexMatcher,
 )
 from behave import matchers, runner
@@ -105,6 +107,24 @@ class TestParseMatcher(object):
             ((context,), {"string": "foo", "integer": 11, "decimal": 3.14159}),
         )
 
+    def test_parser_is_created_on_first_use(self):
+        with patch.object(ParseMatcher, "parser_class") as parser_class:
+            matcher = ParseMatcher(None, u"I buy {amount:d} apples")
+            eq_(matcher.describe(), u"@step('I buy {amount:d} apples')")
+            eq_(matcher.literal_prefix, u"I buy ")
+            eq_(parser_class.call_count, 0)
+
+            matcher.match(u"I buy 3 apples")
+            matcher.match(u"I buy 4 apples")
+            parser_class.assert_called_once_with(
+                u"I buy {amount:d} apples", ParseMatcher.custom_types
+            )
+
+    def test_literal_prefix(self):
+        matcher = ParseMatcher(None, u"I buy {amount:d} apples")
+        eq_(matcher.literal_prefix, u"I buy ")
+        eq_(ParseMatcher(None, u"{who} buys apples").literal_prefix, u"")
+
     def test_positional_arguments(self):
         text = "has a {}, an {:d} and a {:f}"
         matcher = ParseMatcher(self.record_args, text)
@@ -164,6 +184,30 @@ class TestRegexMatcher(object):
         have = [(a.start, a.end, a.original, a.value, a.name) for a in args]
         eq_(have, expected)
 
+    def test_malformed_pattern_is_raised_instead_of_match(self):
+        matcher = RegexMatcher(None, u"(?P<x>oops")
+        with assert_raises(StepDefinitionError) as e:
+            matcher.match(u"something else")
+        assert isinstance(e.exception.__cause__, re.error)
+
+    def test_regex_is_compiled_on_first_use(self):
+        matcher = SimplifiedRegexMatcher(None, u"I buy (?P<amount>\\d+) apples")
+        assert matcher._regex is None  # pylint: disable=protected-access
+        assert matcher.match(u"I buy 3 apples")
+        assert not matcher.match(u"I buy 3 apples and pears")
+        eq_(matcher.regex.pattern, u"^I buy (?P<amount>\\d+) apples$")
+
+    def test_literal_prefix(self):
+        for pattern, expected in [
+            (u"I buy (?P<amount>\\d+) apples", u"I buy "),
+            (u"I buy an? apple", u"I buy a"),
+            (u"I (?:buy|sell) apples", u"I "),
+            (u"I buy|I sell", None),
+            (u"I buy [|] apples", u"I buy "),
+        ]:
+            matcher = RegexMatcher(None, pattern)
+            eq_(matcher.literal_prefix, expected)
+
 
 class TestSimplifiedRegexMatcher(TestRegexMatcher):
     MATCHER_CLASS = SimplifiedRegexMatcher
@@ -2,6 +2,7 @@
 
 from __future__ import absolute_import
 from nose.tools import *
+from mock import patch
 
 from behave import i18n, model, parser
 
@@ -1798,3 +1799,152 @@ Given a step with a malformed table:
     | Bred   | London    | 2010 |
 """.lstrip()
         steps = parser.parse_steps(doc)
+
+
+class TestKeywordMatcher(object):
+    def test_match_statement_uses_first_matching_alias(self):
+        keyword_matcher = parser.KeywordMatcher(i18n.languages["en"])
+        eq_(
+            keyword_matcher.match_statement("scenario_outline", "Scenario Template: x"),
+            "Scenario Template",
+        )
+        eq_(keyword_matcher.match_statement("scenario", "Scenario Outline: x"), False)
+        eq_(keyword_matcher.match_statement("examples", "Scenarios: x"), "Scenarios")
+
+    def test_match_step_like_trying_each_keyword(self):
+        keyword_matcher = parser.KeywordMatcher(i18n.languages["en"])
+        eq_(keyword_matcher.match_step("Given a step"), ("given", "Given"))
+        eq_(keyword_matcher.match_step("* a step"), ("given", "*"))
+        eq_(keyword_matcher.match_step("BUT a step"), ("but", "But"))
+        eq_(keyword_matcher.match_step("Givena step"), None)
+
+    def test_match_step_without_whitespace_after_keyword(self):
+        keyword_matcher = parser.KeywordMatcher(i18n.languages["ja"])
+        keyword = i18n.languages["ja"]["when"][1][:-1]
+        eq_(keyword_matcher.match_step(keyword + "a step"), ("when", keyword))
+
+    def test_for_language_provides_cached_keyword_matcher(self):
+        keywords = i18n.languages["de"]
+        keyword_matcher = parser.KeywordMatcher.for_language("de", keywords)
+        assert parser.KeywordMatcher.for_language("de", keywords) is keyword_matcher
+        assert parser.KeywordMatcher.for_language("de", dict(keywords)) is not (
+            keyword_matcher
+        )
+
+
+class TestParserDispatch(object):
+    FEATURE_TEXT = u"""
+Feature: Dispatch
+  Scenario: S1
+    Given a step
+""".lstrip()
+
+    def test_subclass_action_override_is_used(self):
+        class TracingParser(parser.Parser):
+            def action_scenario(self, line):
+                self.traced_lines.append(line.strip())
+                return parser.Parser.action_scenario(self, line)
+
+        # -- CACHED: Dispatch table of the base class.
+        parser.Parser().parse(self.FEATURE_TEXT)
+        tracing_parser = TracingParser()
+        tracing_parser.traced_lines = []
+        feature = tracing_parser.parse(self.FEATURE_TEXT)
+        eq_(feature.scenarios[0].steps[0].name, u"a step")
+        eq_(tracing_parser.traced_lines, [u"Given a step"])
+
+    def test_action_patched_after_first_use_is_used(self):
+        parser.Parser().parse(self.FEATURE_TEXT)
+        traced_lines = []
+        original_action = parser.Parser.action_scenario
+
+        def action_scenario(self, line):
+            traced_lines.append(line.strip())
+            return original_action(self, line)
+
+        with patch.object(parser.Parser, "action_scenario", action_scenario):
+            parser.Parser().parse(self.FEATURE_TEXT)
+        eq_(traced_lines, [u"Given a step"])
+
+    def test_subclass_with_more_states_is_dispatched(self):
+        class SkippingParser(parser.Parser):
+            states = parser.Parser.states + ("skipped",)
+
+            def action_init(self, line):
+                if line.strip() == u"SKIP:":
+                    self.state = "skipped"
+                    return True
+                return parser.Parser.action_init(self, line)
+
+            def action_skipped(self, line):
+                self.state = "init"
+                return True
+
+        feature = SkippingParser().parse(u"SKIP:\nIgnored\n" + self.FEATURE_TEXT)
+        eq_(feature.name, u"Dispatch")
+
+
+class TestIterParse(object):
+    FEATURE_TEXT = u"""
+@wip
+Feature: Stream
+  Description
+
+  Background:
+    Given a background step
+
+  Scenario: S1
+    Given a step with a table:
+      | name |
+      | Alice |
+
+  Scenario Outline: S2
+    Given a step with <name>
+
+    @tagged
+    Examples:
+      | name |
+      | Bob  |
+""".lstrip()
+
+    def test_iter_parse_yields_each_element_when_complete(self):
+        lines = self.FEATURE_TEXT.split("\n")
+        consumed = []
+
+        def iter_lines():
+            for line in lines:
+                consumed.append(line)
+                yield line
+
+        elements = []
+        for element in parser.Parser().iter_parse(iter_lines(), "stream.feature"):
+            elements.append((element.type, element.name, len(consumed)))
+
+        eq_(
+            elements,
+            [
+                ("feature", u"Stream", 5),
+                ("background", u"", 8),
+                ("scenario", u"S1", 13),
+                ("scenario_outline", u"S2", len(lines)),
+            ],
+        )
+
+    def test_iter_parse_file_provides_same_feature_as_parse_file(self, tmp_path):
+        filename = tmp_path / "stream.feature"
+        filename.write_bytes(self.FEATURE_TEXT.replace(u"\n", u"\r\n").encode("utf8"))
+        filename = str(filename)
+        elements = list(parser.iter_parse_file(filename))
+        feature = parser.parse_file(filename)
+
+        eq_(elements[0].scenarios, feature.scenarios)
+        eq_(elements[1:], [feature.background] + feature.scenarios)
+        eq_(feature.scenarios[0].steps[0].table.rows[0][0], u"Alice")
+        eq_(feature.scenarios[1].examples[0].tags, [u"tagged"])
+
+    def test_iter_parse_file_raises_parser_error_with_filename(self, tmp_path):
+        filename = tmp_path / "bad.feature"
+        filename.write_text(u"Feature: Bad\n  Examples: Oops\n")
+        with assert_raises(parser.ParserError) as e:
+            list(parser.iter_parse_file(str(filename)))
+        eq_(e.exception.filename, str(filename))
@@ -676,6 +676,9 @@ class TestRunWithPaths(unittest.TestCase):
         self.config.reporters = []
         self.config.logging_level = None
         self.config.logging_filter = None
+        self.config.timings_file = None
+        self.config.parallel_parse = 0
+        self.config.feature_cache = None
         self.config.outputs = [Mock(), StreamOpener(stream=sys.stdout)]
         self.config.format = ["plain", "progress"]
         self.runner = runner.Runner(self.config)
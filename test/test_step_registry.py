@@ -1,10 +1,24 @@
 # -*- coding: UTF-8 -*-
 # pylint: disable=unused-wildcard-import
 from __future__ import absolute_import, with_statement
+import re
 from mock import Mock, patch
 from nose.tools import *  # pylint: disable=wildcard-import
 from six.moves import range  # pylint: disable=redefined-builtin
-from behave import step_registry
+from behave import step_registry, matchers
+from behave.model_core import Argument
+
+
+def step_func1(context):  # pylint: disable=unused-argument
+    pass
+
+
+def step_func2(context):  # pylint: disable=unused-argument
+    pass
+
+
+def step_func3(context):  # pylint: disable=unused-argument
+    pass
 
 
 class TestStepRegistry(object):
@@ -28,6 +42,17 @@ class TestStepRegistry(object):
                 get_matcher.assert_called_with(func, pattern)
                 eq_(l, [magic_object])
 
+    def test_clear_removes_all_step_definitions(self):
+        registry = step_registry.StepRegistry()
+        given_steps = registry.steps["given"]
+        registry.steps["given"].append(Mock())
+        registry.steps["step"].append(Mock())
+
+        registry.clear()
+        eq_(given_steps, [])
+        assert registry.steps["given"] is given_steps
+        eq_(registry.steps["step"], [])
+
     def test_find_match_with_specific_step_type_also_searches_generic(self):
         registry = step_registry.StepRegistry()
 
@@ -82,6 +107,139 @@ class TestStepRegistry(object):
         for mock in step_defs[6:]:
             eq_(mock.match.call_count, 0)
 
+    def test_find_match_selects_step_definitions_by_first_word(self):
+        registry = step_registry.StepRegistry()
+        registry.add_step_definition("given", u"I buy {amount:d} apples", step_func1)
+        registry.add_step_definition("given", u"I sell {amount:d} apples", step_func2)
+        registry.add_step_definition("step", u"you buy {amount:d} apples", step_func3)
+        registry.steps["given"].append(Mock())
+        other_matcher = registry.steps["given"][-1]
+        other_matcher.match.return_value = None
+
+        step = Mock()
+        step.step_type = "given"
+        step.name = u"you buy 3 apples"
+        assert registry.find_match(step).func is step_func3
+        other_matcher.match.assert_called_once_with(step.name)
+
+        # -- CASE-INSENSITIVE: Like the parse matcher.
+        step.name = u"i SELL 3 apples"
+        assert registry.find_match(step).func is step_func2
+        eq_(other_matcher.match.call_count, 1)
+
+        # -- NON-ASCII: Case-insensitive matching of "\u017f" (long s) as "s".
+        step.name = u"I \u017fell 3 apples"
+        assert registry.find_match(step).func is step_func2
+
+    def test_find_match_keeps_first_match_with_unindexed_step_definitions(self):
+        registry = step_registry.StepRegistry()
+        with patch("behave.step_registry.get_matcher", matchers.RegexMatcher):
+            registry.add_step_definition("when", u"I buy (.*)", step_func1)
+            registry.add_step_definition("when", u"(?:I|you) sell (.*)", step_func2)
+            registry.add_step_definition("when", u"I.*|you.*", step_func3)
+
+        step = Mock()
+        step.step_type = "when"
+        for name, expected in [
+            (u"I buy apples", step_func1),
+            (u"I sell apples", step_func2),
+            (u"you sell apples", step_func2),
+            (u"Isell apples", step_func3),
+            (u"you buy apples", step_func3),
+        ]:
+            step.name = name
+            assert registry.find_match(step).func is expected, name
+
+    def test_find_match_memoizes_match_of_step_text(self):
+        registry = step_registry.StepRegistry()
+        match = matchers.Match(step_func1, [])
+        step_definition = Mock()
+        step_definition.match.return_value = match
+        registry.steps["given"].append(step_definition)
+
+        for _ in range(3):
+            step = Mock()
+            step.step_type = "given"
+            step.name = u"just a test step"
+            assert registry.find_match(step) is match
+        eq_(step_definition.match.call_count, 1)
+
+        # -- CHANGED STEP DEFINITIONS: Memoized matches are discarded.
+        registry.add_step_definition("step", u"just another test step", step_func2)
+        assert registry.find_match(step) is match
+        eq_(step_definition.match.call_count, 2)
+
+    def test_find_match_does_not_memoize_mutable_arguments(self):
+        registry = step_registry.StepRegistry()
+        argument = Argument(0, 5, u"apple", [u"apple"], u"fruits")
+        step_definition = Mock()
+        step_definition.match.return_value = matchers.Match(step_func1, [argument])
+        registry.steps["when"].append(step_definition)
+
+        step = Mock()
+        step.step_type = "when"
+        step.name = u"apple"
+        registry.find_match(step)
+        registry.find_match(step)
+        eq_(step_definition.match.call_count, 2)
+
+    def test_add_step_definition_checks_only_indexed_candidates(self):
+        registry = step_registry.StepRegistry()
+        registry.add_step_definition("given", u"I buy {amount:d} apples", step_func1)
+        other_step = Mock()
+        other_step.match.return_value = None
+        registry.steps["given"].append(other_step)
+        with patch.object(
+            registry.steps["given"][0], "match", return_value=None
+        ) as match:
+            registry.add_step_definition("given", u"you buy 3 apples", step_func2)
+        eq_(match.call_count, 0)
+        other_step.match.assert_called_once_with(u"you buy 3 apples")
+
+        with assert_raises(step_registry.AmbiguousStep):
+            registry.add_step_definition("given", u"I buy 3 apples", step_func3)
+
+    def test_deferred_validation_checks_step_definitions_at_end(self):
+        registry = step_registry.StepRegistry()
+        with assert_raises(step_registry.AmbiguousStep) as e:
+            with registry.deferred_validation():
+                registry.add_step_definition("given", u"I buy {n:d} apples", step_func1)
+                registry.add_step_definition("given", u"I buy {n:d} apples", step_func1)
+                registry.add_step_definition("when", u"I buy 3 apples", step_func2)
+                eq_(len(registry.steps["given"]), 2)
+                registry.add_step_definition("given", u"I buy 3 apples", step_func3)
+        assert "@given('I buy 3 apples')" in str(e.exception)
+
+        # -- DUPLICATED REGISTRATION: Is removed (like without deferred checks).
+        registry.steps["given"].pop()
+        registry.validate()
+        eq_(len(registry.steps["given"]), 1)
+        eq_(len(registry.steps["when"]), 1)
+
+    def test_malformed_pattern_raises_step_definition_error(self):
+        registry = step_registry.StepRegistry()
+        with patch("behave.step_registry.get_matcher", matchers.RegexMatcher):
+            registry.add_step_definition("given", u"(?P<x>oops", step_func1)
+            with assert_raises(matchers.StepDefinitionError) as e:
+                registry.compile_step_definitions()
+        assert u"@given('(?P<x>oops') at " in str(e.exception)
+        assert isinstance(e.exception.__cause__, re.error)
+        eq_(e.exception.location, matchers.Match.make_location(step_func1))
+
+    def test_malformed_pattern_with_deferred_validation_is_raised_on_use(self):
+        registry = step_registry.StepRegistry()
+        with patch("behave.step_registry.get_matcher", matchers.RegexMatcher):
+            with registry.deferred_validation():
+                registry.add_step_definition("given", u"(?P<x>oops", step_func1)
+
+        step = Mock()
+        step.step_type = "given"
+        step.name = u"something else"
+        with assert_raises(matchers.StepDefinitionError):
+            registry.find_match(step)
+        with assert_raises(matchers.StepDefinitionError):
+            registry.compile_step_definitions()
+
     # pylint: disable=line-too-long
     @patch.object(step_registry.registry, "add_step_definition")
     def test_make_step_decorator_ends_up_adding_a_step_definition(
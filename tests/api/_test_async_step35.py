@@ -6,6 +6,7 @@ Unit tests for :mod:`behave.api.async_test` for Python 3.5 (or newer).
 # -- IMPORTS:
 from __future__ import absolute_import, print_function
 import sys
+import warnings
 from behave._stepimport import use_step_import_modules
 from behave.runner import Context, Runner
 import pytest
@@ -142,3 +143,123 @@ class TestAsyncStepRunPy35(object):
         context = Context(runner=Runner(config={}))
         with pytest.raises(ZeroDivisionError):
             when_async_step_raises_exception(context)
+
+
+class TestSharedEventLoop(object):
+    """Ensure that async-steps of several threads run in one event loop."""
+
+    def test_run_coroutine__interleaves_coroutines_of_threads(self):
+        import asyncio
+        import threading
+        from behave.api.async_step import SharedEventLoop, run_coroutine
+
+        async def wait_and_trace(traced, name):
+            await asyncio.sleep(0.2)
+            traced.append((name, threading.current_thread().name))
+
+        traced = []
+        shared_loop = SharedEventLoop().start()
+        try:
+            threads = [
+                threading.Thread(
+                    target=run_coroutine, args=(wait_and_trace(traced, i),)
+                )
+                for i in range(5)
+            ]
+            with StopWatch() as stopwatch:
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+        finally:
+            shared_loop.stop()
+
+        assert sorted(name for name, _ in traced) == list(range(5))
+        assert set(thread_name for _, thread_name in traced) == {"behave-event-loop"}
+        assert stopwatch.duration < 0.8
+        assert SharedEventLoop.current is None
+
+    def test_run_coroutine__raises_exception_and_timeout(self):
+        import asyncio
+        from behave.api.async_step import SharedEventLoop, run_coroutine
+
+        async def fails():
+            1 / 0  # XFAIL-HERE: Raises ZeroDivisionError
+
+        shared_loop = SharedEventLoop().start()
+        try:
+            with pytest.raises(ZeroDivisionError):
+                run_coroutine(fails())
+            with pytest.raises(AssertionError, match="TIMEOUT-OCCURED"):
+                run_coroutine(asyncio.sleep(1.0), timeout=0.05)
+        finally:
+            shared_loop.stop()
+
+    def test_match_run__awaits_async_def_step(self):
+        import asyncio
+        from behave.api.async_step import SharedEventLoop
+        from behave.matchers import Match
+        from behave.model_core import Argument
+
+        async def step_impl(context, name):
+            await asyncio.sleep(0.01)
+            context.traced_steps.append(name)
+
+        context = Context(runner=Runner(config={}))
+        context.traced_steps = []
+        argument = Argument(0, 5, u"Alice", u"Alice", name="name")
+        shared_loop = SharedEventLoop().start()
+        try:
+            Match(step_impl, [argument]).run(context)
+        finally:
+            shared_loop.stop()
+        assert context.traced_steps == [u"Alice"]
+
+    def test_match_run__ignores_async_def_step_without_shared_loop(self):
+        from behave.matchers import Match
+
+        async def step_impl(context):
+            context.traced_steps.append("CALLED")
+
+        context = Context(runner=Runner(config={}))
+        context.traced_steps = []
+        with warnings.catch_warnings():
+            # -- COROUTINE IS NOT AWAITED: "coroutine ... was never awaited"
+            warnings.simplefilter("ignore", RuntimeWarning)
+            Match(step_impl, []).run(context)
+        assert context.traced_steps == []
+
+    def test_thread_event_loop__provides_one_loop_per_thread(self):
+        import threading
+        from behave.api.async_step import thread_event_loop
+
+        loops = []
+        thread = threading.Thread(target=lambda: loops.append(thread_event_loop()))
+        thread.start()
+        thread.join()
+
+        loop = thread_event_loop()
+        assert loop is thread_event_loop()
+        assert loops[0] is not loop
+        assert not loop.is_closed()
+        loops[0].close()
+
+    def test_async_step__uses_event_loop_set_by_user(self):
+        import asyncio
+        from behave.api.async_step import AsyncContext, async_run_until_complete
+
+        @async_run_until_complete
+        async def step_impl(context):
+            context.running_loop = asyncio.get_running_loop()
+
+        # -- LIKE: environment.py sets up the event loop of its fixtures.
+        user_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(user_loop)
+        try:
+            context = Context(runner=Runner(config={}))
+            step_impl(context)
+            assert context.running_loop is user_loop
+            assert AsyncContext().loop is user_loop
+        finally:
+            asyncio.set_event_loop(None)
+            user_loop.close()
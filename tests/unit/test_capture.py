@@ -4,8 +4,16 @@ Unittests for :mod:`behave.capture` module.
 """
 
 from __future__ import absolute_import, print_function
+import logging
+import logging.handlers
 import sys
-from behave.capture import Captured, CaptureController
+import threading
+from behave.capture import (
+    Captured,
+    CaptureController,
+    ThreadLocalStream,
+    thread_local_capture,
+)
 from mock import Mock
 import pytest
 
@@ -284,3 +292,107 @@ HELLO
 Captured stderr:
 Alice"""
         assert report == expected
+
+
+class TestThreadLocalCapture(object):
+    @staticmethod
+    def create_capture_controller():
+        capture_controller = create_capture_controller()
+        config = capture_controller.config
+        config.logging_format = None
+        config.logging_datefmt = None
+        config.logging_clear_handlers = False
+        config.logging_level = logging.INFO
+        return capture_controller
+
+    def test_redirect__affects_current_thread_only(self):
+        stream = ThreadLocalStream(Mock())
+        old_target = stream.redirect(Mock())
+        assert old_target is stream.stream
+        thread = threading.Thread(target=stream.write, args=("Alice",))
+        thread.start()
+        thread.join()
+        stream.write("Bob")
+        stream.stream.write.assert_called_once_with("Alice")
+        stream.target.write.assert_called_once_with("Bob")
+
+    def test_capturing__in_concurrent_threads(self):
+        controllers = [self.create_capture_controller() for _ in range(3)]
+        started = threading.Barrier(len(controllers))
+
+        def run_capture(num, controller):
+            setup_capture_controller(controller)
+            controller.start_capture()
+            started.wait(5)
+            for _ in range(3):
+                print("out%d" % num)
+                sys.stderr.write("err%d\n" % num)
+                logging.getLogger("test").info("log%d", num)
+                started.wait(5)
+            controller.stop_capture()
+            controller.teardown_capture()
+
+        with thread_local_capture(controllers[0].config):
+            threads = [
+                threading.Thread(target=run_capture, args=(num, controller))
+                for num, controller in enumerate(controllers)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        for num, controller in enumerate(controllers):
+            captured = controller.captured
+            assert captured.stdout == "out%d\n" % num * 3
+            assert captured.stderr == "err%d\n" % num * 3
+            assert captured.log_output == "\n".join(["INFO:test:log%d" % num] * 3)
+
+    def test_thread_local_capture__restores_streams_and_logging(self):
+        config = self.create_capture_controller().config
+        old_stdout = sys.stdout
+        root_logger = logging.getLogger()
+        old_handlers = list(root_logger.handlers)
+        old_level = root_logger.level
+        with thread_local_capture(config):
+            assert isinstance(sys.stdout, ThreadLocalStream)
+            assert isinstance(sys.stderr, ThreadLocalStream)
+            assert len(root_logger.handlers) == len(old_handlers) + 1
+        assert sys.stdout is old_stdout
+        assert root_logger.handlers == old_handlers
+        assert root_logger.level == old_level
+
+    def test_thread_local_capture__keeps_level_of_other_handlers(self):
+        config = self.create_capture_controller().config
+        config.logging_level = logging.DEBUG
+        root_logger = logging.getLogger()
+        other_handler = logging.handlers.BufferingHandler(100)
+        root_logger.addHandler(other_handler)
+        old_level = root_logger.level
+        root_logger.setLevel(logging.WARNING)
+        try:
+            with thread_local_capture(config):
+                assert root_logger.level == logging.DEBUG
+                logging.getLogger("test").debug("Alice")
+                logging.getLogger("test").warning("Bob")
+            assert root_logger.level == logging.WARNING
+        finally:
+            root_logger.removeHandler(other_handler)
+            root_logger.setLevel(old_level)
+        assert [r.getMessage() for r in other_handler.buffer] == ["Bob"]
+        assert not other_handler.filters
+
+    def test_thread_local_capture__with_logging_clear_handlers(self):
+        config = self.create_capture_controller().config
+        config.logging_clear_handlers = True
+        root_logger = logging.getLogger()
+        other_handler = logging.handlers.BufferingHandler(100)
+        root_logger.addHandler(other_handler)
+        try:
+            with thread_local_capture(config):
+                assert other_handler not in root_logger.handlers
+                logging.getLogger("test").warning("Alice")
+            assert other_handler in root_logger.handlers
+        finally:
+            root_logger.removeHandler(other_handler)
+        assert not other_handler.buffer
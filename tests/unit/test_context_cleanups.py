@@ -227,3 +227,17 @@ class TestContextCleanup(object):
         assert len(collect_cleanup_error.collected) == 2
         assert collect_cleanup_error.collected[0][:-1] == expected[0][:-1]
         assert collect_cleanup_error.collected[1][:-1] == expected[1][:-1]
+
+    def test_add_cleanup__with_layer_uses_this_context_layer(self):
+        my_cleanup = Mock(spec=cleanup_func)
+        context = Context(runner=Mock())
+        with scoped_context_layer(context, "feature"):
+            with scoped_context_layer(context, "scenario"):
+                context.add_cleanup(my_cleanup, layer="feature")
+            my_cleanup.assert_not_called()
+        my_cleanup.assert_called_once()
+
+    def test_add_cleanup__with_unknown_layer_raises_lookup_error(self):
+        context = Context(runner=Mock())
+        with pytest.raises(LookupError):
+            context.add_cleanup(cleanup_func, layer="UNKNOWN")
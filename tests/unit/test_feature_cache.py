@@ -0,0 +1,78 @@
+# -*- coding: UTF-8 -*-
+"""
+Unit tests for :mod:`behave.feature_cache` module.
+"""
+
+from __future__ import absolute_import
+from behave.feature_cache import FeatureCache, NOT_CACHED
+from behave.parser import parse_file
+
+
+FEATURE_TEXT = u"""
+Feature: Alice
+  Scenario: A1
+    Given a step passes
+  Scenario: A2
+    Given a step passes
+"""
+
+
+def make_cache(tmp_path, text=FEATURE_TEXT):
+    filename = tmp_path / "alice.feature"
+    filename.write_text(text)
+    filename = str(filename)
+    cache = FeatureCache(str(tmp_path / "cache"))
+    return cache, filename
+
+
+# -----------------------------------------------------------------------------
+# TESTS:
+# -----------------------------------------------------------------------------
+class TestFeatureCache(object):
+    def test_load__provides_stored_feature(self, tmp_path):
+        cache, filename = make_cache(tmp_path)
+        assert cache.load(filename) is NOT_CACHED
+        cache.store(filename, parse_file(filename))
+
+        feature = cache.load(filename)
+        assert feature.name == u"Alice"
+        assert [scenario.name for scenario in feature.scenarios] == [u"A1", u"A2"]
+        assert feature.scenarios[1].steps[0].line == 6
+
+    def test_load__ignores_changed_feature_file(self, tmp_path):
+        cache, filename = make_cache(tmp_path)
+        cache.store(filename, parse_file(filename))
+        with open(filename, "a") as f:
+            f.write(u"  Scenario: A3\n")
+        assert cache.load(filename) is NOT_CACHED
+
+    def test_load__is_keyed_by_language(self, tmp_path):
+        cache, filename = make_cache(tmp_path)
+        cache.store(filename, parse_file(filename), language="en")
+        assert cache.load(filename, language="en") is not NOT_CACHED
+        assert cache.load(filename, language="de") is NOT_CACHED
+
+    def test_load__ignores_broken_entry(self, tmp_path):
+        cache, filename = make_cache(tmp_path)
+        cache.store(filename, parse_file(filename))
+        with open(cache.make_path(filename), "wb") as f:
+            f.write(b"BROKEN")
+        assert cache.load(filename) is NOT_CACHED
+
+    def test_load__provides_none_for_file_without_feature(self, tmp_path):
+        cache, filename = make_cache(tmp_path, text=u"# -- EMPTY\n")
+        cache.store(filename, parse_file(filename))
+        assert cache.load(filename) is None
+
+    def test_load__is_keyed_by_current_directory(self, tmp_path, monkeypatch):
+        cache, filename = make_cache(tmp_path)
+        (tmp_path / "other").mkdir()
+        monkeypatch.chdir(tmp_path)
+        cache.store(filename, parse_file(filename))
+        assert cache.load(filename).location.filename == u"alice.feature"
+
+        # -- OTHER DIRECTORY: Relative locations of the cached model differ.
+        monkeypatch.chdir(tmp_path / "other")
+        assert cache.load(filename) is NOT_CACHED
+        cache.store(filename, parse_file(filename))
+        assert cache.load(filename).location.filename == u"../alice.feature"
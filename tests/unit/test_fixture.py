@@ -9,6 +9,7 @@ import inspect
 from behave.fixture import (
     fixture,
     use_fixture,
+    use_worker_fixture,
     is_context_manager,
     InvalidFixtureError,
     use_fixture_by_tag,
@@ -523,6 +524,43 @@ class TestUseFixture(object):
         assert isinstance(exc_info.value, FixtureCleanupError), "LAST-EXCEPTION-WINS"
 
 
+class TestUseWorkerFixture(object):
+    def test_setup_once_per_worker_and_cleanup_at_end_of_worker(self):
+        @fixture
+        def foo(context, checkpoints, *args, **kwargs):
+            checkpoints.append("foo.setup")
+            yield FooFixture()
+            checkpoints.append("foo.cleanup")
+
+        checkpoints = []
+        context = make_runtime_context()
+        with scoped_context_layer(context, "worker"):
+            with scoped_context_layer(context, "scenario"):
+                fixture1 = use_worker_fixture(foo, context, checkpoints)
+            with scoped_context_layer(context, "scenario"):
+                fixture2 = use_worker_fixture(foo, context, checkpoints)
+            assert fixture1 is fixture2
+            assert checkpoints == ["foo.setup"]
+            checkpoints.append("worker-block")
+
+        assert checkpoints == ["foo.setup", "worker-block", "foo.cleanup"]
+
+    def test_uses_testrun_layer_without_worker(self):
+        @fixture
+        def foo(context, checkpoints, *args, **kwargs):
+            checkpoints.append("foo.setup")
+            yield FooFixture()
+            checkpoints.append("foo.cleanup")
+
+        checkpoints = []
+        context = make_runtime_context()
+        with scoped_context_layer(context, "scenario"):
+            use_worker_fixture(foo, context, checkpoints)
+        assert checkpoints == ["foo.setup"]
+        context._do_cleanups()  # -- LIKE: Runner at end of test run.
+        assert checkpoints == ["foo.setup", "foo.cleanup"]
+
+
 class TestUseFixtureByTag(object):
     def test_data_schema1(self):
         @fixture
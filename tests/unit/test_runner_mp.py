@@ -0,0 +1,1121 @@
+# -*- coding: UTF-8 -*-
+"""
+Unit tests for :mod:`behave.runner_mp` module.
+"""
+
+from __future__ import absolute_import
+import signal
+import sys
+import time
+from behave.configuration import Configuration
+from behave.model import Feature, Scenario
+from behave.model_core import FileLocation, Status, RemoteException
+from behave.parser import parse_feature
+from behave.runner_mp import (
+    MultiProcRunner_Feature,
+    MultiProcRunner_Scenario,
+    MultiProcClientRunner,
+    ThreadClientRunner,
+    WorkerProcess,
+    WorkerThread,
+    BatchSizer,
+    DurationEstimator,
+    JobTimeoutError,
+    ResultPacker,
+    RecyclePolicy,
+    ResourceLimits,
+    WorkerListener,
+    connect_to_master,
+    get_authkey,
+    job_location,
+    job_timeout,
+    job_resources,
+    parse_address,
+    parse_resource_tag,
+    parse_size,
+    parse_timeout_tag,
+    remote_worker_command,
+    scenario_timeout,
+    unique_feature_locations,
+)
+from behave.timings import TimingStore
+from mock import Mock, patch
+import pytest
+
+
+FEATURE_TEXT1 = u"""
+Feature: Alice
+  Scenario: A1
+    Given a step passes
+  Scenario: A2
+    Given a step passes
+    When a step passes
+    Then a step passes
+  Scenario Outline: A3
+    Given a step passes
+    Examples:
+      | name |
+      | one  |
+      | two  |
+"""
+
+FEATURE_TEXT2 = u"""
+Feature: Bob
+  Scenario: B1
+    Given a step passes
+    When a step passes
+"""
+
+
+def make_features():
+    return [
+        parse_feature(FEATURE_TEXT1, filename="alice.feature"),
+        parse_feature(FEATURE_TEXT2, filename="bob.feature"),
+    ]
+
+
+def make_runner(runner_class, *args):
+    config = Configuration(list(args), load_config=False)
+    runner = runner_class(config)
+    runner.features.extend(make_features())
+    runner.scan_features()
+    return runner
+
+
+def make_timings(**durations):
+    timings = TimingStore(None)
+    for kind, samples in durations.items():
+        for key, duration in samples.items():
+            timings.add(kind, key, duration)
+    return timings
+
+
+def scheduled_names(runner, timings=None):
+    runner.timings = timings
+    return [runner.jobs_map[job_id].name for job_id in runner.schedule_jobs()]
+
+
+# -----------------------------------------------------------------------------
+# TESTS:
+# -----------------------------------------------------------------------------
+class TestJobIds(object):
+    def test_unique_feature_locations__removes_repeated_locations(self):
+        locations = [
+            FileLocation(u"alice.feature"),
+            FileLocation(u"bob.feature", 3),
+            FileLocation(u"./alice.feature"),
+            FileLocation(u"bob.feature", 3),
+            FileLocation(u"bob.feature", 7),
+        ]
+        assert unique_feature_locations(locations) == [
+            FileLocation(u"alice.feature"),
+            FileLocation(u"bob.feature", 3),
+            FileLocation(u"bob.feature", 7),
+        ]
+
+    def test_add_job__queues_duplicated_job_once(self):
+        runner = make_runner(MultiProcRunner_Scenario)
+        alice = runner.features[0]
+        runner.add_job(alice.scenarios[0])
+        assert runner.jobs.count(u"alice.feature:3") == 1
+        assert runner.jobs_map[u"alice.feature:3"] is alice.scenarios[0]
+
+
+class TestDurationEstimator(object):
+    def test_estimate__uses_recorded_duration(self):
+        feature = make_features()[0]
+        scenario = feature.scenarios[0]
+        timings = make_timings(scenario={job_location(scenario): 42.0})
+        estimator = DurationEstimator(timings)
+        assert estimator.estimate(scenario) == 42.0
+
+    def test_estimate__uses_step_count_without_history(self):
+        feature = make_features()[0]
+        estimator = DurationEstimator()
+        assert estimator.estimate(feature.scenarios[0]) == 1.0
+        assert estimator.estimate(feature.scenarios[1]) == 3.0
+        assert estimator.estimate(feature) == 6.0
+
+    def test_calibrate__computes_mean_step_duration(self):
+        feature = make_features()[0]
+        scenario = feature.scenarios[1]
+        timings = make_timings(scenario={job_location(scenario): 6.0})
+        estimator = DurationEstimator(timings)
+        estimator.calibrate([feature])
+        assert estimator.step_duration == 2.0
+        assert estimator.estimate(feature.scenarios[0]) == 2.0
+
+
+class TestSchedule(object):
+    def test_schedule_jobs__keeps_file_order_per_default(self):
+        runner = make_runner(MultiProcRunner_Scenario)
+        assert scheduled_names(runner) == [
+            u"A1",
+            u"A2",
+            u"A3 -- @1.1 ",
+            u"A3 -- @1.2 ",
+            u"B1",
+        ]
+
+    def test_schedule_jobs__longest_first_by_step_count(self):
+        runner = make_runner(
+            MultiProcRunner_Scenario, "--parallel-schedule=longest-first"
+        )
+        assert scheduled_names(runner) == [
+            u"A2",
+            u"B1",
+            u"A1",
+            u"A3 -- @1.1 ",
+            u"A3 -- @1.2 ",
+        ]
+
+    def test_schedule_jobs__longest_first_by_recorded_duration(self):
+        runner = make_runner(
+            MultiProcRunner_Scenario, "--parallel-schedule=longest-first"
+        )
+        timings = make_timings(
+            scenario={
+                "alice.feature:3": 20.0,
+                "alice.feature:5": 3.0,
+                "bob.feature:3": 0.5,
+            }
+        )
+        assert scheduled_names(runner, timings) == [
+            u"A1",
+            u"A3 -- @1.1 ",
+            u"A3 -- @1.2 ",
+            u"A2",
+            u"B1",
+        ]
+
+    def test_schedule_jobs__longest_first_with_features(self):
+        runner = make_runner(
+            MultiProcRunner_Feature, "--parallel-schedule=longest-first"
+        )
+        assert scheduled_names(runner) == [u"Alice", u"Bob"]
+        timings = make_timings(feature={"bob.feature": 60.0})
+        assert scheduled_names(runner, timings) == [u"Bob", u"Alice"]
+
+
+class TestClientRunner(object):
+    def make_client(self, *args):
+        runner = make_runner(MultiProcRunner_Scenario, *args)
+        runner.hooks = {"before_all": Mock(), "before_scenario": Mock()}
+        client = MultiProcClientRunner(
+            runner.config,
+            0,
+            Mock(),
+            jobs_map=runner.jobs_map,
+            hooks=runner.hooks,
+        )
+        client.load_hooks = Mock()
+        client.load_step_definitions = Mock()
+        client.run_model = Mock(return_value=False)
+        return client
+
+    def test_run_with_paths__reuses_hooks_and_steps_of_master(self):
+        client = self.make_client()
+        with patch("behave.runner_mp.the_step_registry") as step_registry:
+            client.run_with_paths()
+
+        assert not client.load_hooks.called
+        assert not client.load_step_definitions.called
+        assert not step_registry.clear.called
+        assert sorted(client.hooks) == ["before_all", "before_scenario"]
+        assert client.run_model.called
+
+    def test_run_with_paths__reloads_hooks_and_steps_if_requested(self):
+        client = self.make_client("--parallel-reload-steps")
+        with patch("behave.runner_mp.the_step_registry") as step_registry:
+            client.run_with_paths()
+
+        assert client.load_hooks.called
+        assert client.load_step_definitions.called
+        assert step_registry.clear.called
+        assert client.hooks == {}
+
+    def test_run_with_paths__loads_hooks_and_steps_without_master(self):
+        config = Configuration([], load_config=False)
+        client = MultiProcClientRunner(config, 0, Mock(), [])
+        client.load_hooks = Mock()
+        client.load_step_definitions = Mock()
+        client.run_model = Mock(return_value=False)
+        with patch("behave.runner_mp.the_step_registry") as step_registry:
+            client.run_with_paths()
+
+        assert client.load_hooks.called
+        assert client.load_step_definitions.called
+        assert step_registry.clear.called
+
+
+class TestJobProtocol(object):
+    def test_job_ids__are_locations(self):
+        runner = make_runner(MultiProcRunner_Scenario)
+        assert runner.jobs == [
+            u"alice.feature:3",
+            u"alice.feature:5",
+            u"alice.feature:13",
+            u"alice.feature:14",
+            u"bob.feature:3",
+        ]
+        runner = make_runner(MultiProcRunner_Feature)
+        assert runner.jobs == [u"alice.feature", u"bob.feature"]
+
+    def test_find_job__parses_feature_file_once(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        tmp_path.joinpath("alice.feature").write_text(FEATURE_TEXT1)
+        config = Configuration([], load_config=False)
+        client = MultiProcClientRunner(config, 0, Mock(), ["alice.feature"])
+
+        feature = client.find_job(u"alice.feature")
+        scenario = client.find_job(u"alice.feature:14")
+        assert isinstance(feature, Feature)
+        assert isinstance(scenario, Scenario)
+        assert scenario.name == u"A3 -- @1.2 "
+        assert scenario.feature is feature
+        assert client.find_job(u"alice.feature:99") is None
+
+    def test_send_status__is_positional(self):
+        sent_feature, received_feature = make_features()[0], make_features()[0]
+        sent = sent_feature.scenarios[1]
+        sent.steps[1].status = Status.failed
+        sent.steps[1].error_message = u"OOPS"
+
+        received = received_feature.scenarios[1]
+        received.recv_status(sent.send_status())
+        assert received.steps[1].status == Status.failed
+        assert received.steps[1].error_message == u"OOPS"
+        assert received.steps[0].status == Status.untested
+
+    def test_send_status__omits_untested_steps(self):
+        scenario = make_features()[0].scenarios[1]
+        scenario.steps[0].status = Status.passed
+        status = scenario.send_status()
+        assert [index for index, _ in status["steps"]] == [0]
+        assert status["steps"][0][1]["status"] == Status.passed.value
+
+
+class UnpicklableError(Exception):
+    def __init__(self, code, text):
+        super(UnpicklableError, self).__init__(text)
+        self.code = code
+
+
+class TestResultPacker(object):
+    def make_status(self, exception=None, error_message=None):
+        feature = make_features()[0]
+        step = feature.scenarios[0].steps[0]
+        step.status = Status.failed
+        step.exception = exception
+        step.error_message = error_message
+        step.captured.stdout = u"x" * 100
+        return feature.scenarios[0].send_status()
+
+    def receive(self, packer, status):
+        scenario = make_features()[0].scenarios[0]
+        scenario.recv_status(packer.unpack(packer.pack(status)))
+        return scenario.steps[0]
+
+    def test_pack__keeps_picklable_exception(self):
+        packer = ResultPacker()
+        step = self.receive(packer, self.make_status(ValueError("OOPS")))
+        assert isinstance(step.exception, ValueError)
+        assert step.status == Status.failed
+
+    def test_pack__degrades_unpicklable_exception_to_text(self):
+        packer = ResultPacker()
+        step = self.receive(packer, self.make_status(UnpicklableError(1, "OOPS")))
+        assert isinstance(step.exception, RemoteException)
+        assert str(step.exception) == u"UnpicklableError: OOPS"
+
+    def test_pack__truncates_texts(self):
+        packer = ResultPacker(max_output=10)
+        status = self.make_status(error_message=u"E" * 5)
+        step = self.receive(packer, status)
+        assert step.error_message == u"E" * 5
+        assert step.captured.stdout == u"... (90 characters truncated)\n" + u"x" * 10
+
+    def test_pack__truncates_traceback_lines(self):
+        packer = ResultPacker(max_output=10)
+        lines = [u"line_%d\n" % i for i in range(5)]
+        assert packer.truncate_lines(lines) == [
+            u"... (4 lines truncated)\n",
+            u"line_4\n",
+        ]
+
+    def test_pack__compresses_result(self):
+        packer = ResultPacker(compress=True)
+        status = self.make_status(error_message=u"OOPS")
+        packed = packer.pack(status)
+        assert isinstance(packed, bytes)
+        assert packer.unpack(packed) == status
+
+
+class TestMessageProtocol(object):
+    def make_worker(self, num=0):
+        return WorkerProcess(num, Mock(), Mock())
+
+    def test_dispatch__sends_jobs_in_schedule_order_then_sentinel(self):
+        runner = make_runner(MultiProcRunner_Feature)
+        runner.queue_jobs()
+        worker = self.make_worker()
+        runner.handle_message(worker, ("ready",))
+        assert worker.jobs == [u"alice.feature"]
+        runner.handle_message(worker, ("results", [(u"alice.feature", None)]))
+        runner.handle_message(worker, ("results", [(u"bob.feature", None)]))
+        sent = [call[0][0] for call in worker.conn.send.call_args_list]
+        assert sent == [[u"alice.feature"], [u"bob.feature"], None]
+        assert worker.jobs == []
+
+    def test_dispatch__sends_batches_of_jobs(self):
+        runner = make_runner(MultiProcRunner_Scenario)
+        runner.queue_jobs()
+        runner.batch_sizer = Mock()
+        runner.batch_sizer.next_size.return_value = 3
+        worker = self.make_worker()
+        runner.handle_message(worker, ("ready",))
+        assert worker.jobs == [
+            u"alice.feature:3",
+            u"alice.feature:5",
+            u"alice.feature:13",
+        ]
+        assert list(runner.pending) == [u"alice.feature:14", u"bob.feature:3"]
+
+    def test_handle_message__returns_jobs_without_results(self):
+        runner = make_runner(MultiProcRunner_Scenario)
+        runner.formatters = []
+        runner.queue_jobs()
+        worker = self.make_worker()
+        worker.jobs = [runner.pending.popleft(), runner.pending.popleft()]
+        runner.handle_message(worker, ("results", [(u"alice.feature:3", None)]))
+        worker.conn.send.assert_called_once_with([u"alice.feature:5"])
+
+    def test_handle_message__done_returns_unstarted_jobs(self):
+        runner = make_runner(MultiProcRunner_Feature)
+        runner.queue_jobs()
+        worker = self.make_worker()
+        runner.handle_message(worker, ("ready",))
+        runner.handle_message(worker, ("failed",))
+        runner.handle_message(worker, ("done",))
+        assert worker.done
+        assert runner.results_fail
+        assert list(runner.pending) == [u"alice.feature", u"bob.feature"]
+
+    def test_handle_message__receives_results(self):
+        runner = make_runner(MultiProcRunner_Scenario)
+        runner.formatters = []
+        sent_scenario = make_features()[1].scenarios[0]
+        sent_scenario.steps[0].status = Status.passed
+        worker = self.make_worker()
+        worker.jobs = [u"bob.feature:3"]
+        runner.handle_message(
+            worker, ("results", [(u"bob.feature:3", sent_scenario.send_status())])
+        )
+        scenario = runner.jobs_map[u"bob.feature:3"]
+        assert scenario.steps[0].status == Status.passed
+
+    def test_iter_queue__requests_jobs_until_sentinel(self):
+        runner = make_runner(MultiProcRunner_Scenario)
+        conn = Mock()
+        conn.poll.return_value = False
+        conn.recv.side_effect = [[u"alice.feature:3"], [u"bob.feature:3"], None]
+        client = MultiProcClientRunner(runner.config, 0, conn, jobs_map=runner.jobs_map)
+        names = [feature.scenarios[0].name for feature in client.iter_queue()]
+        assert names == [u"A1", u"B1"]
+        sent = [call[0][0] for call in conn.send.call_args_list]
+        assert sent[0] == ("ready",)
+        assert [[job_id for job_id, _ in message[1]] for message in sent[1:]] == [
+            [u"alice.feature:3"],
+            [u"bob.feature:3"],
+        ]
+
+    def test_iter_queue__runs_scenarios_of_a_batch_per_feature(self):
+        runner = make_runner(MultiProcRunner_Scenario)
+        conn = Mock()
+        conn.poll.return_value = False
+        conn.recv.side_effect = [
+            [u"alice.feature:3", u"alice.feature:5", u"bob.feature:3"],
+            None,
+        ]
+        client = MultiProcClientRunner(runner.config, 0, conn, jobs_map=runner.jobs_map)
+        features = [
+            [scenario.name for scenario in feature.scenarios]
+            for feature in client.iter_queue()
+        ]
+        assert features == [[u"A1", u"A2"], [u"B1"]]
+        message = conn.send.call_args_list[1][0][0]
+        assert message[0] == "results"
+        assert len(message[1]) == 3
+
+
+class TestStopJobs(object):
+    def make_runner(self, *args):
+        runner = make_runner(MultiProcRunner_Scenario, *args)
+        runner.formatters = []
+        runner.queue_jobs()
+        return runner
+
+    def make_failed_result(self, runner, job_id):
+        scenario = runner.jobs_map[job_id]
+        scenario.steps[0].status = Status.failed
+        return ResultPacker().pack(scenario.send_status())
+
+    def test_stop__is_max_failures_one(self):
+        runner = self.make_runner("--stop")
+        assert runner.max_failures == 1
+        runner = self.make_runner("--max-failures=3")
+        assert runner.max_failures == 3
+        assert self.make_runner().max_failures == 0
+
+    def test_failure__stops_busy_workers_and_drops_pending_jobs(self):
+        runner = self.make_runner("--stop")
+        worker1 = WorkerProcess(1, Mock(), Mock())
+        worker2 = WorkerProcess(2, Mock(), Mock())
+        runner.workers.extend([worker1, worker2])
+        runner.handle_message(worker1, ("ready",))
+        runner.handle_message(worker2, ("ready",))
+        result = self.make_failed_result(runner, u"alice.feature:3")
+        runner.handle_message(worker1, ("results", [(u"alice.feature:3", result)]))
+
+        assert runner.stopped
+        assert list(runner.pending) == []
+        worker1.conn.send.assert_called_with(None)
+        worker2.conn.send.assert_called_with(None)
+        assert worker2.stopping
+        assert runner.jobs_map[u"bob.feature:3"].status == Status.untested
+
+        # -- BUSY WORKER: Returns its result (and gets no second sentinel).
+        runner.handle_message(worker2, ("results", []))
+        assert worker2.conn.send.call_count == 2
+        assert list(runner.pending) == []
+
+    def test_failures__below_max_failures_continue(self):
+        runner = self.make_runner("--max-failures=2")
+        worker = WorkerProcess(1, Mock(), Mock())
+        runner.handle_message(worker, ("ready",))
+        result = self.make_failed_result(runner, u"alice.feature:3")
+        runner.handle_message(worker, ("results", [(u"alice.feature:3", result)]))
+        assert not runner.stopped
+        assert worker.jobs == [u"alice.feature:5"]
+
+    def test_client__stops_before_next_job_of_batch(self):
+        runner = make_runner(MultiProcRunner_Scenario)
+        conn = Mock()
+        conn.poll.side_effect = [False, True]
+        conn.recv.side_effect = [[u"alice.feature:3", u"bob.feature:3"], None]
+        client = MultiProcClientRunner(runner.config, 0, conn, jobs_map=runner.jobs_map)
+        names = [feature.scenarios[0].name for feature in client.iter_queue()]
+        assert names == [u"A1"]
+        assert client.stopped
+        message = conn.send.call_args_list[-1][0][0]
+        assert [job_id for job_id, _ in message[1]] == [u"alice.feature:3"]
+
+
+class TestCrashedWorkers(object):
+    def make_runner(self, *args):
+        runner = make_runner(MultiProcRunner_Scenario, *args)
+        runner.formatters = []
+        runner.queue_jobs()
+        runner.start_worker = Mock()
+        return runner
+
+    def crash_worker(self, runner, num=0):
+        process = Mock(exitcode=-9)
+        conn = Mock()
+        conn.poll.return_value = False
+        worker = WorkerProcess(num, process, conn)
+        runner.workers.append(worker)
+        runner.handle_message(worker, ("ready",))
+        runner.finish_worker(worker)
+        return worker
+
+    def test_crash__retries_job_and_replaces_worker(self):
+        runner = self.make_runner()
+        runner.next_worker_num = 1
+        self.crash_worker(runner)
+        assert runner.pending[0] == u"alice.feature:3"
+        runner.start_worker.assert_called_once_with(1, [])
+        assert not runner.results_fail
+
+    def test_crash__marks_job_as_failed_after_retries(self):
+        runner = self.make_runner()
+        self.crash_worker(runner)
+        self.crash_worker(runner)
+        scenario = runner.jobs_map[u"alice.feature:3"]
+        assert scenario.status == Status.failed
+        assert scenario.steps[0].error_message.startswith(u"CRASHED: worker 0")
+        assert runner.pending[0] == u"alice.feature:5"
+        assert runner.results_fail
+
+    def test_crash__retries_job_alone(self):
+        runner = self.make_runner("--parallel-crash-retries=2")
+        runner.batch_sizer = Mock()
+        runner.batch_sizer.next_size.return_value = 3
+        self.crash_worker(runner)
+        worker = WorkerProcess(1, Mock(), Mock())
+        runner.handle_message(worker, ("ready",))
+        assert worker.jobs == [u"alice.feature:3"]
+        assert runner.pending[0] == u"alice.feature:5"
+
+    def test_crash__outside_of_jobs_fails_without_replacement(self):
+        runner = self.make_runner()
+        worker = WorkerProcess(0, Mock(exitcode=1), Mock())
+        worker.conn.poll.return_value = False
+        runner.workers.append(worker)
+        runner.finish_worker(worker)
+        assert runner.results_fail
+        runner.start_worker.assert_not_called()
+
+
+FEATURE_TEXT4 = u"""
+@timeout:10
+Feature: Dave
+  Scenario: D1
+    Given a step passes
+  @timeout:2.5
+  Scenario: D2
+    Given a step passes
+"""
+
+
+class TestJobTimeouts(object):
+    def test_parse_timeout_tag(self):
+        assert parse_timeout_tag(u"timeout:120") == 120.0
+        assert parse_timeout_tag(u"timeout:0.5") == 0.5
+        assert parse_timeout_tag(u"exclusive:db") is None
+        for tag in (u"timeout:", u"timeout:soon", u"timeout:0"):
+            with pytest.raises(ValueError):
+                parse_timeout_tag(tag)
+
+    def test_scenario_timeout__uses_smallest_tag_or_default(self):
+        feature = parse_feature(FEATURE_TEXT4, filename="dave.feature")
+        assert scenario_timeout(feature.scenarios[0]) == 10.0
+        assert scenario_timeout(feature.scenarios[1], default=60) == 2.5
+        bob = parse_feature(FEATURE_TEXT2, filename="bob.feature")
+        assert scenario_timeout(bob.scenarios[0]) is None
+        assert scenario_timeout(bob.scenarios[0], default=60) == 60
+
+    def test_job_timeout__of_feature_is_sum_of_scenarios(self):
+        feature = parse_feature(FEATURE_TEXT4, filename="dave.feature")
+        assert job_timeout(feature) == 12.5
+        alice = parse_feature(FEATURE_TEXT1, filename="alice.feature")
+        assert job_timeout(alice) is None
+        assert job_timeout(alice, default=1) == 4
+
+    def test_dispatch__sets_deadline_of_worker(self):
+        runner = make_runner(MultiProcRunner_Scenario, "--job-timeout=30")
+        runner.queue_jobs()
+        worker = WorkerProcess(0, Mock(), Mock())
+        with patch("behave.runner_mp.time.time", return_value=1000.0):
+            runner.handle_message(worker, ("ready",))
+            assert worker.deadline == 1000.0 + 30 + runner.timeout_grace
+            runner.workers.append(worker)
+            assert runner.watchdog_timeout() == 30 + runner.timeout_grace
+
+    def test_dispatch__without_timeout_has_no_deadline(self):
+        runner = make_runner(MultiProcRunner_Scenario)
+        runner.queue_jobs()
+        worker = WorkerProcess(0, Mock(), Mock())
+        runner.workers.append(worker)
+        runner.handle_message(worker, ("ready",))
+        assert worker.deadline is None
+        assert runner.watchdog_timeout() is None
+
+    def test_kill_hung_workers__marks_job_as_failed_and_replaces_worker(self):
+        runner = make_runner(MultiProcRunner_Scenario, "--job-timeout=30")
+        runner.formatters = []
+        runner.queue_jobs()
+        runner.start_worker = Mock()
+        worker = WorkerProcess(0, Mock(), Mock())
+        worker.process.is_alive.return_value = False
+        worker.conn.poll.return_value = False
+        runner.workers.append(worker)
+        runner.handle_message(worker, ("ready",))
+        worker.deadline = 0
+        runner.kill_hung_workers()
+
+        worker.process.terminate.assert_called_once_with()
+        assert runner.workers == []
+        scenario = runner.jobs_map[u"alice.feature:3"]
+        assert scenario.status == Status.failed
+        assert scenario.steps[0].error_message.startswith(u"TIMEOUT: worker 0")
+        assert runner.start_worker.called
+
+    def test_kill_hung_workers__reports_captured_output_of_job(self):
+        runner = make_runner(MultiProcRunner_Scenario, "--job-timeout=30")
+        runner.formatters = []
+        runner.queue_jobs()
+        runner.start_worker = Mock()
+        worker = WorkerProcess(0, Mock(), Mock())
+        worker.process.is_alive.return_value = False
+        worker.conn.poll.return_value = False
+        runner.workers.append(worker)
+        runner.handle_message(worker, ("ready",))
+        runner.handle_message(worker, ("timeout_output", u"Captured stdout:\nAlice"))
+        worker.deadline = 0
+        runner.kill_hung_workers()
+
+        scenario = runner.jobs_map[u"alice.feature:3"]
+        error_message = scenario.steps[0].error_message
+        assert error_message.startswith(u"TIMEOUT: worker 0")
+        assert error_message.endswith(u"\nCaptured stdout:\nAlice")
+
+    def test_time_limit__arms_alarm_only_while_step_runs(self):
+        runner = make_runner(MultiProcRunner_Scenario)
+        client = MultiProcClientRunner(runner.config, 0, Mock(), jobs_map={})
+        client.timeout_report_delay = 60
+        client.start_timeout(0.2)
+        try:
+            assert signal.getitimer(signal.ITIMER_REAL) == (0.0, 0.0)
+            with pytest.raises(JobTimeoutError, match="scenario exceeded 0.2s"):
+                with client.time_limit():
+                    assert signal.getitimer(signal.ITIMER_REAL)[0] > 0
+                    time.sleep(2)
+            assert signal.getitimer(signal.ITIMER_REAL) == (0.0, 0.0)
+            with pytest.raises(JobTimeoutError):
+                with client.time_limit():
+                    pass  # -- DEADLINE: Already exceeded.
+        finally:
+            client.stop_timeout()
+        with client.time_limit():
+            assert signal.getitimer(signal.ITIMER_REAL) == (0.0, 0.0)
+
+    def test_time_limit__restores_previous_signal_handler(self):
+        runner = make_runner(MultiProcRunner_Scenario)
+        client = MultiProcClientRunner(runner.config, 0, Mock(), jobs_map={})
+        client.timeout_report_delay = 60
+
+        def user_handler(signum, frame):
+            pass
+
+        old_handler = signal.signal(signal.SIGALRM, user_handler)
+        client.start_timeout(5)
+        try:
+            with client.time_limit():
+                assert signal.getsignal(signal.SIGALRM) is not user_handler
+            assert signal.getsignal(signal.SIGALRM) is user_handler
+        finally:
+            client.stop_timeout()
+            signal.signal(signal.SIGALRM, old_handler)
+
+    def test_time_limit__fails_late_step_of_worker_thread(self):
+        runner = make_runner(MultiProcRunner_Scenario, "--parallel-backend=threads")
+        client = ThreadClientRunner(runner.config, 0, Mock())
+        client.timeout_report_delay = 60
+        client.start_timeout(0.05)
+        try:
+            with client.time_limit():
+                pass  # -- IN TIME.
+            with pytest.raises(JobTimeoutError, match="scenario exceeded 0.05s"):
+                with client.time_limit():
+                    time.sleep(0.1)
+            assert signal.getitimer(signal.ITIMER_REAL) == (0.0, 0.0)
+        finally:
+            client.stop_timeout()
+
+    def test_start_timeout__sends_captured_output_of_hung_scenario(self):
+        runner = make_runner(MultiProcRunner_Scenario)
+        conn = Mock()
+        client = MultiProcClientRunner(runner.config, 0, conn, jobs_map={})
+        client.capture_controller = Mock()
+        client.capture_controller.captured.make_report.return_value = u"Alice"
+        client.timeout_report_delay = 0
+        client.start_timeout(0.01)
+        client.timeout_reporter.join(5)
+        client.stop_timeout()
+        conn.send.assert_called_once_with(("timeout_output", u"Alice"))
+
+
+class TestWorkerRecycling(object):
+    def test_parse_size(self):
+        assert parse_size(u"4096") == 4096
+        assert parse_size(u"2k") == 2048
+        assert parse_size(u"500M") == 500 * 1024 ** 2
+        assert parse_size(u"1G") == 1024 ** 3
+        for text in (u"", u"M", u"1.5G", u"lots"):
+            with pytest.raises(ValueError):
+                parse_size(text)
+
+    def test_retire_reason__after_max_jobs(self):
+        policy = RecyclePolicy(max_jobs=3)
+        policy.add_jobs(2)
+        assert policy.retire_reason() is None
+        policy.add_jobs(1)
+        assert policy.retire_reason() == "after 3 jobs"
+
+    def test_retire_reason__after_max_rss(self):
+        policy = RecyclePolicy(max_rss=100 * 1024 ** 2)
+        with patch("behave.runner_mp.current_rss", return_value=50 * 1024 ** 2):
+            assert policy.retire_reason() is None
+        with patch("behave.runner_mp.current_rss", return_value=200 * 1024 ** 2):
+            assert policy.retire_reason() == "RSS of 200 MB"
+        assert RecyclePolicy().retire_reason() is None
+
+    def test_client__retires_before_sending_results(self):
+        runner = make_runner(MultiProcRunner_Scenario, "--max-jobs-per-worker=1")
+        conn = Mock()
+        conn.poll.return_value = False
+        conn.recv.side_effect = [[u"alice.feature:3"], None]
+        client = MultiProcClientRunner(runner.config, 0, conn, jobs_map=runner.jobs_map)
+        list(client.iter_queue())
+        sent = [call[0][0][0] for call in conn.send.call_args_list]
+        assert sent == ["ready", "retire", "results"]
+        assert client.retired
+
+    def test_master__replaces_retired_worker(self):
+        runner = make_runner(MultiProcRunner_Scenario)
+        runner.formatters = []
+        runner.queue_jobs()
+        runner.start_worker = Mock()
+        runner.next_worker_num = 1
+        worker = WorkerProcess(0, Mock(), Mock())
+        worker.conn.poll.return_value = False
+        runner.workers.append(worker)
+        runner.handle_message(worker, ("ready",))
+        runner.handle_message(worker, ("retire", "after 1 jobs"))
+        runner.handle_message(worker, ("results", [(u"alice.feature:3", None)]))
+        worker.conn.send.assert_called_with(None)
+        runner.handle_message(worker, ("done",))
+        runner.finish_worker(worker)
+        runner.start_worker.assert_called_once_with(1, [])
+        assert not runner.results_fail
+
+
+class TestThreadWorkers(object):
+    def make_runner(self, *args):
+        runner = make_runner(MultiProcRunner_Scenario, "--parallel-backend=threads")
+        runner.hooks = {"before_all": Mock()}
+        runner.worker_config = runner.config
+        return runner
+
+    def test_start_worker__runs_client_in_thread(self):
+        runner = self.make_runner()
+        runner.config.max_worker_rss = u"1G"
+        with patch("behave.runner_mp.ThreadClientRunner") as client_class:
+            worker = runner.start_worker(0, [])
+            worker.process.join(5)
+
+        assert isinstance(worker.process, WorkerThread)
+        assert worker.process.exitcode == 0
+        assert runner.workers == [worker]
+        config, num, _, _, hooks = client_class.call_args[0]
+        assert config is not runner.config
+        assert config.max_worker_rss is None
+        assert not config.parallel_reload_steps
+        assert (num, hooks) == (0, runner.hooks)
+        assert client_class.return_value.run.called
+        with pytest.raises(EOFError):
+            worker.conn.recv()
+
+    def test_worker_thread__exception_is_crash(self, capsys):
+        runner = self.make_runner()
+        with patch("behave.runner_mp.ThreadClientRunner") as client_class:
+            client_class.return_value.run.side_effect = RuntimeError("OOPS")
+            worker = runner.start_worker(0, [])
+            worker.process.join(5)
+
+        assert worker.process.exitcode == 1
+        assert "RuntimeError: OOPS" in capsys.readouterr().err
+
+    def test_worker_thread__hung_thread_is_abandoned(self):
+        thread = WorkerThread(Mock(), 0, Mock(), [], {})
+        thread.is_alive = Mock(return_value=True)
+        thread.terminate()
+        thread.join()
+        assert thread.abandoned
+
+    def test_thread_client__uses_hooks_and_steps_of_master(self):
+        runner = self.make_runner()
+        client = ThreadClientRunner(runner.config, 0, Mock(), [], runner.hooks)
+        client.load_hooks = Mock()
+        client.load_step_definitions = Mock()
+        client.run_model = Mock(return_value=False)
+        with patch("behave.runner_mp.the_step_registry") as step_registry:
+            client.run_with_paths()
+
+        assert client.jobs_map is None  # -- PARSES: Own model elements.
+        assert not client.load_hooks.called
+        assert not step_registry.clear.called
+        assert client.run_model.called
+
+
+class TestBatchSizer(object):
+    def test_next_size__is_one_without_batching(self):
+        sizer = BatchSizer(target_duration=0, workers=2)
+        sizer.add_duration(0.001)
+        assert sizer.next_size(1000) == 1
+
+    def test_next_size__is_one_without_known_durations(self):
+        sizer = BatchSizer(target_duration=1.0, workers=2)
+        assert sizer.next_size(1000) == 1
+
+    def test_next_size__uses_mean_duration(self):
+        sizer = BatchSizer(target_duration=1.0, workers=2)
+        sizer.add_duration(0.1)
+        sizer.add_duration(0.3)
+        assert sizer.next_size(1000) == 5
+
+    def test_next_size__shrinks_near_end_of_run(self):
+        sizer = BatchSizer(target_duration=1.0, workers=2)
+        sizer.add_duration(0.001)
+        assert sizer.next_size(10000) == 100
+        assert sizer.next_size(40) == 10
+        assert sizer.next_size(3) == 1
+
+
+FEATURE_TEXT3 = u"""
+Feature: Carol
+  @exclusive:db
+  Scenario: C1
+    Given a step passes
+  @exclusive:db
+  Scenario: C2
+    Given a step passes
+  @max_concurrency:ldap=2
+  Scenario: C3
+    Given a step passes
+  Scenario: C4
+    Given a step passes
+"""
+
+
+class TestResourceLimits(object):
+    def make_runner(self):
+        config = Configuration([], load_config=False)
+        runner = MultiProcRunner_Scenario(config)
+        runner.features.append(parse_feature(FEATURE_TEXT3, filename="carol.feature"))
+        runner.scan_features()
+        runner.queue_jobs()
+        return runner
+
+    def test_parse_resource_tag(self):
+        assert parse_resource_tag(u"exclusive:db") == (u"db", 1)
+        assert parse_resource_tag(u"max_concurrency:ldap=2") == (u"ldap", 2)
+        assert parse_resource_tag(u"serial") is None
+
+    def test_parse_resource_tag__rejects_invalid_limit(self):
+        for tag in (u"max_concurrency:ldap", u"max_concurrency:ldap=0", u"exclusive:"):
+            with pytest.raises(ValueError):
+                parse_resource_tag(tag)
+
+    def test_job_resources__of_feature_includes_its_scenarios(self):
+        feature = parse_feature(FEATURE_TEXT3, filename="carol.feature")
+        assert job_resources(feature) == {u"db": 1, u"ldap": 2}
+        assert job_resources(feature.scenarios[3]) == {}
+
+    def test_can_acquire__respects_smallest_limit(self):
+        limits = ResourceLimits()
+        limits.acquire({u"ldap": 2})
+        assert limits.can_acquire({u"ldap": 2})
+        assert not limits.can_acquire({u"ldap": 1})
+        limits.acquire({u"ldap": 2})
+        assert not limits.can_acquire({u"ldap": 3})
+        limits.release({u"ldap": 2})
+        limits.release({u"ldap": 2})
+        assert limits.holders == {}
+
+    def test_dispatch__skips_jobs_of_exclusive_resource_in_use(self):
+        runner = self.make_runner()
+        worker1 = WorkerProcess(1, Mock(), Mock())
+        worker2 = WorkerProcess(2, Mock(), Mock())
+        runner.handle_message(worker1, ("ready",))
+        runner.handle_message(worker2, ("ready",))
+        assert worker1.jobs == [u"carol.feature:4"]
+        assert worker2.jobs == [u"carol.feature:10"]
+        assert list(runner.pending) == [u"carol.feature:7", u"carol.feature:12"]
+
+    def test_dispatch__lets_worker_wait_until_resource_is_released(self):
+        runner = self.make_runner()
+        runner.formatters = []
+        runner.pending.remove(u"carol.feature:10")
+        runner.pending.remove(u"carol.feature:12")
+        worker1 = WorkerProcess(1, Mock(), Mock())
+        worker2 = WorkerProcess(2, Mock(), Mock())
+        runner.handle_message(worker1, ("ready",))
+        runner.handle_message(worker2, ("ready",))
+        assert runner.waiting_workers == [worker2]
+        worker2.conn.send.assert_not_called()
+
+        runner.release_jobs(worker1)
+        runner.dispatch_waiting_workers()
+        assert worker2.jobs == [u"carol.feature:7"]
+        assert runner.waiting_workers == []
+
+    def test_dispatch__batches_hold_resource_once(self):
+        runner = self.make_runner()
+        runner.batch_sizer = Mock()
+        runner.batch_sizer.next_size.return_value = 4
+        worker = WorkerProcess(1, Mock(), Mock())
+        runner.handle_message(worker, ("ready",))
+        assert len(worker.jobs) == 4
+        assert worker.resources == {u"db": 1, u"ldap": 2}
+
+
+class TestRemoteWorkers(object):
+    def test_parse_address(self):
+        assert parse_address(u"ci-master:8765") == (u"ci-master", 8765)
+        for text in (u"ci-master", u":8765", u"ci-master:port", None):
+            with pytest.raises(ValueError):
+                parse_address(text)
+
+    def test_get_authkey__uses_option_then_environment(self, monkeypatch):
+        config = Configuration([], load_config=False)
+        monkeypatch.setenv("BEHAVE_PARALLEL_AUTHKEY", "from-env")
+        assert get_authkey(config) == b"from-env"
+        config.parallel_authkey = u"from-option"
+        assert get_authkey(config) == b"from-option"
+
+    def test_get_authkey__is_required(self, monkeypatch):
+        config = Configuration([], load_config=False)
+        monkeypatch.delenv("BEHAVE_PARALLEL_AUTHKEY", raising=False)
+        with pytest.raises(ValueError):
+            get_authkey(config)
+
+    def test_listener__accepts_authenticated_workers(self):
+        listener = WorkerListener(("localhost", 0), b"secret")
+        listener.start()
+        try:
+            conn = connect_to_master(listener.address, b"secret", timeout=5)
+            assert listener.wakeup.poll(5)
+            accepted = listener.pop_connections()
+            assert len(accepted) == 1
+            accepted[0][0].send(u"hello")
+            assert conn.recv() == u"hello"
+        finally:
+            listener.close()
+
+    def test_accept_workers__sends_hello_and_adds_remote_worker(self):
+        runner = make_runner(MultiProcRunner_Scenario)
+        runner.next_worker_num = 2
+        conn = Mock()
+        runner.listener = Mock()
+        runner.listener.pop_connections.return_value = [(conn, ("10.0.0.1", 4711))]
+        runner.accept_workers()
+        worker = runner.workers[0]
+        assert (worker.num, worker.process, worker.conn) == (2, None, conn)
+        assert conn.send.call_args[0][0][:2] == ("hello", 2)
+        assert runner.batch_sizer.workers == 3
+
+    def test_finish_worker__fails_if_remote_worker_disconnects_early(self):
+        runner = make_runner(MultiProcRunner_Scenario)
+        worker = WorkerProcess(0, None, Mock())
+        worker.closed = True
+        runner.workers.append(worker)
+        runner.wait_for_workers()
+        assert runner.workers == []
+        assert runner.results_fail
+
+    def test_remote_worker_command__runs_behave_module(self, monkeypatch):
+        monkeypatch.setattr(
+            sys, "argv", ["/venv/bin/behave", "--worker", "master:7000", "-q"]
+        )
+        assert remote_worker_command() == [
+            sys.executable,
+            "-m",
+            "behave",
+            "--worker",
+            "master:7000",
+            "-q",
+        ]
+
+
+class TestStreamResults(object):
+    def make_runner(self, report="scenario"):
+        runner = make_runner(MultiProcRunner_Scenario, "--parallel-report=" + report)
+        runner.formatters = [Mock()]
+        return runner
+
+    def finish(self, runner, job_id):
+        scenario = runner.jobs_map[job_id]
+        for step in scenario.steps:
+            step.status = Status.passed
+        runner.consume_result(job_id, {"status": Status.passed.value})
+
+    def output(self, runner):
+        formatter = runner.formatters[0]
+        calls = []
+        for name, args, _ in formatter.method_calls:
+            if name in ("feature", "scenario"):
+                calls.append((name, args[0].name))
+            elif name == "eof":
+                calls.append((name,))
+        formatter.reset_mock()
+        return calls
+
+    def test_stream_results__outputs_scenarios_of_active_feature(self):
+        runner = self.make_runner()
+        self.finish(runner, u"alice.feature:5")
+        assert self.output(runner) == [("feature", u"Alice"), ("scenario", u"A2")]
+        assert runner.active_feature is runner.features[0]
+
+    def test_stream_results__keeps_other_features_until_active_is_finished(self):
+        runner = self.make_runner()
+        self.finish(runner, u"alice.feature:3")
+        self.finish(runner, u"bob.feature:3")
+        assert self.output(runner) == [("feature", u"Alice"), ("scenario", u"A1")]
+
+        for job_id in (u"alice.feature:5", u"alice.feature:13", u"alice.feature:14"):
+            self.finish(runner, job_id)
+        assert self.output(runner) == [
+            ("scenario", u"A2"),
+            ("scenario", u"A3 -- @1.1 "),
+            ("scenario", u"A3 -- @1.2 "),
+            ("eof",),
+            ("feature", u"Bob"),
+            ("scenario", u"B1"),
+            ("eof",),
+        ]
+        assert runner.active_feature is None
+
+    def test_output_feature__completes_partially_streamed_feature(self):
+        runner = self.make_runner()
+        self.finish(runner, u"alice.feature:3")
+        self.output(runner)
+        runner._output_feature(runner.features[0])
+        assert self.output(runner) == [
+            ("scenario", u"A2"),
+            ("scenario", u"A3 -- @1.1 "),
+            ("scenario", u"A3 -- @1.2 "),
+            ("eof",),
+        ]
+
+    def test_output_remaining_features__after_stop_ends_active_feature(self):
+        config = Configuration(
+            ["--parallel-report=scenario", "--stop"], load_config=False
+        )
+        runner = MultiProcRunner_Scenario(config)
+        runner.features.extend(reversed(make_features()))
+        runner.scan_features()
+        runner.formatters = [Mock()]
+        runner.queue_jobs()
+        worker = WorkerProcess(1, Mock(), Mock())
+        scenario = runner.jobs_map[u"alice.feature:5"]
+        scenario.steps[0].status = Status.failed
+        result = ResultPacker().pack(scenario.send_status())
+        runner.handle_message(worker, ("results", [(u"alice.feature:5", result)]))
+        assert runner.stopped
+        assert self.output(runner) == [("feature", u"Alice"), ("scenario", u"A2")]
+
+        # -- UNFINISHED FEATURES: Bob (before the active feature Alice).
+        runner.output_remaining_features()
+        assert self.output(runner) == [
+            ("scenario", u"A1"),
+            ("scenario", u"A3 -- @1.1 "),
+            ("scenario", u"A3 -- @1.2 "),
+            ("eof",),
+            ("feature", u"Bob"),
+            ("scenario", u"B1"),
+            ("eof",),
+        ]
+        assert runner.active_feature is None
+
+    def test_consume_result__outputs_finished_features_per_default(self):
+        runner = self.make_runner(report="feature")
+        self.finish(runner, u"alice.feature:3")
+        assert self.output(runner) == []
+        self.finish(runner, u"bob.feature:3")
+        assert self.output(runner) == [
+            ("feature", u"Bob"),
+            ("scenario", u"B1"),
+            ("eof",),
+        ]
@@ -0,0 +1,102 @@
+# -*- coding: UTF-8 -*-
+"""
+Unittests for :mod:`behave.runner_util` module.
+"""
+
+from __future__ import absolute_import
+from behave.feature_cache import FeatureCache
+from behave.model_core import FileLocation, Status
+from behave.parser import ParserError, parse_file
+from behave.runner_util import parse_features, parse_files_in_pool
+from mock import patch
+import pytest
+
+
+FEATURE_TEXT1 = u"""
+Feature: Alice
+  Scenario: A1
+    Given a step passes
+  Scenario: A2
+    Given a step passes
+"""
+
+FEATURE_TEXT2 = u"""
+Feature: Bob
+  Scenario: B1
+    Given a step passes
+"""
+
+
+def write_features(tmp_path, **texts):
+    filenames = {}
+    for name, text in texts.items():
+        filename = tmp_path / ("%s.feature" % name)
+        filename.write_text(text)
+        filenames[name] = str(filename)
+    return filenames
+
+
+def describe(features):
+    return [
+        (
+            feature.name,
+            [(scenario.name, scenario.status) for scenario in feature.scenarios],
+        )
+        for feature in features
+    ]
+
+
+# -----------------------------------------------------------------------------
+# TESTS:
+# -----------------------------------------------------------------------------
+class TestParseFeatures(object):
+    def test_parse_features__in_pool_is_same_as_serial(self, tmp_path):
+        filenames = write_features(tmp_path, alice=FEATURE_TEXT1, bob=FEATURE_TEXT2)
+        locations = [
+            FileLocation(filenames["alice"], 3),
+            FileLocation(filenames["bob"]),
+            FileLocation(filenames["alice"], 5),
+        ]
+        expected = describe(parse_features(locations))
+        features = parse_features(locations, jobs=2)
+
+        assert describe(features) == expected
+        assert expected[0] == (
+            u"Alice",
+            [(u"A1", Status.untested), (u"A2", Status.skipped)],
+        )
+        # -- SAME FILE (not consecutive): Provides its own feature object.
+        assert features[0] is not features[2]
+
+    def test_parse_features__in_pool_raises_parser_error(self, tmp_path):
+        filenames = write_features(
+            tmp_path, alice=FEATURE_TEXT1, bad=u"Feature: Bad\n  Examples: Oops\n"
+        )
+        with pytest.raises(ParserError) as e:
+            parse_features([filenames["alice"], filenames["bad"]], jobs=2)
+        assert "bad.feature" in str(e.value)
+
+    def test_parse_files_in_pool__skips_single_file(self, tmp_path):
+        filenames = write_features(tmp_path, alice=FEATURE_TEXT1)
+        locations = [FileLocation(filenames["alice"], 3), filenames["alice"]]
+        assert parse_files_in_pool(locations, jobs=2) == {}
+
+    def test_parse_features__with_cache_parses_changed_files_only(self, tmp_path):
+        filenames = write_features(tmp_path, alice=FEATURE_TEXT1, bob=FEATURE_TEXT2)
+        cache = FeatureCache(str(tmp_path / "cache"))
+        locations = [FileLocation(filenames["alice"], 3), filenames["bob"]]
+        expected = describe(parse_features(locations, cache=cache))
+
+        with open(filenames["bob"], "a") as f:
+            f.write(u"  Scenario: B2\n")
+        with patch("behave.parser.parse_file", wraps=parse_file) as parser_mock:
+            features = parse_features(locations, cache=cache)
+
+        parser_mock.assert_called_once_with(filenames["bob"], language=None)
+        assert describe(features)[0] == expected[0]
+        assert [scenario.name for scenario in features[1].scenarios] == [
+            u"B1",
+            u"B2",
+        ]
+        # -- CACHED FEATURE: Unmodified by the selection of scenarios.
+        assert cache.load(filenames["alice"]).scenarios[1].status == Status.untested
@@ -0,0 +1,118 @@
+# -*- coding: UTF-8 -*-
+"""
+Unit tests for :mod:`behave.timings` module.
+"""
+
+from __future__ import absolute_import
+from behave.model_core import Status
+from behave.parser import parse_feature
+from behave.timings import TimingStats, TimingStore
+from mock import Mock
+import pytest
+
+
+FEATURE_TEXT = u"""
+Feature: Alice
+  Scenario: A1
+    Given a step passes
+    When another step passes
+  Scenario: A2
+    Given a step passes
+"""
+
+
+def make_executed_feature(duration=1.0):
+    feature = parse_feature(FEATURE_TEXT, filename="alice.feature")
+    for step in feature.scenarios[0].steps:
+        step.status = Status.passed
+        step.duration = duration
+    return feature
+
+
+def make_step_registry():
+    step_registry = Mock()
+    step_registry.find_match.side_effect = lambda step: Mock(
+        location="steps/%s.py:1" % step.step_type
+    )
+    return step_registry
+
+
+# -----------------------------------------------------------------------------
+# TESTS:
+# -----------------------------------------------------------------------------
+class TestTimingStats(object):
+    def test_keeps_last_samples_only(self):
+        stats = TimingStats([1.0, 2.0, 3.0, 4.0], max_samples=3)
+        assert stats.samples == [2.0, 3.0, 4.0]
+        assert stats.count == 3
+        assert stats.last == 4.0
+        assert stats.mean == 3.0
+
+    @pytest.mark.parametrize(
+        "samples, expected",
+        [
+            ([5.0], 5.0),
+            ([1.0, 2.0], 2.0),
+            (list(range(1, 21)), 19.0),
+            (list(range(1, 101)), 95.0),
+        ],
+    )
+    def test_p95(self, samples, expected):
+        stats = TimingStats(samples, max_samples=100)
+        assert stats.p95 == expected
+
+
+class TestTimingStore(object):
+    def test_add_feature__records_executed_elements(self):
+        store = TimingStore(None)
+        store.add_feature(make_executed_feature(), make_step_registry())
+        assert store.mean("feature", "alice.feature") == 2.0
+        assert store.mean("scenario", "alice.feature:3") == 2.0
+        assert store.get("scenario", "alice.feature:6") is None
+        assert store.mean("step", "steps/given.py:1") == 1.0
+        assert store.mean("step", "steps/when.py:1") == 1.0
+
+    def test_add_hook_durations(self):
+        store = TimingStore(None)
+        store.add_hook_durations({"before_scenario": (4, 2.0), "after_all": (0, 0)})
+        assert store.mean("hook", "before_scenario") == 0.5
+        assert store.get("hook", "after_all") is None
+
+    def test_save_and_load__with_rolling_samples(self, tmpdir):
+        filename = str(tmpdir.join("timings.jsonl"))
+        for duration in (1.0, 2.0, 3.0):
+            store = TimingStore(filename, max_samples=2).load()
+            store.add("scenario", "alice.feature:3", duration)
+            store.save()
+
+        store = TimingStore(filename, max_samples=2).load()
+        stats = store.get("scenario", "alice.feature:3")
+        assert stats.samples == [2.0, 3.0]
+
+    def test_save__compacts_file_with_outdated_records(self, tmpdir):
+        timings_file = tmpdir.join("timings.jsonl")
+        filename = str(timings_file)
+        for index in range(10):
+            store = TimingStore(filename, max_samples=2).load()
+            store.add("scenario", "alice.feature:3", float(index))
+            store.save()
+
+        lines = timings_file.read().splitlines()
+        assert len(lines) <= 2 * 2
+        store = TimingStore(filename, max_samples=2).load()
+        assert store.get("scenario", "alice.feature:3").samples == [8.0, 9.0]
+
+    def test_load__ignores_broken_lines(self, tmpdir):
+        timings_file = tmpdir.join("timings.jsonl")
+        timings_file.write(
+            '{"kind": "scenario", "key": "a.feature:2", "duration": 1.0}\n'
+            '{"kind": "scenario", "key": "b.feat\n'
+            '{"kind": "scenario", "key": "a.feature:2", "duration": 2.0}\n'
+        )
+        store = TimingStore(str(timings_file)).load()
+        assert store.get("scenario", "a.feature:2").samples == [1.0, 2.0]
+        assert list(store.items("feature")) == []
+
+    def test_load__without_file(self, tmpdir):
+        store = TimingStore(str(tmpdir.join("missing.jsonl"))).load()
+        assert list(store.items()) == []